@@ -0,0 +1,260 @@
+# -----------------------------------------------------------------------------
+# In-Process-Ersatz für den Supabase-Client (PostgREST-Teilmenge, die LeadGen.py nutzt) – nur für Benchmarks
+# -----------------------------------------------------------------------------
+import bisect
+import copy
+import hashlib
+import itertools
+import re
+import threading
+import types
+from datetime import datetime, timedelta, timezone
+
+# (Tabelle, eingebettete Tabelle) -> (Kardinalität, lokale Spalte, entfernte Spalte)
+RELATIONS = {
+    ('tasks', 'leads'): ('one', 'lead_id', 'id'),
+    ('notes', 'leads'): ('one', 'lead_id', 'id'),
+    ('leads', 'tasks'): ('many', 'id', 'lead_id'),
+    ('leads', 'notes'): ('many', 'id', 'lead_id'),
+}
+
+def split_top(text):
+    parts, depth, cur = [], 0, ''
+    for ch in text:
+        if ch == ',' and depth == 0: parts.append(cur.strip()); cur = ''; continue
+        depth += ch == '('; depth -= ch == ')'; cur += ch
+    if cur.strip(): parts.append(cur.strip())
+    return parts
+
+def parse_select(text):
+    cols, embeds = [], []
+    for part in split_top(text or '*'):
+        m = re.match(r'^(\w+)(!inner)?\((.*)\)$', part, re.S)
+        if m: embeds.append((m.group(1), bool(m.group(2)), parse_select(m.group(3))))
+        else: cols.append(part)
+    return cols, embeds
+
+class Response(types.SimpleNamespace): pass
+
+class Query:
+    def __init__(self, db, table):
+        self.db, self.table, self.filters, self.orders, self.lim, self.off = db, table, [], [], None, 0
+        self.action, self.payload, self.select_text, self.count, self.head, self.single_mode = 'select', None, '*', None, False, None
+        self.embed_filters, self.embed_orders, self.embed_limits, self.on_conflict = [], {}, {}, 'id'
+
+    # --- Builder ---
+    def select(self, *cols, count=None, head=None): self.select_text = ','.join(cols) or '*'; self.count = count; self.head = bool(head); return self
+    def insert(self, rows, **kw): self.action, self.payload = 'insert', rows; return self
+    def upsert(self, rows, on_conflict='id', **kw): self.action, self.payload, self.on_conflict = 'upsert', rows, on_conflict or 'id'; return self
+    def update(self, values, **kw): self.action, self.payload = 'update', values; return self
+    def delete(self, **kw): self.action = 'delete'; return self
+    def _filter(self, op, col, val):
+        if '.' in col: self.embed_filters.append((col.split('.', 1), op, val))
+        else: self.filters.append((col, op, val))
+        return self
+    def eq(self, c, v): return self._filter('eq', c, v)
+    def neq(self, c, v): return self._filter('neq', c, v)
+    def gt(self, c, v): return self._filter('gt', c, v)
+    def gte(self, c, v): return self._filter('gte', c, v)
+    def lt(self, c, v): return self._filter('lt', c, v)
+    def lte(self, c, v): return self._filter('lte', c, v)
+    def in_(self, c, v): return self._filter('in', c, set(v))
+    def is_(self, c, v): return self._filter('is', c, v)
+    def ilike(self, c, v): return self._filter('ilike', c, v)
+    def or_(self, expr, **kw): self.filters.append((None, 'or', expr)); return self
+    def order(self, col, desc=False, nullsfirst=None, foreign_table=None):
+        if foreign_table: self.embed_orders.setdefault(foreign_table, []).append((col, desc))
+        else: self.orders.append((col, desc))
+        return self
+    def limit(self, n, foreign_table=None):
+        if foreign_table: self.embed_limits[foreign_table] = n
+        else: self.lim = n
+        return self
+    def range(self, start, end): self.off = start; self.lim = end - start + 1; return self
+    def single(self): self.single_mode = 'single'; return self
+    def maybe_single(self): self.single_mode = 'maybe'; return self
+
+    # --- Auswertung ---
+    @staticmethod
+    def _match(row, col, op, val):
+        if op == 'or': return any(Query._match(row, *cond.split('.', 2)) for cond in split_top(val))
+        v = row.get(col)
+        if op == 'is': return v is None if val in (None, 'null') else v is val
+        if op == 'eq': return v == val
+        if op == 'neq': return v != val
+        if op == 'in': return v in val
+        if op == 'ilike':
+            if v is None: return False
+            pattern = '^' + re.escape(str(val).lower()).replace('%', '.*').replace(r'\*', '.*') + '$'
+            return re.match(pattern, str(v).lower()) is not None
+        if v is None: return False
+        v, val = (str(v), str(val)) if isinstance(v, str) or isinstance(val, str) else (v, val)
+        return {'gt': v > val, 'gte': v >= val, 'lt': v < val, 'lte': v <= val}[op]
+
+    def _embed(self, table, row, embeds):
+        out = {}
+        for name, inner, (cols, sub) in embeds:
+            kind, local, remote = RELATIONS[(table, name)]
+            related = self.db.lookup(name, remote, row.get(local))
+            related = [r for r in related if all(self._match(r, c[1], op, v) for c, op, v in self.embed_filters if c[0] == name)]
+            for col, desc in reversed(self.embed_orders.get(name, [])): related.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+            if name in self.embed_limits: related = related[:self.embed_limits[name]]
+            related = [self._project(name, r, cols, sub) for r in related]
+            value = (related[0] if related else None) if kind == 'one' else related
+            if inner and not value: return None
+            out[name] = value
+        return out
+
+    def _project(self, table, row, cols, embeds):
+        base = dict(row) if '*' in cols or not cols else {c: row.get(c) for c in cols}
+        extra = self._embed(table, row, embeds) if embeds else {}
+        if extra is None: return None
+        base.update(extra); return base
+
+    def _candidates(self, rows):
+        # Keyset-Schnellpfad: Zeilen liegen nach id sortiert vor, "id > x" startet per Binärsuche
+        start = 0
+        for col, op, val in self.filters:
+            if col == 'id' and op == 'gt' and rows is self.db.tables.get(self.table): start = max(start, bisect.bisect_right(rows, val, key=lambda r: r['id']))
+        return itertools.islice(rows, start, None)
+
+    def execute(self):
+        with self.db.lock:
+            self.db.calls.append((self.table, self.action))
+            if self.table in self.db.views:
+                if self.action != 'select': raise Exception(f"cannot {self.action} view {self.table}")
+                rows = self.db.view_rows(self.table)
+            else: rows = self.db.tables[self.table]
+            if self.action in ('insert', 'upsert'): return self._write(rows)
+            filters = [(c, op, v) for c, op, v in self.filters]
+            matched = (r for r in self._candidates(rows) if all(self._match(r, c, op, v) for c, op, v in filters))
+            if self.action == 'update':
+                matched = list(matched)
+                for r in matched: r.update(self.payload); r['updated_at'] = self.db.now()
+                self.db.version += 1
+                return Response(data=[dict(r) for r in matched], count=None)
+            if self.action == 'delete':
+                matched = list(matched); self.db.remove(self.table, matched)
+                return Response(data=[dict(r) for r in matched], count=None)
+            cols, embeds = parse_select(self.select_text)
+            projected = (p for p in (self._project(self.table, r, cols, embeds) for r in matched) if p is not None)
+            # Ohne count und bei Sortierung nach id aufsteigend genügt es, bis zur Seitengrenze zu lesen
+            if not self.count and self.orders in ([], [('id', False)]) and self.lim is not None: projected = list(itertools.islice(projected, self.off + self.lim)); total = None
+            else:
+                projected = list(projected)
+                for col, desc in reversed(self.orders): projected.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+                total = len(projected)
+            if self.off: projected = projected[self.off:]
+            if self.lim is not None: projected = projected[:self.lim]
+            data = [] if self.head else copy.deepcopy(projected)
+            if self.single_mode:
+                if not data:
+                    if self.single_mode == 'maybe': return None
+                    raise Exception("JSON object requested, multiple (or no) rows returned")
+                data = data[0]
+            return Response(data=data, count=total if self.count else None)
+
+    def _write(self, rows):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]; out = []
+        for item in payload:
+            existing = self.db.get(self.table, item.get(self.on_conflict)) if self.action == 'upsert' and self.on_conflict == 'id' and item.get('id') is not None else None
+            if existing is not None: existing.update(item); existing['updated_at'] = self.db.now(); self.db.version += 1; out.append(dict(existing)); continue
+            row = dict(self.db.defaults.get(self.table, {})); row.update(item)
+            row.setdefault('id', next(self.db.ids[self.table])); row.setdefault('created_at', self.db.now()); row['updated_at'] = row['created_at']
+            self.db.add(self.table, row); out.append(dict(row))
+        return Response(data=out, count=None)
+
+class RpcCall:
+    def __init__(self, db, name, params): self.db, self.name, self.params = db, name, params
+    def execute(self):
+        with self.db.lock: self.db.calls.append((f"rpc/{self.name}", 'rpc')); return Response(data=self.db.functions[self.name](self.db, **self.params), count=None)
+
+class FakeAuth:
+    def __init__(self, user_id, email):
+        self.user = types.SimpleNamespace(user=types.SimpleNamespace(id=user_id, email=email), session=types.SimpleNamespace(access_token='bench', refresh_token='bench'))
+    def sign_in_with_password(self, credentials): return self.user
+    def set_session(self, *args): pass
+    def sign_out(self): pass
+
+class FakeSupabase:
+    # Tabellen als nach id sortierte Listen plus Index id -> Zeile und Fremdschlüssel-Index für eingebettete Selects
+    def __init__(self, user_id='00000000-0000-4000-8000-000000000001', email='bench@example.de'):
+        self.tables = {'leads': [], 'tasks': [], 'notes': []}
+        self.ids = {t: itertools.count(1) for t in self.tables}
+        self.by_id = {t: {} for t in self.tables}
+        self.by_lead = {'tasks': {}, 'notes': {}}
+        self.defaults = {'leads': {'is_archived': False, 'status': None}, 'tasks': {'is_completed': False}}
+        self.views = {}; self.functions = {}; self.version = 0; self._view_cache = {}; self.calls = []; self.lock = threading.RLock(); self.auth = FakeAuth(user_id, email)
+
+    def now(self): return datetime.now(timezone.utc).isoformat()
+    def get(self, table, row_id): return self.by_id[table].get(row_id)
+    def lookup(self, table, column, value):
+        if column == 'id': row = self.by_id[table].get(value); return [row] if row else []
+        return list(self.by_lead[table].get(value, ())) if column == 'lead_id' and table in self.by_lead else [r for r in self.tables[table] if r.get(column) == value]
+
+    def add(self, table, row):
+        self.version += 1; self.tables[table].append(row); self.by_id[table][row['id']] = row
+        if table in self.by_lead: self.by_lead[table].setdefault(row.get('lead_id'), []).append(row)
+
+    def remove(self, table, rows):
+        gone = {r['id'] for r in rows}
+        if not gone: return
+        self.version += 1
+        self.tables[table] = [r for r in self.tables[table] if r['id'] not in gone]
+        for row_id in gone: self.by_id[table].pop(row_id, None)
+        if table in self.by_lead:
+            for r in rows: self.by_lead[table][r.get('lead_id')].remove(r)
+        if table == 'leads':  # on delete cascade
+            for child in self.by_lead: self.remove(child, [r for lead_id in gone for r in self.by_lead[child].get(lead_id, ())])
+
+    def view_rows(self, name):
+        # Sichten werden wie in Postgres per Trigger gepflegt gedacht: Neuberechnung nur nach Schreibzugriffen
+        cached = self._view_cache.get(name)
+        if cached is None or cached[0] != self.version: cached = self._view_cache[name] = (self.version, self.views[name](self))
+        return cached[1]
+
+    def table(self, name):
+        if name not in self.tables and name not in self.views: raise Exception(f'relation "public.{name}" does not exist')
+        return Query(self, name)
+
+    def rpc(self, name, params=None):
+        if name not in self.functions: raise Exception(f"function public.{name} does not exist")
+        return RpcCall(self, name, params or {})
+
+# --- Serverseitige Funktionen/Sichten aus supabase/migrations, in Python nachgebildet ---
+def lead_status_counts(db, p_start=None, p_end=None, p_include_archived=False, p_by_day=False):
+    user_id = db.auth.user.user.id; counts = {}
+    for r in db.tables['leads']:
+        if r.get('user_id') != user_id or (r.get('is_archived') and not p_include_archived): continue
+        day = r['created_at'][:10]
+        if (p_start and day < str(p_start)) or (p_end and day > str(p_end)): continue
+        key = (r.get('campaign'), r.get('status'), day if p_by_day else None); counts[key] = counts.get(key, 0) + 1
+    return [{'campaign': c, 'status': s, 'created_day': d, 'lead_count': n} for (c, s, d), n in counts.items()]
+
+def lead_version_checksum(db):
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc); micros = lambda stamp: (datetime.fromisoformat(stamp) - epoch) // timedelta(microseconds=1) if stamp else -1
+    versions = sorted((r['id'], micros(r.get('updated_at'))) for r in db.tables['leads'] if r.get('user_id') == db.auth.user.user.id)
+    return [{'lead_count': len(versions), 'version_hash': hashlib.md5(",".join(f"{i}:{v}" for i, v in versions).encode()).hexdigest()}]
+
+def apply_enrichment(db, p_rows):
+    user_id = db.auth.user.user.id; updated = 0
+    for item in p_rows:
+        lead = db.get('leads', item['id'])
+        if lead is None or lead.get('user_id') != user_id: continue
+        fill = {f: v for f, v in item.items() if f in ('email', 'contact_person') and str(v or '').strip() and not str(lead.get(f) or '').strip()}
+        if fill: lead.update(fill); lead['updated_at'] = db.now(); updated += 1
+    if updated: db.version += 1
+    return updated
+
+def campaign_summary(db):
+    summary = {}
+    for r in db.tables['leads']:
+        if not r.get('campaign'): continue
+        entry = summary.setdefault((r['user_id'], r['campaign']), {'user_id': r['user_id'], 'campaign': r['campaign'], 'lead_count': 0, 'archived_count': 0, 'status_counts': {}, 'last_activity': None})
+        entry['lead_count'] += 1; entry['archived_count'] += bool(r.get('is_archived')); status = r.get('status') or ''
+        entry['status_counts'][status] = entry['status_counts'].get(status, 0) + 1; entry['last_activity'] = max(filter(None, [entry['last_activity'], r.get('updated_at'), r.get('created_at')]))
+    return sorted(summary.values(), key=lambda e: e['campaign'])
+
+def install_server_side(db):
+    db.functions['lead_status_counts'] = lead_status_counts; db.functions['lead_version_checksum'] = lead_version_checksum; db.functions['apply_enrichment'] = apply_enrichment; db.views['campaign_summary'] = campaign_summary
+    return db
@@ -0,0 +1,190 @@
+# -----------------------------------------------------------------------------
+# Benchmark-Läufe für LeadGen.py: headless per Streamlit AppTest gegen den In-Process-Supabase-Ersatz
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.run_benchmarks --sizes 1000 10000 --json bench_output.json
+# -----------------------------------------------------------------------------
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fake_supabase import FakeSupabase, install_server_side
+from benchmarks.synthetic_data import apify_csv, populate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "LeadGen.py")
+APP_TIMEOUT = 600
+CSV_IMPORT_ROWS = 5000
+SAVE_SHARE = 0.1
+APIFY_MAPPING = {"name": "title", "branche": "categoryName", "address": "address", "phone": "phone", "email": "emails/0", "website": "domain", "contact_person": None}
+
+# Ruft die Schreibpfade aus crm_data direkt auf, weil AppTest st.data_editor und st.file_uploader nicht bedienen kann
+DATA_LAYER_DRIVER = '''
+import sys; sys.path.insert(0, {root!r})
+from datetime import date, timedelta
+import streamlit as st
+from crm_data import add_tasks_bulk, apply_lead_changeset, build_export, compute_lead_changeset, get_user_id, import_leads_csv, load_lead_page
+{body}
+'''
+SAVE_BODY = '''
+page_df, _ = load_lead_page(0)
+edited = page_df.copy(); rows = edited.index[:max(1, int(len(edited) * {share}))]
+edited.loc[rows, "status"] = "🟣 FollowUp"; edited.loc[rows, "contact_person"] = "Benchmark"
+changeset = compute_lead_changeset(page_df, edited)
+add_tasks_bulk(changeset["modified"]["id"].astype(int).tolist(), date.today() + timedelta(days=7), "Follow-Up", notify=False)
+st.session_state.bench_result = apply_lead_changeset(changeset)
+'''
+IMPORT_BODY = '''
+with open({csv_path!r}, "rb") as file: st.session_state.bench_result = import_leads_csv(file, {mapping!r}, "Benchmark Import")
+'''
+# Wie der Download-Button: Export des ganzen Kontos, Ergebnis ist das fertige ZIP
+EXPORT_BODY = '''
+st.session_state.bench_result = len(build_export(get_user_id(), "account", {fmt!r}))
+'''
+
+# Kaltstart: frischer Interpreter pro Seite; misst die Zeit bis zum ersten fertigen Rerun (Script inkl. aller Modulimporte)
+# und welche schweren Pakete bzw. Seitenmodule dabei geladen wurden
+COLD_START_PAGES = ["🏠 Startseite", "☑️ Aufgaben", "📊 Dashboard", "🔎 LeadFinder", "📅 TagesGeschäft"]
+HEAVY_MODULES = ['selenium.webdriver.support.ui', 'webdriver_manager', 'views.dashboard', 'views.leadfinder']
+COLD_START_CHILD = '''
+import json, sys, time; sys.path.insert(0, {root!r})
+import supabase
+from benchmarks.run_benchmarks import fresh_backend, install_fake_client, new_app
+install_fake_client(supabase); fake, _ = fresh_backend(100, {seed}); at = new_app(fake, {page!r})
+started = time.perf_counter(); at.run(); first_paint = time.perf_counter() - started
+print(json.dumps({{'first_paint_ms': round(first_paint * 1000, 1), 'errors': [e.value for e in at.exception], 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+def measure_cold_start(pages, seed, repeats=3):
+    results = []
+    for page in pages:
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, "-c", COLD_START_CHILD.format(root=ROOT, seed=seed, page=page, heavy=HEAVY_MODULES)], capture_output=True, text=True, cwd=ROOT, check=True).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+        results.append({'page': page, 'first_paint_ms': sorted(r['first_paint_ms'] for r in runs)[len(runs) // 2], 'loaded': runs[-1]['loaded'], 'errors': runs[-1]['errors']})
+    return results
+
+def format_cold_start(results):
+    lines = [f"{'Seite (Kaltstart)':<22}{'erster Rerun ms':>16}  geladene Pakete/Seitenmodule", "-" * 80]
+    for r in results: lines.append(f"{r['page']:<22}{r['first_paint_ms']:>16.1f}  {', '.join(r['loaded']) or '-'}" + (f"  FEHLER: {r['errors'][0]}" if r['errors'] else ""))
+    return "\n".join(lines)
+
+def new_app(fake, page=None, script=None):
+    at = AppTest.from_string(script, default_timeout=APP_TIMEOUT) if script else AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT)
+    at.secrets["supabase"] = {"url": "http://benchmark.local", "key": "benchmark"}
+    at.session_state["user"] = fake.auth.user
+    if page: at.session_state["page"] = page
+    return at
+
+def page_steps(page, interact=None):
+    def steps(fake, context):
+        at = new_app(fake, page); at.run(); yield at
+        if interact: interact(at); yield at
+    return steps
+
+def account_export(fmt):
+    def steps(fake, context):
+        at = new_app(fake, script=DATA_LAYER_DRIVER.format(root=ROOT, body=EXPORT_BODY.format(fmt=fmt))); at.run(); yield at
+    return steps
+
+def select_first_lead(at):
+    at.selectbox[1].set_value(at.selectbox[1].options[1]).run()
+
+def tagesgeschaeft_save(fake, context):
+    at = new_app(fake, "📅 TagesGeschäft"); at.run(); yield at
+    at = new_app(fake, script=DATA_LAYER_DRIVER.format(root=ROOT, body=SAVE_BODY.format(share=SAVE_SHARE))); at.run(); yield at
+
+def csv_import(fake, context):
+    at = new_app(fake, script=DATA_LAYER_DRIVER.format(root=ROOT, body=IMPORT_BODY.format(csv_path=context['csv_path'], mapping=APIFY_MAPPING))); at.run(); yield at
+
+SCENARIOS = {
+    'startseite': page_steps("🏠 Startseite"),
+    'dashboard': page_steps("📊 Dashboard"),
+    'tagesgeschaeft_save': tagesgeschaeft_save,
+    'csv_import': csv_import,
+    'lead_details': page_steps("👤 Lead-Details", select_first_lead),
+    'export_csv': account_export("csv"),
+    'export_parquet': account_export("parquet"),
+}
+
+# Der Ersatz-Client liefert den jeweils aktuellen Ersatz aus fresh_backend; eingesetzt wird er explizit (main, Kaltstart-Kind),
+# nicht beim Import dieses Moduls
+_backend = {}
+
+def install_fake_client(target=None):
+    # target: crm_data (Standard) oder das supabase-Paket, solange crm_data noch nicht geladen ist (Kaltstart misst dessen Import mit)
+    if target is None: import crm_data as target
+    target.create_client = lambda url, key: _backend['fake']
+
+def fresh_backend(size, seed):
+    fake = _backend['fake'] = install_server_side(FakeSupabase()); counts = populate(fake, size, seed)
+    st.cache_resource.clear(); gc.collect()  # kalter Start: Client, Entity-Cache und Executor neu
+    return fake, counts
+
+def run_steps(steps, fake, context):
+    errors = []
+    for at in steps(fake, context): errors += [e.value for e in at.exception]
+    return errors
+
+def run_scenario(name, size, seed, context, measure_memory=True):
+    fake, counts = fresh_backend(size, seed)
+    started = time.perf_counter(); errors = run_steps(SCENARIOS[name], fake, context); cold = time.perf_counter() - started
+    queries = len(fake.calls); fake.calls.clear()
+    # Warmer Lauf: gleiche Schritte mit gefülltem Entity-Cache (neue Session, gleicher Prozess)
+    started = time.perf_counter(); run_steps(SCENARIOS[name], fake, context); warm = time.perf_counter() - started; warm_queries = len(fake.calls)
+    peak = None
+    if measure_memory:
+        fake, _ = fresh_backend(size, seed); tracemalloc.start()
+        try: run_steps(SCENARIOS[name], fake, context); peak = tracemalloc.get_traced_memory()[1]
+        finally: tracemalloc.stop()
+    return {'scenario': name, 'leads': size, 'tasks': counts['tasks'], 'notes': counts['notes'], 'cold_ms': round(cold * 1000, 1), 'warm_ms': round(warm * 1000, 1),
+            'queries': queries, 'warm_queries': warm_queries, 'peak_mb': round(peak / 2**20, 1) if peak is not None else None, 'errors': errors}
+
+def format_table(results):
+    header = f"{'Szenario':<22}{'Leads':>8}{'kalt ms':>11}{'warm ms':>11}{'Abfragen':>10}{'warm':>6}{'Peak MB':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(f"{r['scenario']:<22}{r['leads']:>8}{r['cold_ms']:>11.1f}{r['warm_ms']:>11.1f}{r['queries']:>10}{r['warm_queries']:>6}{r['peak_mb'] if r['peak_mb'] is not None else '-':>9}" + (f"  FEHLER: {r['errors'][0]}" if r['errors'] else ""))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LeadGen CRM Benchmarks (AppTest + In-Process-Supabase)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Anzahl Leads pro Lauf, z.B. 1000 10000 100000")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Peak-Speicher (tracemalloc, zusätzlicher Lauf) überspringen")
+    parser.add_argument("--json", help="Ergebnisse zusätzlich als JSON schreiben")
+    parser.add_argument("--cold-start", action="store_true", help="Nur Kaltstart messen: erster Rerun je Seite in einem frischen Interpreter (Median aus 3)")
+    args = parser.parse_args(argv)
+    os.chdir(ROOT); sys.path.insert(0, ROOT)
+    if args.cold_start:
+        results = measure_cold_start(COLD_START_PAGES, args.seed); print(format_cold_start(results))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f: json.dump(results, f, indent=2, ensure_ascii=False)
+        return 1 if any(r['errors'] for r in results) else 0
+    install_fake_client()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "apify_import.csv")
+        with open(csv_path, "wb") as f: f.write(apify_csv(CSV_IMPORT_ROWS, args.seed))
+        # Aufwärmen: Modulimporte (Selenium, Plotly, pandas) sollen nicht dem ersten Szenario zugerechnet werden
+        run_steps(SCENARIOS['startseite'], fresh_backend(10, args.seed)[0], {})
+        results = []
+        for size in args.sizes:
+            for name in args.scenarios:
+                results.append(run_scenario(name, size, args.seed, {'csv_path': csv_path}, measure_memory=not args.no_memory))
+                print(format_table(results[-1:]).splitlines()[-1], flush=True)
+    print("\n" + format_table(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(results, f, indent=2, ensure_ascii=False)
+    return 1 if any(r['errors'] for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
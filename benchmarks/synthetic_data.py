@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+# Synthetische, reproduzierbare Testdaten: Leads, Aufgaben und Notizen mit deutschen Namen und realistischer Statusverteilung
+# -----------------------------------------------------------------------------
+import csv
+import itertools
+import io
+import random
+from datetime import date, datetime, timedelta, timezone
+
+FIRST_NAMES = ["Anna", "Lukas", "Sophie", "Jonas", "Marie", "Leon", "Emma", "Felix", "Mia", "Paul", "Hannah", "Maximilian", "Lea", "Tim", "Laura", "Jan", "Katharina", "Tobias", "Julia", "Stefan"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann"]
+BRANCHES = {"Steuerberater": "Steuerberatung", "Rechtsanwalt": "Kanzlei", "Zahnarzt": "Zahnarztpraxis", "Physiotherapie": "Physiotherapie", "Friseur": "Salon",
+            "Dachdecker": "Bedachungen", "Elektriker": "Elektrotechnik", "Immobilienmakler": "Immobilien", "Autowerkstatt": "Kfz-Service", "Architekt": "Architekturbüro"}
+CITIES = [("Berlin", "10115"), ("Hamburg", "20095"), ("München", "80331"), ("Köln", "50667"), ("Frankfurt am Main", "60311"), ("Stuttgart", "70173"), ("Düsseldorf", "40213"), ("Leipzig", "04109"), ("Dortmund", "44135"), ("Essen", "45127")]
+STREETS = ["Hauptstraße", "Bahnhofstraße", "Gartenstraße", "Schulstraße", "Dorfstraße", "Bergstraße", "Lindenstraße", "Kirchstraße", "Waldstraße", "Ringstraße"]
+LEGAL_FORMS = ["", " GmbH", " GbR", " e.K.", " & Partner", " UG (haftungsbeschränkt)"]
+# Verteilung wie in einem laufenden Vertrieb: viele unbearbeitete, wenige Termine
+STATUS_WEIGHTS = {None: 35, "🟢 Offen": 20, "🔵 Erreicht": 10, "🔴 Nicht erreicht": 15, "🟣 FollowUp": 8, "🟡 Termin vereinbart": 5, "🟤 Kein Interesse": 7}
+NOTE_TEXTS = ["Rückruf erbeten, Chef erst ab 14 Uhr erreichbar.", "Hat Interesse an Website-Relaunch, Angebot schicken.", "Sekretariat blockt ab, später erneut versuchen.",
+              "Termin für Erstgespräch besprochen.", "Kein Bedarf in diesem Jahr, im Q1 erneut melden.", "Ansprechpartner im Urlaub bis Monatsende."]
+
+def slug(text):
+    return "".join(ch for ch in text.lower().replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss") if ch.isalnum())
+
+def generate_leads(count, user_id, seed=42, campaigns=12, archived_share=0.15, today=None):
+    rng = random.Random(seed); today = today or date.today()
+    campaign_specs = [(rng.choice(list(BRANCHES)), rng.choice(CITIES)) for _ in range(campaigns)]
+    archived_campaigns = set(rng.sample(range(campaigns), max(1, int(campaigns * archived_share))))
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    leads = []
+    for lead_id in range(1, count + 1):
+        campaign_index = rng.randrange(campaigns); branche, (city, plz) = campaign_specs[campaign_index]
+        owner = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"; name = f"{BRANCHES[branche]} {owner.split()[1]}{rng.choice(LEGAL_FORMS)}"
+        created = datetime.combine(today - timedelta(days=rng.randrange(120)), datetime.min.time(), tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(86400))
+        has_website = rng.random() < 0.7; domain = f"{slug(name)[:24]}-{lead_id}.de"
+        leads.append({'id': lead_id, 'name': name, 'branche': branche, 'address': f"{rng.choice(STREETS)} {rng.randint(1, 180)}, {plz} {city}", 'phone': f"0{rng.randint(30, 9999)} {rng.randint(100000, 9999999)}",
+                      'email': f"info@{domain}" if has_website and rng.random() < 0.4 else '', 'website': f"https://www.{domain}" if has_website else '',
+                      'contact_person': owner if rng.random() < 0.3 else '', 'status': rng.choices(statuses, weights)[0], 'campaign': f"GelbeSeiten: {branche} ({city})",
+                      'is_archived': campaign_index in archived_campaigns, 'user_id': user_id, 'created_at': created.isoformat(), 'updated_at': created.isoformat()})
+    return leads
+
+def generate_tasks(leads, user_id, seed=43, share=0.3, today=None):
+    rng = random.Random(seed); today = today or date.today(); tasks = []
+    for lead in leads:
+        if rng.random() >= share: continue
+        tasks.append({'id': len(tasks) + 1, 'lead_id': lead['id'], 'due_date': str(today + timedelta(days=rng.randint(-14, 30))), 'description': rng.choice(["Follow-Up", "Erneut anrufen", "Angebot nachfassen", "Unterlagen senden"]),
+                      'is_completed': rng.random() < 0.2, 'user_id': user_id, 'created_at': lead['created_at']})
+    return tasks
+
+def generate_notes(leads, user_id, seed=44, share=0.4):
+    rng = random.Random(seed); notes = []
+    for lead in leads:
+        for _ in range(rng.choices([0, 1, 2, 3], [1 - share, share * 0.6, share * 0.3, share * 0.1])[0]):
+            notes.append({'id': len(notes) + 1, 'lead_id': lead['id'], 'content': rng.choice(NOTE_TEXTS), 'user_id': user_id, 'created_at': lead['created_at']})
+    return notes
+
+def populate(db, lead_count, seed=42):
+    # Befüllt einen FakeSupabase direkt (ohne Insert-Overhead) und setzt die id-Sequenzen dahinter fort
+    user_id = db.auth.user.user.id
+    leads = generate_leads(lead_count, user_id, seed); tasks = generate_tasks(leads, user_id, seed + 1); notes = generate_notes(leads, user_id, seed + 2)
+    for table, rows in (('leads', leads), ('tasks', tasks), ('notes', notes)):
+        for row in rows: db.add(table, row)
+        db.ids[table] = itertools.count(len(rows) + 1)
+    return {'leads': len(leads), 'tasks': len(tasks), 'notes': len(notes)}
+
+def apify_csv(count, seed=45):
+    # CSV im Format eines Apify-Google-Maps-Exports (title, categoryName, address, phone, emails/0, domain)
+    rng = random.Random(seed); buffer = io.StringIO(); writer = csv.writer(buffer)
+    writer.writerow(["title", "categoryName", "address", "phone", "emails/0", "domain", "totalScore", "reviewsCount"])
+    for i in range(count):
+        branche = rng.choice(list(BRANCHES)); city, plz = rng.choice(CITIES); name = f"{BRANCHES[branche]} {rng.choice(LAST_NAMES)}{rng.choice(LEGAL_FORMS)}"
+        domain = f"{slug(name)[:24]}-import{i}.de"
+        writer.writerow([name, branche, f"{rng.choice(STREETS)} {rng.randint(1, 180)}, {plz} {city}", f"+49 {rng.randint(30, 9999)} {rng.randint(100000, 9999999)}", f"kontakt@{domain}", domain, round(rng.uniform(3, 5), 1), rng.randint(0, 400)])
+    return buffer.getvalue().encode('utf-8')
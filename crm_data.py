@@ -0,0 +1,908 @@
+# -----------------------------------------------------------------------------
+# LeadGen CRM - Datenzugriff: Supabase-Client, Caches, Lead-/Aufgaben-/Notiz-Funktionen und Scraper-Anbindung
+# (genutzt von LeadGen.py und den Seitenmodulen in views/)
+# -----------------------------------------------------------------------------
+
+# --- 1. IMPORTS & SETUP ---
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import pandas as pd
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError  # vor Python 3.11 nicht das eingebaute TimeoutError
+import threading
+import inspect
+import os
+import re
+import tempfile
+import hashlib
+from datetime import date, timedelta
+from supabase import create_client
+import numpy as np
+from entity_cache import ALL_SCOPE, EntityCache
+from instrumentation import TracedClient, Tracer, traced
+from enrichment import EnrichmentJob, enrichment_updates, run_enrichment
+from export import EXPORT_SCHEMAS, write_export
+from dedup import MERGE_FIELDS, add_to_key_index, build_key_index, match_against_index, find_duplicate_clusters
+from gelbeseiten import CARD_SELECTOR, LOAD_MORE_BUTTON_ID, MAX_EMPTY_PAGES, SEARCH_TIME_BUDGET, build_search_url, build_campaign_name, parse_result_cards, lead_key, iter_gelbeseiten_http
+
+# --- 3. SUPABASE SETUP & GLOBALE VARIABLEN ---
+@st.cache_resource
+def init_supabase_client():
+    try: url = st.secrets["supabase"]["url"]; key = st.secrets["supabase"]["key"]; return create_client(url, key)
+    except Exception as e: return None
+
+# Zustand einer Seitenabfrage im Worker-Thread (siehe run_page_queries): Nutzer, Tracer-Puffer, Sync-Speicher und gesammelte Fehler
+_page_worker = threading.local()
+
+def get_tracer():
+    # Nur aktiv, wenn im Debug-Panel eingeschaltet; Threads ohne Script-Kontext (z.B. Prefetch) werden nicht erfasst,
+    # Seitenabfragen schreiben in ihren eigenen Puffer
+    worker_tracer = getattr(_page_worker, 'tracer', None)
+    if worker_tracer is not None: return worker_tracer
+    if get_script_run_ctx(suppress_warning=True) is None: return None
+    try: return st.session_state.get('tracer') if st.session_state.get('debug_profiling') else None
+    except Exception: return None
+
+profiled = traced(get_tracer)
+supabase = TracedClient(init_supabase_client, get_tracer)  # Proxy, kein supabase.Client: nur table(), rpc() und durchgereichte Attribute
+LEADS_TABLE = "leads"
+TASKS_TABLE = "tasks"
+NOTES_TABLE = "notes"
+CAMPAIGN_SUMMARY_TABLE = "campaign_summary"
+PRIMARY_COLOR = "#ff7f02"
+LEAD_EDITABLE_COLS = ['name', 'branche', 'address', 'phone', 'email', 'website', 'contact_person', 'status', 'campaign']
+WRITE_CHUNK_SIZE = 500
+STREAM_BATCH_SIZE = 25
+IMPORT_CHUNK_SIZE = 5000
+KEYSET_PAGE_SIZE = 1000
+QUERY_TIMEOUT = 15
+TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leadgen_trace.jsonl")  # unabhängig vom Startverzeichnis von streamlit run
+TASK_COLUMNS = ['id', 'lead_id', 'due_date', 'due_label', 'description', 'lead_name', 'lead_status', 'lead_campaign']
+TASK_PAGE_SIZE = 25
+LEAD_PAGE_SIZE = 100
+LEAD_SEARCH_COLUMNS = ['name', 'address', 'phone', 'email', 'contact_person', 'website']
+SEARCH_RESULT_COLUMNS = ['lead_id', 'name', 'campaign', 'status', 'is_archived', 'match_source', 'snippet', 'rank']
+SEARCH_LIMIT = 20
+EMPTY_STATUS_OPTION = "-- Leer --"
+STATUS_OPTIONS = [EMPTY_STATUS_OPTION, "🟢 Offen", "🔵 Erreicht", "🔴 Nicht erreicht", "🟣 FollowUp", "🟡 Termin vereinbart", "🟤 Kein Interesse"]
+DOSSIER_TTL = 30
+DOSSIER_PREFETCH_NEIGHBOURS = 2
+DOSSIER_SELECT = "*, tasks(id, lead_id, due_date, description, is_completed), notes(id, lead_id, content, created_at)"
+CACHE_DEPENDENTS = {'leads': ('campaigns', 'search'), 'lead': ('dossier', 'search'), 'tasks': ('dossier',), 'notes': ('dossier', 'search')}
+DEDUP_COLUMNS = ['id'] + MERGE_FIELDS
+CAMPAIGN_SUMMARY_COLUMNS = ['campaign', 'lead_count', 'archived_count', 'status_counts', 'last_activity']
+ENRICH_SAVE_BATCH = 25
+ENRICH_POLL_SECONDS = 2
+EXPORT_TABLES = [LEADS_TABLE, TASKS_TABLE, NOTES_TABLE]
+EXPORT_LEAD_FIELDS = {'lead_name': 'name', 'lead_campaign': 'campaign'}  # Aufgaben/Notizen: Felder aus dem eingebetteten Lead
+EXPORT_MAX_PARALLEL = 2
+EXPORT_SLOT_TIMEOUT = 20  # Sekunden Wartezeit auf einen freien Export-Platz, danach Abbruch statt hängendem Download
+EXPORT_BUSY_MESSAGE = "Export läuft bereits, bitte später erneut versuchen."
+LEAD_COLUMNS = ['id', 'name', 'branche', 'address', 'phone', 'email', 'website', 'contact_person', 'status', 'campaign', 'is_archived', 'user_id', 'created_at']
+
+def clean_row_for_supabase(row_dict):
+    cleaned_dict = {}
+    for key, value in row_dict.items():
+        if pd.isna(value): cleaned_dict[key] = None
+        else: cleaned_dict[key] = value
+    return cleaned_dict
+
+def chunked(items, size=WRITE_CHUNK_SIZE):
+    for start in range(0, len(items), size): yield items[start:start + size]
+
+def df_to_records(df):
+    # NaN/NaT -> None in einem Schritt statt clean_row_for_supabase pro Zelle
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+# --- 4. DATABASE & SCRAPER FUNCTIONS (JETZT MIT user_id) ---
+def get_user_id():
+    worker_user_id = getattr(_page_worker, 'user_id', None)
+    if worker_user_id: return worker_user_id
+    if "user" in st.session_state and st.session_state.user:
+        return st.session_state.user.user.id
+    return None
+
+@st.cache_resource
+def get_entity_cache():
+    return EntityCache()
+
+def entity_cached(entity, ttl, scope_arg=None):
+    # Wie st.cache_data, aber pro Nutzer und Entität geschlüsselt, damit Schreibzugriffe nur Betroffenes verwerfen
+    def decorator(func):
+        signature = inspect.signature(func)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            user_id = get_user_id()
+            if not user_id: return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs); bound.apply_defaults()
+            scope = bound.arguments.get(scope_arg) if scope_arg else None
+            key = (user_id, entity, ALL_SCOPE if scope is None else scope, func.__name__, tuple(bound.arguments.items()))
+            cache = get_entity_cache(); hit, value = cache.get(key); tracer = get_tracer()
+            if tracer: tracer.record('cache', func.__name__, 0.0, hit=hit, entity=entity)
+            if not hit: value = func(*args, **kwargs); cache.set(key, value, ttl)
+            return copy_frames(value)
+        return wrapper
+    return decorator
+
+def copy_frames(value):
+    # Gecachte DataFrames nie selbst herausgeben, auch nicht in Tupeln wie (df, Gesamtzahl): Aufrufer verändern sie (z.B. der Editor)
+    if isinstance(value, pd.DataFrame): return value.copy()
+    if isinstance(value, tuple): return tuple(copy_frames(item) for item in value)
+    return value
+
+@st.cache_resource
+def get_query_executor():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="page-query")
+
+def page_query(func, *args, default=None, timeout=QUERY_TIMEOUT, **kwargs):
+    return {'call': functools.partial(func, *args, **kwargs), 'default': default, 'timeout': timeout}
+
+def report_error(message):
+    # In Seitenabfragen als Wert sammeln (angezeigt wird im Script-Thread), sonst direkt anzeigen
+    errors = getattr(_page_worker, 'errors', None)
+    if errors is not None: errors.append(message)
+    else: st.error(message)
+
+def _run_page_query(user_id, tracer, lead_sync_store, call):
+    # Läuft ohne Script-Kontext: eine abgelaufene Abfrage kann den Rerun überdauern und darf dann nichts mehr anzeigen.
+    # Alles Session-Bezogene kommt als Wert mit, Fehler und Tracer-Ereignisse gehen als Werte zurück
+    _page_worker.__dict__.update(user_id=user_id, tracer=tracer, lead_sync_store=lead_sync_store, errors=[])
+    try: return call(), _page_worker.errors
+    finally: _page_worker.__dict__.clear()
+
+def run_page_queries(**queries):
+    # Startet alle Datenabfragen einer Seite gleichzeitig; eine fehlerhafte oder zu langsame Abfrage liefert ihren Default
+    session_tracer = get_tracer(); user_id = get_user_id(); lead_sync_store = get_lead_sync_store(); executor = get_query_executor(); started = time.monotonic()
+    tracers = {name: Tracer() if session_tracer else None for name in queries}
+    futures = {name: executor.submit(_run_page_query, user_id, tracers[name], lead_sync_store, query['call']) for name, query in queries.items()}
+    results = {}
+    for name, future in futures.items():
+        query = queries[name]
+        try: results[name], errors = future.result(timeout=max(0.0, started + query['timeout'] - time.monotonic()))
+        except FutureTimeoutError: results[name] = query['default']; st.warning(f"Zeitüberschreitung beim Laden von '{name}'. Bitte Seite neu laden."); continue
+        except Exception as e: results[name] = query['default']; st.warning(f"Fehler beim Laden von '{name}': {e}"); continue
+        for message in errors: st.error(message)
+        if session_tracer: session_tracer.merge(tracers[name])
+    return results
+
+def clear_user_cache(user_id=None):
+    # Beim Logout: alle gecachten Daten des Nutzers verwerfen, statt sie bis zum TTL im Prozess liegen zu lassen
+    user_id = user_id or get_user_id()
+    if user_id: get_entity_cache().clear_user(user_id)
+
+def invalidate_cache(*entities, scope=None, user_id=None):
+    user_id = user_id or get_user_id()
+    if not user_id: return
+    cache = get_entity_cache()
+    for entity in set(entities) | {dep for entity in entities for dep in CACHE_DEPENDENTS.get(entity, ())}: cache.invalidate(user_id, entity, scope)
+
+@st.cache_resource
+def get_chromedriver_path():
+    # Einmal pro Prozess auflösen statt ChromeDriverManager().install() bei jeder Suche
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+def scrape_gelbeseiten_selenium(query, location, max_results, user_id, skip_keys=None):
+    # Selenium nur für den Browser-Fallback laden (kostet beim Import mehrere hundert ms)
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    chrome_options = Options(); chrome_options.add_argument("--headless"); chrome_options.add_argument("--disable-gpu"); chrome_options.add_argument("--no-sandbox"); chrome_options.add_argument("--window-size=1920x1080"); chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    try: service = Service(get_chromedriver_path()); driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception as e: st.error(f"❌ Fehler bei ChromeDriver: {e}"); return
+    skip_keys = skip_keys or set()
+    try:
+        driver.get(build_search_url(query, location))
+        try: cookie_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[contains(translate(., 'A..Z', 'a..z'), 'akzeptieren')]"))); cookie_button.click(); time.sleep(2)
+        except Exception: st.warning("Cookie-Banner nicht gefunden. Fahre fort...")
+        try: WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, CARD_SELECTOR)))
+        except Exception: return
+        deadline = time.monotonic() + SEARCH_TIME_BUDGET; campaign_name = build_campaign_name(query, location); seen_ids = set(); yielded = 0; empty_rounds = 0
+        while empty_rounds < MAX_EMPTY_PAGES and time.monotonic() < deadline:
+            # Ein page_source-Abruf statt mehrerer find_element-Roundtrips pro Karte
+            seen_before = len(seen_ids)
+            for lead in parse_result_cards(driver.page_source, query, campaign_name, user_id, seen_ids):
+                if lead_key(lead) in skip_keys: continue
+                yield lead; yielded += 1
+                if yielded >= max_results: return
+            empty_rounds = 0 if len(seen_ids) > seen_before else empty_rounds + 1
+            card_count = len(driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR))
+            try: driver.execute_script("arguments[0].click();", driver.find_element(By.ID, LOAD_MORE_BUTTON_ID))
+            except Exception: return
+            try: WebDriverWait(driver, 10).until(lambda d: len(d.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)) > card_count)
+            except Exception: return
+    finally: driver.quit()
+
+def scrape_gelbeseiten(query, location, max_results, skip_keys=None):
+    # Generator: liefert Leads, sobald sie geparst sind. Bricht HTTP ab, übernimmt der Browser ab dem letzten Stand.
+    user_id = get_user_id()
+    if not user_id: return
+    st.info(f"🔎 Suche auf GelbeSeiten.de: '{query}' in '{location}'...")
+    skip_keys = set(skip_keys or ()); yielded = 0
+    try:
+        for lead in iter_gelbeseiten_http(query, location, max_results, user_id, skip_keys=skip_keys):
+            skip_keys.add(lead_key(lead)); yielded += 1; yield lead
+        if yielded: return
+        st.warning("HTTP-Suche lieferte keine Treffer. Versuche Browser-Fallback...")
+    except Exception as e: st.warning(f"HTTP-Suche fehlgeschlagen ({e}). Versuche Browser-Fallback...")
+    yield from scrape_gelbeseiten_selenium(query, location, max_results - yielded, user_id, skip_keys)
+
+def get_dedup_index():
+    # Schlüsselindex über alle Leads des Nutzers (kampagnenübergreifend, inkl. Archiv) aus dem delta-synchronisierten Bestand;
+    # einmal pro Import/Suche aufbauen und mit add_to_dedup_index fortschreiben statt pro Block neu zu berechnen
+    leads = load_all_leads_data(columns=DEDUP_COLUMNS)
+    if 'id' not in leads.columns: leads = pd.DataFrame(columns=DEDUP_COLUMNS)
+    return {'index': build_key_index(leads), 'leads': leads.set_index('id')[MERGE_FIELDS].to_dict('index')}
+
+def add_to_dedup_index(dedup, rows):
+    # Gespeicherte bzw. ergänzte Leads (mit id) übernehmen, damit spätere Blöcke desselben Laufs sie als Bestand erkennen
+    rows = [row for row in rows if row.get('id') is not None]
+    if not rows: return dedup
+    add_to_key_index(dedup['index'], pd.DataFrame(rows))
+    for row in rows: dedup['leads'].setdefault(int(row['id']), {}).update({field: row[field] for field in MERGE_FIELDS if field in row})
+    return dedup
+
+def merge_into_existing(incoming, existing_id, dedup):
+    # Ergänzt nur leere Felder der vorhandenen Leads mit Werten aus dem Import; nichts wird überschrieben
+    matched = existing_id.dropna().astype(int); matched = matched[~matched.duplicated()]
+    if matched.empty: return 0
+    fields = [f for f in MERGE_FIELDS if f in incoming.columns]
+    current = pd.DataFrame.from_dict({i: dedup['leads'][i] for i in matched.values}, orient='index').reindex(columns=fields); new_values = incoming.loc[matched.index, fields].set_axis(current.index)
+    is_blank = lambda frame: frame.isna() | frame.astype(str).apply(lambda c: c.str.strip()).eq('')
+    fill = is_blank(current) & ~is_blank(new_values)
+    changed = fill.any(axis=1)
+    if not changed.any(): return 0
+    merged = current.mask(fill, new_values)[changed].rename_axis('id').reset_index().assign(user_id=get_user_id())
+    for chunk in chunked(df_to_records(merged)): supabase.table(LEADS_TABLE).upsert(chunk, on_conflict='id').execute()
+    add_to_dedup_index(dedup, df_to_records(merged)); invalidate_cache('leads', 'lead'); return int(changed.sum())
+
+def resolve_duplicates(records, dedup_mode=None, stats=None, dedup=None):
+    # Prüft einen ganzen Block gegen den Schlüsselindex. Dubletten innerhalb des Blocks werden immer verworfen;
+    # Treffer im Bestand je nach Modus übersprungen ("skip"), in den Bestand gemischt ("merge") oder markiert gespeichert ("tag").
+    dedup_mode = dedup_mode or st.session_state.get('dedup_mode', 'skip')
+    if not records: return records
+    incoming = pd.DataFrame(records); dedup = dedup if dedup is not None else get_dedup_index()
+    existing_id, duplicate_in_batch = match_against_index(incoming, dedup['index'])
+    is_existing = existing_id.notna() & ~duplicate_in_batch
+    if stats is not None: stats['duplicates'] = stats.get('duplicates', 0) + int((is_existing | duplicate_in_batch).sum())
+    if dedup_mode == 'merge':
+        merged = merge_into_existing(incoming, existing_id[is_existing], dedup)
+        if stats is not None: stats['merged'] = stats.get('merged', 0) + merged
+    keep = ~duplicate_in_batch if dedup_mode == 'tag' else ~(is_existing | duplicate_in_batch)
+    if dedup_mode == 'tag': return [{**record, 'duplicate_of': int(existing_id[i]) if is_existing[i] else None} for i, record in enumerate(records) if keep[i]]
+    return [record for i, record in enumerate(records) if keep[i]]
+
+@profiled
+def save_leads_to_supabase(leads_data, notify=True, dedup_mode=None, stats=None, dedup=None):
+    user_id = get_user_id()
+    if not user_id: st.error("Nicht eingeloggt."); return 0
+    for lead in leads_data: lead['user_id'] = user_id
+    dedup = dedup if dedup is not None else get_dedup_index()
+    cleaned_data = resolve_duplicates([clean_row_for_supabase(row) for row in leads_data], dedup_mode, stats, dedup)
+    if not cleaned_data: return 0
+    try:
+        response = supabase.table(LEADS_TABLE).insert(cleaned_data).execute()
+        add_to_dedup_index(dedup, response.data); invalidate_cache('leads', 'campaigns')
+        if notify: st.success(f"{len(response.data)} Leads erfolgreich gespeichert.")
+        return len(response.data)
+    except Exception as e: st.error(f"Fehler beim Speichern in Supabase: {e}"); return 0
+
+@profiled
+def insert_lead_batch(leads, user_id, retries=2, dedup_mode=None, stats=None, dedup=None):
+    # Erwartet bereits bereinigte Datensätze (keine NaN-Werte), z.B. aus dem Scraper oder df_to_records;
+    # dedup: Index des laufenden Imports (get_dedup_index), wird um die gespeicherten Leads ergänzt
+    dedup = dedup if dedup is not None else get_dedup_index()
+    records = resolve_duplicates([{**lead, 'user_id': user_id} for lead in leads], dedup_mode, stats, dedup)
+    if not records: return 0
+    for attempt in range(retries + 1):
+        try: saved = supabase.table(LEADS_TABLE).insert(records).execute().data; add_to_dedup_index(dedup, saved); invalidate_cache('leads', 'campaigns'); return len(saved)
+        except Exception:
+            if attempt == retries: raise
+            time.sleep(2 ** attempt)
+
+def format_dedup_stats(stats):
+    if not stats.get('duplicates'): return ""
+    return f" {stats['duplicates']} Dubletten erkannt" + (f", {stats['merged']} vorhandene Leads ergänzt." if stats.get('merged') else ".")
+
+def load_duplicate_clusters():
+    leads = load_all_leads_data(columns=DEDUP_COLUMNS + ['campaign', 'is_archived', 'created_at'])
+    if leads.empty: return pd.DataFrame(columns=['cluster_id'] + DEDUP_COLUMNS)
+    clusters = find_duplicate_clusters(leads)
+    return clusters.merge(leads, on='id', how='left')
+
+def resolve_duplicate_clusters(clusters, action):
+    # Ältester Lead (kleinste ID) je Cluster bleibt; die übrigen werden markiert oder gelöscht. Die Cluster stammen aus einer
+    # früheren Prüfung: nur Leads anfassen, die samt ihrem Cluster-Hauptlead für diesen Nutzer noch existieren
+    user_id = get_user_id()
+    if not user_id: st.error("Nicht eingeloggt."); return 0
+    checked_ids = [int(i) for i in pd.unique(clusters[['id', 'cluster_id']].values.ravel())]
+    existing = {row['id'] for chunk in chunked(checked_ids) for row in supabase.table(LEADS_TABLE).select("id").in_("id", chunk).eq('user_id', user_id).execute().data}
+    duplicates = clusters[(clusters['id'] != clusters['cluster_id']) & clusters['id'].isin(existing) & clusters['cluster_id'].isin(existing)]
+    if action == 'delete':
+        for chunk in chunked([int(i) for i in duplicates['id']]): supabase.table(LEADS_TABLE).delete().in_("id", chunk).eq('user_id', user_id).execute()
+        invalidate_cache('leads', 'lead', 'campaigns', 'tasks', 'notes')
+    else:
+        for cluster_id, ids in duplicates.groupby('cluster_id')['id']:
+            for chunk in chunked([int(i) for i in ids]): supabase.table(LEADS_TABLE).update({'duplicate_of': int(cluster_id)}).in_("id", chunk).eq('user_id', user_id).execute()
+        invalidate_cache('leads', 'lead')
+    return len(duplicates)
+
+def load_enrichment_candidates(user_id, campaign):
+    # Leads mit Webseite, bei denen E-Mail oder Ansprechpartner noch fehlen
+    rows = fetch_rows_keyset(LEADS_TABLE, ",".join(DEDUP_COLUMNS), [('eq', 'user_id', user_id), ('eq', 'campaign', campaign), ('neq', 'website', '')])
+    return [row for row in rows if (row.get('website') or '').strip() and not all((row.get(field) or '').strip() for field in ('email', 'contact_person'))]
+
+def save_enrichment_results(user_id, leads_by_id, results):
+    # Schreibt nur die gefundenen Felder (kein Rückschreiben des Job-Snapshots) und nur, solange sie in der Datenbank noch leer sind:
+    # Änderungen, die während des Laufs im CRM gemacht wurden, bleiben erhalten. Ein rpc/apply_enrichment pro Chunk = ein UPDATE
+    rows = [{'id': result['id'], **updates} for result in results if (updates := enrichment_updates(leads_by_id[result['id']], result))]
+    if not rows: return 0
+    try: updated = sum(int(supabase.rpc('apply_enrichment', {'p_rows': chunk}).execute().data or 0) for chunk in chunked(rows))
+    except Exception: updated = save_enrichment_rows_per_field(user_id, rows)  # Migration fehlt
+    if updated: invalidate_cache('leads', 'lead', user_id=user_id)
+    return updated
+
+def save_enrichment_rows_per_field(user_id, rows):
+    updated = set()
+    for row in rows:
+        for field, value in row.items():
+            if field != 'id' and supabase.table(LEADS_TABLE).update({field: value}).eq('id', row['id']).eq('user_id', user_id).or_(f"{field}.is.null,{field}.eq.").execute().data: updated.add(row['id'])
+    return len(updated)
+
+def run_enrichment_job(job, user_id, campaign):
+    # Läuft im Hintergrund-Thread ohne Script-Kontext: user_id kommt als Argument, Fehler landen im Job statt in st.error.
+    # on_result läuft in der Event-Loop der Abrufe; gespeichert wird daher in einem eigenen Thread, damit kein Abruf auf Supabase wartet
+    try:
+        leads = load_enrichment_candidates(user_id, campaign); leads_by_id = {lead['id']: lead for lead in leads}; pending = []; saves = []; job.total = len(leads)
+        def save(batch): job.updated += save_enrichment_results(user_id, leads_by_id, batch)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="enrichment-save") as saver:
+            def flush(): saves.append(saver.submit(save, pending.copy())); pending.clear()
+            def on_result(result):
+                job.record(result); pending.append(result)
+                if len(pending) >= ENRICH_SAVE_BATCH: flush()
+            run_enrichment(leads, on_result=on_result, should_stop=lambda: job.cancelled)
+            if pending: flush()
+        for future in saves: future.result()  # Fehler beim Speichern an den Job weitergeben
+        job.finish()
+    except Exception as e: job.finish(error=str(e))
+
+@st.cache_resource
+def get_enrichment_executor():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="enrichment")
+
+@st.cache_resource
+def get_enrichment_jobs():
+    # (user_id, kampagne) -> EnrichmentJob; überdauert Reruns und Seitenwechsel
+    return {}
+
+def get_enrichment_job(campaign):
+    return get_enrichment_jobs().get((get_user_id(), campaign))
+
+def start_enrichment_job(campaign):
+    user_id = get_user_id(); jobs = get_enrichment_jobs()
+    if not user_id: st.error("Nicht eingeloggt."); return None
+    if jobs.get((user_id, campaign)) and jobs[(user_id, campaign)].running: return jobs[(user_id, campaign)]
+    job = jobs[(user_id, campaign)] = EnrichmentJob(campaign)
+    get_enrichment_executor().submit(run_enrichment_job, job, user_id, campaign)
+    return job
+
+def resolve_import_path(columns, path):
+    # Apify-Pfade wie "emails/0": entweder flache Spalte des CSV-Exports oder Element einer Listen-Spalte "emails"
+    if not path: return None
+    if path in columns: return path
+    base, _, index = path.partition('/')
+    return path if index.isdigit() and base in columns else None
+
+def extract_import_column(chunk, path):
+    if path in chunk.columns: return chunk[path]
+    base, _, index = path.partition('/')
+    return chunk[base].str.strip('[]').str.split(',').str[int(index)].str.strip(' "\'')
+
+def map_import_chunk(chunk, mapping, campaign_name):
+    frame = pd.DataFrame({field: extract_import_column(chunk, path) if path else None for field, path in mapping.items()}, index=chunk.index)
+    frame = frame[frame['name'].notna() & (frame['name'].str.strip() != '')]
+    return frame.assign(status=None, campaign=campaign_name, is_archived=False)
+
+@profiled
+def import_leads_csv(file, mapping, campaign_name, on_progress=None, chunk_size=IMPORT_CHUNK_SIZE, stats=None):
+    # Liest die Datei blockweise (nur die zugeordneten Spalten), mappt und bereinigt vektorisiert und speichert jeden Block sofort
+    user_id = get_user_id()
+    if not user_id: st.error("Nicht eingeloggt."); return 0, 0
+    file.seek(0); columns = pd.read_csv(file, nrows=0).columns; file.seek(0)
+    usecols = sorted({path if path in columns else path.partition('/')[0] for path in mapping.values() if path})
+    rows_read = saved = 0; started = time.perf_counter(); dedup = get_dedup_index()
+    for chunk in pd.read_csv(file, chunksize=chunk_size, dtype=str, usecols=usecols):
+        rows_read += len(chunk)
+        for batch in chunked(df_to_records(map_import_chunk(chunk, mapping, campaign_name))): saved += insert_lead_batch(batch, user_id, stats=stats, dedup=dedup)
+        if on_progress: on_progress(rows_read, saved, file.tell(), time.perf_counter() - started)
+    return rows_read, saved
+
+def stream_leads_to_supabase(leads_iter, batch_size=STREAM_BATCH_SIZE, on_progress=None, stats=None):
+    # Speichert während des Scrapens blockweise; bei einem Abbruch bleiben alle bereits geschriebenen Blöcke erhalten
+    user_id = get_user_id()
+    if not user_id: st.error("Nicht eingeloggt."); return 0, 0
+    found = saved = 0; batch = []; dedup = get_dedup_index()
+    for lead in leads_iter:
+        found += 1; batch.append(lead)
+        if len(batch) >= batch_size: saved += insert_lead_batch(batch, user_id, stats=stats, dedup=dedup); batch = []
+        if on_progress: on_progress(found, saved)
+    if batch: saved += insert_lead_batch(batch, user_id, stats=stats, dedup=dedup)
+    if on_progress: on_progress(found, saved)
+    return found, saved
+
+def load_campaign_lead_keys(campaign_name):
+    user_id = get_user_id()
+    if not user_id: return set()
+    try:
+        response = supabase.table(LEADS_TABLE).select("name, address").eq("campaign", campaign_name).eq('user_id', user_id).execute()
+        return {lead_key(row) for row in response.data}
+    except Exception: return set()
+
+def compute_lead_changeset(df_before, df_after, columns=LEAD_EDITABLE_COLS):
+    # Vergleicht Vorher/Nachher-Stand des Editors spaltenweise und liefert nur neue, geänderte und gelöschte Zeilen
+    cols = [c for c in columns if c in df_after.columns]
+    after_ids = pd.to_numeric(df_after['id'], errors='coerce') if 'id' in df_after.columns else pd.Series(np.nan, index=df_after.index)
+    before_ids = pd.to_numeric(df_before['id'], errors='coerce') if not df_before.empty else pd.Series(dtype=float)
+    before = df_before.assign(id=before_ids).dropna(subset=['id']).drop_duplicates('id').set_index('id') if not df_before.empty else pd.DataFrame(columns=cols)
+    is_known = after_ids.isin(before.index)
+    inserted = df_after.loc[~is_known, cols]
+    if 'name' in inserted.columns: inserted = inserted[inserted['name'].notna() & (inserted['name'].astype(str).str.strip() != '')]
+    after = df_after.loc[is_known, cols].set_axis(after_ids[is_known].astype(int).values).loc[lambda d: ~d.index.duplicated()]
+    before_common = before.loc[after.index, cols]
+    changed_mask = (after.fillna('').astype(str) != before_common.fillna('').astype(str)).any(axis=1)
+    modified = after[changed_mask.values].rename_axis('id').reset_index()
+    deleted_ids = [int(i) for i in before.index.difference(after.index)]
+    return {'inserted': inserted, 'modified': modified, 'deleted_ids': deleted_ids}
+
+@profiled
+def apply_lead_changeset(changeset):
+    user_id = get_user_id()
+    if not user_id: st.error("Nicht eingeloggt."); return None
+    inserted = df_to_records(changeset['inserted'].assign(user_id=user_id)); modified = df_to_records(changeset['modified'].assign(user_id=user_id)); deleted_ids = changeset['deleted_ids']
+    for chunk in chunked(modified): supabase.table(LEADS_TABLE).upsert(chunk, on_conflict='id').execute()
+    for chunk in chunked(inserted): supabase.table(LEADS_TABLE).insert(chunk).execute()
+    for chunk in chunked(deleted_ids): supabase.table(LEADS_TABLE).delete().in_("id", chunk).eq('user_id', user_id).execute()
+    if inserted or modified or deleted_ids: invalidate_cache('leads', 'lead', 'campaigns', 'tasks')
+    return {'inserted': len(inserted), 'modified': len(modified), 'deleted': len(deleted_ids)}
+
+def iter_keyset_pages(table, columns, filters, page_size=KEYSET_PAGE_SIZE):
+    # Blättert über id statt offset: jede Seite kostet gleich viel, und PostgRESTs max-rows-Grenze greift nicht mehr
+    last_id = None
+    while True:
+        query = supabase.table(table).select(columns)
+        for op, column, value in filters: query = getattr(query, op)(column, value)
+        if last_id is not None: query = query.gt('id', last_id)
+        page = query.order('id').limit(page_size).execute().data
+        if page: yield page
+        if len(page) < page_size: return
+        last_id = page[-1]['id']
+
+def fetch_rows_keyset(table, columns, filters, page_size=KEYSET_PAGE_SIZE):
+    return [row for page in iter_keyset_pages(table, columns, filters, page_size) for row in page]
+
+def export_select(table):
+    columns = [col for col in EXPORT_SCHEMAS[table] if col not in EXPORT_LEAD_FIELDS]
+    return ", ".join(columns) + ("" if table == LEADS_TABLE else f", leads!inner({', '.join(EXPORT_LEAD_FIELDS.values())})")
+
+def export_filters(table, user_id, scope, campaign=None):
+    # Aufgaben und Notizen werden über den eingebetteten Lead auf Kampagne bzw. Archiv eingeschränkt
+    prefix = "" if table == LEADS_TABLE else "leads."; filters = [('eq', 'user_id', user_id)]
+    if scope == 'campaign': filters.append(('eq', f"{prefix}campaign", campaign))
+    elif scope == 'archive': filters.append(('eq', f"{prefix}is_archived", True))
+    return filters
+
+def iter_export_pages(table, user_id, scope, campaign=None):
+    for page in iter_keyset_pages(table, export_select(table), export_filters(table, user_id, scope, campaign)):
+        if table != LEADS_TABLE:
+            for row in page: lead = row.pop('leads', None) or {}; row.update({col: lead.get(field) for col, field in EXPORT_LEAD_FIELDS.items()})
+        yield page
+
+@st.cache_resource
+def get_export_slots():
+    # Begrenzt gleichzeitige Exporte serverweit, damit große Exporte die Worker-Threads nicht für alle belegen
+    return threading.BoundedSemaphore(EXPORT_MAX_PARALLEL)
+
+def build_export(user_id, scope, fmt, campaign=None):
+    # Läuft erst beim Klick auf den Download-Button in einem Worker-Thread ohne Script-Kontext (daher user_id als Argument).
+    # Seiten gehen direkt in eine Temp-Datei; Streamlit übernimmt nur das fertige, komprimierte ZIP
+    slots = get_export_slots()
+    if not slots.acquire(timeout=EXPORT_SLOT_TIMEOUT): raise RuntimeError(EXPORT_BUSY_MESSAGE)
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            write_export(tmp, {table: iter_export_pages(table, user_id, scope, campaign) for table in EXPORT_TABLES}, fmt)
+            tmp.seek(0); return tmp.read()
+    finally: slots.release()
+
+def export_slots_busy():
+    # Nur für die Anzeige: sind gerade alle Plätze belegt, gleich Bescheid geben statt erst nach EXPORT_SLOT_TIMEOUT
+    slots = get_export_slots()
+    if not slots.acquire(blocking=False): return True
+    slots.release(); return False
+
+def normalize_leads_df(rows, columns):
+    df = pd.DataFrame(rows)
+    for col in columns:
+        if col not in df.columns: df[col] = pd.NA if col != 'is_archived' else False
+    if 'is_archived' in df.columns: df['is_archived'] = df['is_archived'].fillna(False)
+    return df
+
+def updated_at_micros(values):
+    # Wie (extract(epoch from updated_at) * 1000000)::bigint in der Datenbank; fehlende Zeitstempel als -1
+    stamps = pd.to_datetime(pd.Series(list(values), dtype=object), utc=True, format='ISO8601', errors='coerce')
+    return ((stamps - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(microseconds=1)).fillna(-1).astype('int64')
+
+def lead_version_checksum(ids, updated_at):
+    # Gleiche Form wie rpc/lead_version_checksum: Anzahl und md5 über "id:updated_at" (aufsteigend nach ID, kommagetrennt)
+    versions = sorted(zip((int(i) for i in ids), updated_at_micros(updated_at)))
+    return len(versions), hashlib.md5(",".join(f"{i}:{v}" for i, v in versions).encode()).hexdigest()
+
+def remote_lead_version_checksum(user_id):
+    try: row = supabase.rpc('lead_version_checksum', {}).execute().data[0]; return int(row['lead_count']), row['version_hash']
+    except Exception:  # Migration fehlt: IDs und Zeitstempel laden
+        rows = fetch_rows_keyset(LEADS_TABLE, 'id, updated_at', [('eq', 'user_id', user_id)])
+        return lead_version_checksum([r['id'] for r in rows], [r.get('updated_at') for r in rows])
+
+def sync_leads_frame(user_id, columns, entry):
+    # Erstes Laden: alle Seiten per Keyset. Danach nur Zeilen mit updated_at >= Wasserzeichen nachladen und einmischen;
+    # stimmt die Prüfsumme über IDs und updated_at danach nicht mit der Datenbank überein, wird komplett neu geladen.
+    # Die Anzahl allein reicht nicht (Löschen + Import zwischen zwei Abgleichen), die ID-Menge allein auch nicht: ein Update, das nach dem
+    # Abgleich committet, aber den Zeitstempel seines älteren Transaktionsbeginns trägt, fällt durch die Delta-Abfrage.
+    base_filters = [('eq', 'user_id', user_id)]
+    if entry is not None and entry['watermark'] is not None:
+        changed = fetch_rows_keyset(LEADS_TABLE, ",".join(columns + ['updated_at']), base_filters + [('gte', 'updated_at', entry['watermark'])])
+        remote = remote_lead_version_checksum(user_id)
+        df, versions = entry['df'], entry['versions']
+        if changed:
+            changed_df = normalize_leads_df(changed, columns)
+            df = pd.concat([df[~df['id'].isin(changed_df['id'])], changed_df[df.columns]], ignore_index=True).sort_values('id', ascending=False, ignore_index=True)
+            versions = {**versions, **{int(r['id']): r.get('updated_at') for r in changed}}
+        if remote == lead_version_checksum(versions.keys(), versions.values()):
+            return {'df': df, 'versions': versions, 'watermark': max([entry['watermark']] + [r['updated_at'] for r in changed if r.get('updated_at')])}
+    try: rows = fetch_rows_keyset(LEADS_TABLE, ",".join(columns + ['updated_at']), base_filters); watermark = max((r['updated_at'] for r in rows if r.get('updated_at')), default=None)
+    except Exception: rows = fetch_rows_keyset(LEADS_TABLE, ",".join(columns), base_filters); watermark = None  # Migration ohne updated_at: immer Vollabgleich
+    df = normalize_leads_df(rows, columns)[columns].sort_values('id', ascending=False, ignore_index=True)
+    return {'df': df, 'versions': {int(r['id']): r.get('updated_at') for r in rows}, 'watermark': watermark}
+
+def get_lead_sync_store():
+    store = getattr(_page_worker, 'lead_sync_store', None)
+    return store if store is not None else st.session_state.setdefault('lead_sync_store', {})
+
+@profiled
+def load_all_leads_data(columns=None):
+    user_id = get_user_id()
+    if not user_id: return pd.DataFrame()
+    columns = list(columns or LEAD_COLUMNS)
+    if 'id' not in columns: columns = ['id'] + columns
+    store = get_lead_sync_store(); key = (user_id, tuple(columns))
+    try: store[key] = sync_leads_frame(user_id, columns, store.get(key)); return store[key]['df'].copy()
+    except Exception as e: report_error(f"Fehler beim Laden von Supabase: {e}"); return pd.DataFrame()
+
+def build_lead_search_filter(search):
+    # PostgREST or-Filter über mehrere Textspalten; Zeichen mit Sonderbedeutung in der Filtersyntax werden entfernt
+    term = re.sub(r'[,()*%"\\:]', ' ', search or '').strip()
+    return ",".join(f"{col}.ilike.*{term}*" for col in LEAD_SEARCH_COLUMNS) if term else None
+
+def apply_lead_filters(query, campaign=None, status=None, branche=None, search=None):
+    # Filter der Lead-Tabelle im TagesGeschäft (nur aktive Leads); gilt für Seitenabfrage und Sammelaktion gleichermaßen
+    query = query.eq("is_archived", False)
+    if campaign: query = query.eq("campaign", campaign)
+    if status == EMPTY_STATUS_OPTION: query = query.is_("status", "null")
+    elif status: query = query.eq("status", status)
+    if branche and branche.strip(): query = query.ilike("branche", f"%{branche.strip()}%")
+    search_filter = build_lead_search_filter(search)
+    return query.or_(search_filter) if search_filter else query
+
+@profiled
+@entity_cached('leads', ttl=30)
+def load_lead_page(page=0, page_size=LEAD_PAGE_SIZE, campaign=None, status=None, branche=None, search=None):
+    # Eine Seite aktiver Leads samt Gesamtzahl; alle Filter laufen in der Datenbank
+    user_id = get_user_id()
+    if not user_id: return pd.DataFrame(columns=LEAD_COLUMNS), 0
+    try:
+        query = apply_lead_filters(supabase.table(LEADS_TABLE).select(",".join(LEAD_COLUMNS), count='exact').eq('user_id', user_id), campaign, status, branche, search)
+        response = query.order("id", desc=True).range(page * page_size, (page + 1) * page_size - 1).execute()
+        return normalize_leads_df(response.data, LEAD_COLUMNS)[LEAD_COLUMNS], response.count or 0
+    except Exception as e: report_error(f"Fehler beim Laden der Leads: {e}"); return pd.DataFrame(columns=LEAD_COLUMNS), 0
+
+def search_leads_fallback(user_id, term, limit):
+    # Ohne Such-Migration: Teilstring-Suche per ilike (kein Präfix-Ranking, keine Tippfehler-Toleranz)
+    lead_filter = build_lead_search_filter(term); term = re.sub(r'[,()*%"\\:]', ' ', term).strip()
+    if not lead_filter: return pd.DataFrame(columns=SEARCH_RESULT_COLUMNS)
+    leads = supabase.table(LEADS_TABLE).select("id, name, campaign, status, is_archived").eq('user_id', user_id).or_(lead_filter + f",branche.ilike.*{term}*").limit(limit).execute().data
+    notes = supabase.table(NOTES_TABLE).select("lead_id, content, leads!inner(name, campaign, status, is_archived)").eq('user_id', user_id).ilike("content", f"%{term}%").limit(limit).execute().data
+    rows = [{'lead_id': r['id'], 'name': r['name'], 'campaign': r['campaign'], 'status': r['status'], 'is_archived': r['is_archived'], 'match_source': 'lead', 'snippet': None, 'rank': 1.0} for r in leads]
+    rows += [{'lead_id': n['lead_id'], **n['leads'], 'match_source': 'note', 'snippet': n['content'][:160], 'rank': 0.5} for n in notes]
+    return pd.DataFrame(rows, columns=SEARCH_RESULT_COLUMNS).drop_duplicates('lead_id').head(limit)
+
+@profiled
+@entity_cached('search', ttl=30)
+def search_leads(term, limit=SEARCH_LIMIT):
+    # Präfix- und tippfehlertolerante Suche über Stammdaten und Notizen, gerankt in der Datenbank (rpc search_leads)
+    user_id = get_user_id(); term = (term or '').strip()
+    if not user_id or not term: return pd.DataFrame(columns=SEARCH_RESULT_COLUMNS)
+    try: results = pd.DataFrame(supabase.rpc('search_leads', {'p_query': term, 'p_limit': limit}).execute().data, columns=SEARCH_RESULT_COLUMNS)
+    except Exception:
+        try: results = search_leads_fallback(user_id, term, limit)
+        except Exception as e: report_error(f"Fehler bei der Suche: {e}"); return pd.DataFrame(columns=SEARCH_RESULT_COLUMNS)
+    text_cols = ['name', 'campaign', 'status', 'snippet']; results[text_cols] = results[text_cols].astype(object).where(results[text_cols].notna(), None)
+    return results
+
+def aggregate_leads_locally(df, start_date=None, end_date=None, include_archived=False, by_day=False):
+    # Gleiche Form wie lead_status_counts, falls die Datenbankfunktion (noch) nicht eingespielt ist
+    if df.empty: return pd.DataFrame(columns=['campaign', 'status', 'created_day', 'lead_count'])
+    created_day = pd.to_datetime(df['created_at'], utc=True).dt.date
+    mask = pd.Series(True, index=df.index)
+    if not include_archived: mask &= df['is_archived'] == False
+    if start_date: mask &= created_day >= start_date
+    if end_date: mask &= created_day <= end_date
+    grouped = df[mask].assign(created_day=created_day[mask] if by_day else None)
+    return grouped.groupby(['campaign', 'status', 'created_day'], dropna=False).size().rename('lead_count').reset_index()
+
+@profiled
+@entity_cached('leads', ttl=30)
+def load_lead_aggregates(start_date=None, end_date=None, include_archived=False, by_day=False):
+    if not get_user_id(): return pd.DataFrame(columns=['campaign', 'status', 'created_day', 'lead_count'])
+    params = {'p_start': str(start_date) if start_date else None, 'p_end': str(end_date) if end_date else None, 'p_include_archived': include_archived, 'p_by_day': by_day}
+    try: agg = pd.DataFrame(supabase.rpc('lead_status_counts', params).execute().data, columns=['campaign', 'status', 'created_day', 'lead_count'])
+    except Exception:
+        leads_df = load_all_leads_data(columns=['id', 'status', 'campaign', 'is_archived', 'created_at'])
+        agg = aggregate_leads_locally(leads_df, start_date, end_date, include_archived, by_day)
+    return agg.astype({'campaign': object, 'status': object, 'lead_count': int})
+
+def summarize_campaigns_locally(df):
+    # Fallback ohne campaign_summary-Tabelle: gleiche Struktur, aber aus dem (delta-synchronisierten) Lead-Bestand berechnet
+    df = df[df['campaign'].notna() & (df['campaign'] != '')] if not df.empty else df
+    if df.empty: return pd.DataFrame(columns=CAMPAIGN_SUMMARY_COLUMNS)
+    status_counts = df.groupby(['campaign', df['status'].fillna('')]).size().unstack(fill_value=0)
+    summary = df.groupby('campaign').agg(lead_count=('id', 'size'), archived_count=('is_archived', 'sum'), last_activity=('created_at', 'max'))
+    summary['status_counts'] = [{status: int(n) for status, n in row.items() if n} for row in status_counts.loc[summary.index].to_dict('records')]
+    return summary.reset_index()[CAMPAIGN_SUMMARY_COLUMNS]
+
+@profiled
+@entity_cached('campaigns', ttl=60)
+def load_campaign_summary():
+    # Eine Zeile pro Kampagne (per Trigger gepflegt) statt der campaign-Spalte aller Leads
+    user_id = get_user_id()
+    if not user_id: return pd.DataFrame(columns=CAMPAIGN_SUMMARY_COLUMNS)
+    try: summary = pd.DataFrame(supabase.table(CAMPAIGN_SUMMARY_TABLE).select(",".join(CAMPAIGN_SUMMARY_COLUMNS)).eq('user_id', user_id).order('campaign').execute().data, columns=CAMPAIGN_SUMMARY_COLUMNS)
+    except Exception: summary = summarize_campaigns_locally(load_all_leads_data(columns=['id', 'status', 'campaign', 'is_archived', 'created_at']))
+    summary['status_counts'] = summary['status_counts'].map(lambda counts: counts or {})
+    summary['last_activity'] = pd.to_datetime(summary['last_activity'], utc=True, format='ISO8601')
+    return summary.sort_values('campaign', ignore_index=True).astype({'lead_count': int, 'archived_count': int})
+
+def appointment_counts(campaign_summary):
+    # "Termin vereinbart" je Kampagne aus den Statuszählungen der Kampagnenübersicht
+    return campaign_summary['status_counts'].map(lambda counts: sum(n for status, n in counts.items() if "Termin vereinbart" in status)).astype(int)
+
+def get_unique_campaigns(archived=False):
+    # Eine Kampagne mit aktiven und archivierten Leads erscheint (wie bisher) in beiden Listen
+    summary = load_campaign_summary()
+    return summary.loc[summary['archived_count'] > 0 if archived else summary['lead_count'] > summary['archived_count'], 'campaign'].tolist()
+
+@profiled
+@entity_cached('leads', ttl=60)
+def get_all_leads_for_dropdown(archived=False):
+    user_id = get_user_id()
+    if not user_id: return []
+    try:
+        response = supabase.table(LEADS_TABLE).select("id, name, campaign").eq("is_archived", archived).eq('user_id', user_id).order("name").execute()
+        return response.data
+    except Exception: return []
+
+@profiled
+@entity_cached('lead', ttl=30, scope_arg='lead_id')
+def get_lead_details(lead_id):
+    user_id = get_user_id()
+    if not user_id: return None
+    try:
+        response = supabase.table(LEADS_TABLE).select("*").eq("id", lead_id).eq('user_id', user_id).single().execute()
+        return response.data
+    except Exception: return None
+
+def fetch_lead_dossier(user_id, lead_id):
+    # Lead, offene Aufgaben und Notizen in einem embedded Select; ohne st-Aufrufe, damit es auch im Prefetch-Thread läuft
+    response = (supabase.table(LEADS_TABLE).select(DOSSIER_SELECT).eq("id", lead_id).eq('user_id', user_id).eq("tasks.is_completed", False)
+                .order("due_date", foreign_table="tasks").order("created_at", desc=True, foreign_table="notes").maybe_single().execute())
+    return response.data if response else None
+
+def dossier_cache_key(user_id, lead_id):
+    return (user_id, 'dossier', lead_id, 'load_lead_dossier', ())
+
+@profiled
+def load_lead_dossier(lead_id):
+    user_id = get_user_id()
+    if not user_id: return None
+    cache = get_entity_cache(); key = dossier_cache_key(user_id, lead_id); hit, dossier = cache.get(key)
+    if hit: return dossier
+    try: dossier = fetch_lead_dossier(user_id, lead_id)
+    except Exception as e: report_error(f"Fehler beim Laden der Lead-Akte: {e}"); return None
+    cache.set(key, dossier, DOSSIER_TTL); return dossier
+
+@st.cache_resource
+def get_prefetch_executor():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="dossier-prefetch")
+
+def _prefetch_dossier(user_id, lead_id):
+    try: get_entity_cache().set(dossier_cache_key(user_id, lead_id), fetch_lead_dossier(user_id, lead_id), DOSSIER_TTL)
+    except Exception: pass
+
+def prefetch_lead_dossiers(lead_ids):
+    user_id = get_user_id()
+    if not user_id: return
+    cache = get_entity_cache(); executor = get_prefetch_executor()
+    for lead_id in lead_ids:
+        if not cache.peek(dossier_cache_key(user_id, lead_id)): executor.submit(_prefetch_dossier, user_id, lead_id)
+
+@profiled
+def add_task(lead_id, due_date, description):
+    user_id = get_user_id()
+    if not user_id: return
+    try:
+        supabase.table(TASKS_TABLE).insert({"lead_id": lead_id, "due_date": str(due_date), "description": description, 'user_id': user_id}).execute()
+        st.toast("Aufgabe erfolgreich erstellt!", icon="✅"); invalidate_cache('tasks', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Erstellen der Aufgabe: {e}")
+
+@profiled
+def add_tasks_bulk(lead_ids, due_date, description, notify=True):
+    # Eine Insert-Anfrage (bzw. wenige Chunks) statt add_task pro Lead
+    user_id = get_user_id()
+    if not user_id or not lead_ids: return 0
+    rows = [{"lead_id": int(lead_id), "due_date": str(due_date), "description": description, 'user_id': user_id} for lead_id in lead_ids]
+    created = 0  # bereits geschriebene Chunks bleiben bestehen, auch wenn ein späterer fehlschlägt
+    try:
+        for chunk in chunked(rows): created += len(supabase.table(TASKS_TABLE).insert(chunk).execute().data or chunk)
+        if notify: st.toast(f"{created} Aufgabe(n) erfolgreich erstellt!", icon="✅")
+    except Exception as e: st.error(f"Fehler beim Erstellen der Aufgaben ({created} von {len(rows)} angelegt): {e}")
+    finally:
+        if created: invalidate_cache('tasks')
+    return created
+
+@profiled
+def bulk_update_lead_status(lead_ids, new_status, retry_in_days=None, task_description=None):
+    # Status für viele Leads in einem Update setzen und optional gleich die Wiedervorlage-Aufgaben anlegen
+    user_id = get_user_id()
+    if not user_id or not lead_ids: return 0
+    lead_ids = [int(lead_id) for lead_id in lead_ids]
+    try:
+        for chunk in chunked(lead_ids): supabase.table(LEADS_TABLE).update({"status": new_status}).in_("id", chunk).eq('user_id', user_id).execute()
+    except Exception as e: st.error(f"Fehler beim Ändern des Status: {e}"); return 0
+    return finish_bulk_status_update(lead_ids, new_status, retry_in_days, task_description)
+
+@profiled
+def bulk_update_filtered_leads(filters, new_status, retry_in_days=None, task_description=None):
+    # Sammelaktion für alle Leads der aktuellen Filter (campaign/status/branche/search wie load_lead_page): ein gefiltertes UPDATE
+    # in der Datenbank statt ID-Listen, damit sie nicht an den 100 Zeilen der sichtbaren Seite hängt
+    user_id = get_user_id()
+    if not user_id: return 0
+    try: rows = apply_lead_filters(supabase.table(LEADS_TABLE).update({"status": new_status}).eq('user_id', user_id), **filters).execute().data
+    except Exception as e: st.error(f"Fehler beim Ändern des Status: {e}"); return 0
+    return finish_bulk_status_update([int(row['id']) for row in rows], new_status, retry_in_days, task_description)
+
+def finish_bulk_status_update(lead_ids, new_status, retry_in_days, task_description):
+    tasks_created = add_tasks_bulk(lead_ids, date.today() + timedelta(days=retry_in_days), task_description or f"Wiedervorlage: {new_status or 'ohne Status'}", notify=False) if retry_in_days else 0
+    invalidate_cache('leads', 'lead', 'tasks')
+    st.toast(f"{len(lead_ids)} Leads auf '{new_status or EMPTY_STATUS_OPTION}' gesetzt" + (f", {tasks_created} Wiedervorlage(n) angelegt." if tasks_created else "."), icon="📝")
+    return len(lead_ids)
+
+def tasks_to_df(rows):
+    # Datumsangaben einmal parsen und formatieren, statt strptime pro Aufgabe und Seite
+    df = pd.json_normalize(rows) if rows else pd.DataFrame(columns=['id', 'lead_id', 'due_date', 'description', 'leads.name', 'leads.status'])
+    df = df.rename(columns={'leads.name': 'lead_name', 'leads.status': 'lead_status', 'leads.campaign': 'lead_campaign'})
+    if 'lead_campaign' not in df.columns: df['lead_campaign'] = None
+    df['due_date'] = pd.to_datetime(df['due_date'], format='%Y-%m-%d')
+    df['due_label'] = df['due_date'].dt.strftime('%d.%m.%Y')
+    text_cols = ['description', 'lead_name', 'lead_status', 'lead_campaign']; df[text_cols] = df[text_cols].astype(object).where(df[text_cols].notna(), None)
+    return df[TASK_COLUMNS].astype({'id': 'Int64', 'lead_id': 'Int64'})
+
+@profiled
+@entity_cached('tasks', ttl=10, scope_arg='lead_id')
+def load_open_tasks(lead_id=None, due_until=None, limit=None):
+    user_id = get_user_id()
+    if not user_id: return tasks_to_df([])
+    try:
+        query = supabase.table(TASKS_TABLE).select("id, lead_id, due_date, description, leads!inner(name, status, is_archived)").eq("is_completed", False).eq("leads.is_archived", False).eq('user_id', user_id).order("due_date")
+        if lead_id: query = query.eq("lead_id", lead_id)
+        if due_until: query = query.lte("due_date", str(due_until))
+        if limit: query = query.limit(limit)
+        return tasks_to_df(query.execute().data)
+    except Exception as e: report_error(f"Fehler beim Laden der Aufgaben: {e}"); return tasks_to_df([])
+
+@profiled
+@entity_cached('tasks', ttl=10)
+def load_task_page(page=0, page_size=TASK_PAGE_SIZE, campaign=None, lead_status=None, bucket=None):
+    # Eine Seite offener Aufgaben samt Gesamtzahl; Filter laufen über den inner join auf leads in der Datenbank
+    user_id = get_user_id()
+    if not user_id: return tasks_to_df([]), 0
+    try:
+        query = supabase.table(TASKS_TABLE).select("id, lead_id, due_date, description, leads!inner(name, status, campaign, is_archived)", count='exact').eq("is_completed", False).eq("leads.is_archived", False).eq('user_id', user_id)
+        if campaign: query = query.eq("leads.campaign", campaign)
+        if lead_status == EMPTY_STATUS_OPTION: query = query.is_("leads.status", "null")
+        elif lead_status: query = query.eq("leads.status", lead_status)
+        if bucket == "urgent": query = query.lte("due_date", str(date.today()))
+        elif bucket == "future": query = query.gt("due_date", str(date.today()))
+        response = query.order("due_date").order("id").range(page * page_size, (page + 1) * page_size - 1).execute()
+        return tasks_to_df(response.data), response.count or 0
+    except Exception as e: report_error(f"Fehler beim Laden der Aufgaben: {e}"); return tasks_to_df([]), 0
+
+@profiled
+def complete_task(task_id, lead_id=None):
+    try:
+        supabase.table(TASKS_TABLE).update({"is_completed": True}).eq("id", task_id).execute()
+        st.toast("Aufgabe erledigt!", icon="🎉"); invalidate_cache('tasks', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Abschließen der Aufgabe: {e}")
+
+@profiled
+def update_task(task_id, new_due_date, new_description, lead_id=None):
+    try:
+        supabase.table(TASKS_TABLE).update({"due_date": str(new_due_date), "description": new_description}).eq("id", task_id).execute()
+        st.toast("Aufgabe aktualisiert!", icon="🔄"); invalidate_cache('tasks', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Aktualisieren der Aufgabe: {e}")
+
+@profiled
+def delete_task(task_id, lead_id=None):
+    try:
+        supabase.table(TASKS_TABLE).delete().eq("id", task_id).execute()
+        st.toast("Aufgabe endgültig gelöscht!", icon="🗑️"); invalidate_cache('tasks', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Löschen der Aufgabe: {e}")
+
+@profiled
+def update_lead_status(lead_id, new_status):
+    try:
+        supabase.table(LEADS_TABLE).update({"status": new_status}).eq("id", lead_id).execute()
+        st.toast(f"Status aktualisiert auf: {new_status}", icon="📝"); invalidate_cache('leads'); invalidate_cache('lead', 'tasks', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Ändern des Status: {e}")
+
+@profiled
+def archive_campaign(campaign_name):
+    user_id = get_user_id()
+    if not user_id: return
+    try:
+        supabase.table(LEADS_TABLE).update({"is_archived": True}).eq("campaign", campaign_name).eq('user_id', user_id).execute()
+        st.success(f"Kampagne '{campaign_name}' wurde archiviert."); invalidate_cache('leads', 'lead', 'campaigns', 'tasks')
+    except Exception as e: st.error(f"Fehler beim Archivieren: {e}")
+
+@profiled
+def restore_campaign(campaign_name):
+    user_id = get_user_id()
+    if not user_id: return
+    try:
+        supabase.table(LEADS_TABLE).update({"is_archived": False}).eq("campaign", campaign_name).eq('user_id', user_id).execute()
+        st.success(f"Kampagne '{campaign_name}' wurde wiederhergestellt."); invalidate_cache('leads', 'lead', 'campaigns', 'tasks')
+    except Exception as e: st.error(f"Fehler beim Wiederherstellen: {e}")
+
+@profiled
+def delete_campaign(campaign_name):
+    user_id = get_user_id()
+    if not user_id: return
+    try: supabase.table(LEADS_TABLE).delete().eq("campaign", campaign_name).eq('user_id', user_id).execute(); invalidate_cache('leads', 'lead', 'campaigns', 'tasks', 'notes')
+    except Exception as e: st.error(f"Fehler beim Löschen: {e}")
+
+@profiled
+@entity_cached('notes', ttl=10, scope_arg='lead_id')
+def load_notes(lead_id):
+    user_id = get_user_id()
+    if not user_id: return []
+    try:
+        response = supabase.table(NOTES_TABLE).select("*").eq("lead_id", lead_id).eq('user_id', user_id).order("created_at", desc=True).execute()
+        return response.data
+    except Exception as e: report_error(f"Fehler beim Laden der Notizen: {e}"); return []
+
+@profiled
+def add_note(lead_id, content):
+    user_id = get_user_id()
+    if not user_id: return
+    try:
+        supabase.table(NOTES_TABLE).insert({"lead_id": lead_id, "content": content, "user_id": user_id}).execute()
+        st.toast("Notiz gespeichert!"); invalidate_cache('notes', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Speichern der Notiz: {e}")
+
+@profiled
+def delete_note(note_id, lead_id=None):
+    try:
+        supabase.table(NOTES_TABLE).delete().eq("id", note_id).execute()
+        st.toast("Notiz gelöscht!"); invalidate_cache('notes', scope=lead_id)
+    except Exception as e: st.error(f"Fehler beim Löschen der Notiz: {e}")
@@ -0,0 +1,72 @@
+# -----------------------------------------------------------------------------
+# Dubletten-Erkennung: normalisierte Schlüssel (Telefon, Domain, Name + PLZ) und Cluster-Suche
+# -----------------------------------------------------------------------------
+import pandas as pd
+
+KEY_TYPES = ['phone_key', 'domain_key', 'name_plz_key']
+DEDUP_MODES = {"skip": "Überspringen", "merge": "Zusammenführen (leere Felder ergänzen)", "tag": "Importieren & als Dublette markieren"}
+MERGE_FIELDS = ['name', 'branche', 'address', 'phone', 'email', 'website', 'contact_person']
+LEGAL_FORMS = r"\b(?:gmbh|mbh|co|kg|ohg|ug|ag|gbr|e\s?k|e\s?v|partg|haftungsbeschränkt|und|u)\b"
+
+def _text(series):
+    return series.astype('string').str.strip().str.lower()
+
+def normalize_phone(series):
+    # Nur Ziffern; 0049/+49/0 am Anfang werden auf "49..." vereinheitlicht
+    digits = _text(series).str.replace(r"\D", "", regex=True)
+    digits = digits.str.replace(r"^00", "", regex=True).str.replace(r"^0(?=[1-9])", "49", regex=True)
+    return digits.where(digits.str.len() >= 6)
+
+def normalize_domain(series):
+    domain = _text(series).str.replace(r"^[a-z]+://", "", regex=True).str.replace(r"^www\.", "", regex=True).str.split(r"[/?#:]", n=1, regex=True).str[0]
+    return domain.where(domain.str.contains(".", regex=False, na=False))
+
+def name_postcode_key(names, addresses):
+    name = _text(names).str.replace(LEGAL_FORMS, " ", regex=True).str.replace(r"[^0-9a-zäöüß]+", "", regex=True)
+    postcode = _text(addresses).str.extract(r"\b(\d{5})\b", expand=False)
+    key = name + "|" + postcode
+    return key.where((name.str.len() > 0) & postcode.notna())
+
+def build_lead_keys(df):
+    get = lambda col: df[col] if col in df.columns else pd.Series(pd.NA, index=df.index, dtype='string')
+    return pd.DataFrame({'phone_key': normalize_phone(get('phone')), 'domain_key': normalize_domain(get('website')),
+                         'name_plz_key': name_postcode_key(get('name'), get('address'))}, index=df.index)
+
+def build_key_index(df):
+    # Pro Schlüsseltyp: Schlüssel -> kleinste (älteste) Lead-ID; als dict, damit add_to_key_index neue Leads ohne Neuaufbau ergänzen kann
+    keys = build_lead_keys(df).assign(id=df['id'].values)
+    return {key_type: keys.dropna(subset=[key_type]).groupby(key_type)['id'].min().to_dict() for key_type in KEY_TYPES}
+
+def add_to_key_index(index, df):
+    # Nur die Schlüssel der übergebenen (neu gespeicherten oder ergänzten) Leads; eine vorhandene ältere ID bleibt stehen
+    keys = build_lead_keys(df).assign(id=df['id'].values)
+    for key_type in KEY_TYPES:
+        lookup = index.setdefault(key_type, {})
+        for key, lead_id in keys.dropna(subset=[key_type])[[key_type, 'id']].itertuples(index=False):
+            if key not in lookup or lead_id < lookup[key]: lookup[key] = lead_id
+    return index
+
+def match_against_index(incoming_df, index):
+    # Liefert pro eingehender Zeile die ID des vorhandenen Leads (oder NA) und markiert Dubletten innerhalb des Eingangs
+    keys = build_lead_keys(incoming_df); existing_id = pd.Series(pd.NA, index=incoming_df.index, dtype='Int64')
+    for key_type in KEY_TYPES:
+        existing_id = existing_id.fillna(keys[key_type].map(index.get(key_type, {}).get, na_action='ignore').astype('object').astype('Int64'))
+    duplicate_in_batch = pd.Series(False, index=incoming_df.index)
+    for key_type in KEY_TYPES: duplicate_in_batch |= keys[key_type].notna() & keys[key_type].duplicated()
+    return existing_id, duplicate_in_batch
+
+def find_duplicate_clusters(df):
+    # Leads, die mindestens einen Schlüssel teilen, landen im selben Cluster (Union-Find nur über betroffene IDs)
+    keys = build_lead_keys(df).assign(id=df['id'].values); parent = {}
+    def find(x):
+        while parent.setdefault(x, x) != x: parent[x] = parent[parent[x]]; x = parent[x]
+        return x
+    for key_type in KEY_TYPES:
+        groups = keys.dropna(subset=[key_type]).groupby(key_type)['id']
+        for ids in groups.agg(list)[groups.size() > 1]:
+            root = find(ids[0])
+            for other in ids[1:]: parent[find(other)] = root
+    if not parent: return pd.DataFrame(columns=['cluster_id', 'id'])
+    clusters = pd.DataFrame({'id': list(parent)}); clusters['root'] = clusters['id'].map(find)
+    clusters['cluster_id'] = clusters.groupby('root')['id'].transform('min')
+    return clusters[['cluster_id', 'id']].sort_values(['cluster_id', 'id'], ignore_index=True)
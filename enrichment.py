@@ -0,0 +1,207 @@
+# -----------------------------------------------------------------------------
+# Website-Anreicherung: Startseite + Impressum/Kontakt der Leads parallel abrufen (async httpx) und
+# E-Mail-Adressen sowie Geschäftsführer/Inhaber extrahieren
+# -----------------------------------------------------------------------------
+import asyncio
+import contextlib
+import re
+import threading
+import time
+from urllib.parse import unquote, urljoin, urlsplit
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+from entity_cache import EntityCache
+from gelbeseiten import HTTP_HEADERS
+
+ENRICH_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+ENRICH_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+ENRICH_CONCURRENCY = 10
+LEAD_TIME_BUDGET = 30.0
+HOST_CONCURRENCY = 2
+HOST_INTERVAL = 0.5
+MAX_PAGE_BYTES = 1_500_000
+MAX_SUBPAGES = 2
+RESPONSE_CACHE_TTL = 24 * 3600
+FAILURE_CACHE_TTL = 600
+SUBPAGE_KEYWORDS = ('impressum', 'imprint', 'kontakt', 'contact')
+FALLBACK_SUBPAGES = ('/impressum', '/kontakt')
+ENRICH_FIELDS = ('email', 'contact_person')
+
+BLOCK_END_RE = re.compile(r"<br\s*/?>|</(?:p|div|li|tr|td|h[1-6]|address|section|article|table|ul)>", re.I)
+EMAIL_RE = re.compile(r"[a-z0-9][a-z0-9._%+-]*@(?:[a-z0-9-]+\.)+[a-z]{2,24}", re.I)
+EMAIL_AT_RE = re.compile(r"\s*[\[({]\s*(?:at|ät|@)\s*[\])}]\s*", re.I)
+EMAIL_DOT_RE = re.compile(r"\s*[\[({]\s*(?:dot|punkt|\.)\s*[\])}]\s*", re.I)
+IGNORED_EMAIL_PARTS = ('example.', 'beispiel', 'domain.de', 'ihre-domain', 'sentry', 'wixpress', 'noreply', 'no-reply')
+IGNORED_EMAIL_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
+CONTACT_LABEL_RE = re.compile(r"(?i:geschäftsführer(?:in|innen)?|geschäftsführung|(?:praxis|kanzlei)?inhaber(?:in)?|vertretungsberechtigte[rn]?|vertreten\s+durch)")
+CONTACT_PREFIX_RE = re.compile(r"[ \t]*(?:\([^)\n]*\))?[ \t]*[:\-–]?\s*(?:(?i:der|die|den|unsere?|herrn?|frau)\s+)?")
+NAME_WORD = r"[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?"
+CONTACT_NAME_RE = re.compile(rf"(?:(?:Dr|Prof|med|dent|jur|rer|nat|Dipl\.-[A-Za-zäöü]+|Dipl)\.[ \t]*)*{NAME_WORD}(?:[ \t]+(?:(?:von|van|de|zu|der|den)[ \t]+)?{NAME_WORD}){{1,3}}")
+NAME_STOPWORDS = {'registergericht', 'handelsregister', 'amtsgericht', 'registernummer', 'sitz', 'telefon', 'tel', 'fax', 'mail', 'e-mail', 'umsatzsteuer', 'steuernummer',
+                  'anschrift', 'kontakt', 'inhaltlich', 'verantwortlich', 'gesellschafter', 'geschäftsführer', 'geschäftsführerin', 'inhaber', 'inhaberin', 'berufsbezeichnung',
+                  'zuständige', 'kammer', 'aufsichtsbehörde', 'gmbh', 'mbh', 'datenschutz', 'impressum', 'angaben', 'postanschrift'}
+STREET_SUFFIX_RE = re.compile(r"(?:stra(?:ß|ss)e|allee|gasse|platz)$", re.I)
+
+_response_cache = EntityCache(max_entries=4096)
+
+def normalize_website(url):
+    url = (url or '').strip()
+    if not url: return None
+    return url if re.match(r"https?://", url, re.I) else f"http://{url}"
+
+def site_host(url):
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+class HostLimiter:
+    # Höchstens HOST_CONCURRENCY gleichzeitige Anfragen und HOST_INTERVAL Sekunden Abstand pro Host, damit kleine Firmenserver nicht geflutet werden
+    def __init__(self, concurrency=HOST_CONCURRENCY, interval=HOST_INTERVAL):
+        self.concurrency, self.interval = concurrency, interval
+        self._hosts = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host):
+        state = self._hosts.setdefault(host, {'semaphore': asyncio.Semaphore(self.concurrency), 'lock': asyncio.Lock(), 'next': 0.0})
+        async with state['semaphore']:
+            async with state['lock']:
+                wait = state['next'] - time.monotonic()
+                if wait > 0: await asyncio.sleep(wait)
+                state['next'] = time.monotonic() + self.interval
+            yield
+
+async def fetch_page(client, limiter, url, cache=_response_cache):
+    # Liefert (html, finale_url) oder None; Fehlschläge werden kürzer gecacht als Treffer
+    hit, cached = cache.get(url)
+    if hit: return cached
+    page = None
+    try:
+        async with limiter.slot(site_host(url)):
+            async with client.stream('GET', url) as response:
+                if response.status_code < 400 and 'html' in response.headers.get('content-type', 'text/html'):
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if len(body) >= MAX_PAGE_BYTES: break
+                    page = (body.decode(response.encoding or 'utf-8', errors='replace'), str(response.url))
+    except (httpx.HTTPError, UnicodeError, LookupError): page = None
+    cache.set(url, page, RESPONSE_CACHE_TTL if page else FAILURE_CACHE_TTL)
+    return page
+
+def decode_cfemail(encoded):
+    # Cloudflare "Email Protection": erstes Byte ist der XOR-Schlüssel für die restlichen Bytes
+    try: data = bytes.fromhex(encoded); return bytes(b ^ data[0] for b in data[1:]).decode('utf-8')
+    except (ValueError, IndexError, UnicodeError): return ''
+
+def parse_page(html):
+    # Zeilenumbrüche an <br> und Blockenden erhalten, damit Namen nicht mit der nächsten Zeile (Straße, Registergericht) verschmelzen
+    tree = LexborHTMLParser(BLOCK_END_RE.sub(lambda m: "\n" + m.group(0), html))
+    for node in tree.css('script, style, noscript'): node.decompose()
+    body = tree.body or tree.root
+    text = body.text(separator=" ") if body is not None else ''
+    return tree, re.sub(r"[ \t]*\n\s*", "\n", re.sub(r"[ \t\r\f\v\xa0]+", " ", text))
+
+def extract_emails(tree, text):
+    candidates = [unquote(a.attributes.get('href') or '')[7:].split('?')[0] for a in tree.css('a[href^="mailto:"]')]
+    candidates += [decode_cfemail(node.attributes.get('data-cfemail') or '') for node in tree.css('[data-cfemail]')]
+    candidates += EMAIL_RE.findall(EMAIL_DOT_RE.sub('.', EMAIL_AT_RE.sub('@', text)))
+    emails = []
+    for email in candidates:
+        email = email.strip().strip('.').lower()
+        if not EMAIL_RE.fullmatch(email) or email.endswith(IGNORED_EMAIL_SUFFIXES) or any(part in email for part in IGNORED_EMAIL_PARTS): continue
+        if email not in emails: emails.append(email)
+    return emails
+
+def extract_contact_person(text):
+    # Name direkt hinter einer Angabe wie "Geschäftsführer:" / "Inhaberin" / "Vertreten durch"; Folgewörter wie "Registergericht" werden abgeschnitten
+    for label in CONTACT_LABEL_RE.finditer(text):
+        start = CONTACT_PREFIX_RE.match(text, label.end()).end(); match = CONTACT_NAME_RE.match(text, start)
+        if not match: continue
+        words = []
+        for word in match.group(0).split():
+            if word.lower().strip('.:') in NAME_STOPWORDS or STREET_SUFFIX_RE.search(word): break
+            words.append(word)
+        if sum(not word.endswith('.') for word in words) >= 2: return " ".join(words)
+    return None
+
+def find_subpages(tree, base_url):
+    # Impressum vor Kontakt; nur Links auf derselben Website
+    host = site_host(base_url); found = {}
+    for a in tree.css('a[href]'):
+        href = (a.attributes.get('href') or '').strip(); label = f"{href} {a.text()}".lower()
+        if href.startswith(('mailto:', 'tel:', 'javascript:', '#')): continue
+        rank = next((i // 2 for i, keyword in enumerate(SUBPAGE_KEYWORDS) if keyword in label), None)
+        url = urljoin(base_url, href).split('#')[0]
+        if rank is None or site_host(url) != host or rank in found: continue
+        found[rank] = url
+    return [found[rank] for rank in sorted(found)][:MAX_SUBPAGES]
+
+def choose_email(emails, website):
+    # Adressen der eigenen Domain zuerst, sonst die erste gefundene
+    host = site_host(website)
+    return next((email for email in emails if host and (email.endswith('@' + host) or email.endswith('.' + host))), emails[0] if emails else None)
+
+async def enrich_lead(client, limiter, lead, cache=_response_cache):
+    result = {'id': lead['id'], 'email': None, 'contact_person': None, 'pages': 0, 'error': None}
+    website = normalize_website(lead.get('website'))
+    if not website: result['error'] = "Keine Webseite"; return result
+    home = await fetch_page(client, limiter, website, cache)
+    if home is None: result['error'] = "Webseite nicht erreichbar"; return result
+    html, final_url = home; pages = [parse_page(html)]
+    subpages = find_subpages(pages[0][0], final_url) or [urljoin(final_url, path) for path in FALLBACK_SUBPAGES]
+    for page in await asyncio.gather(*(fetch_page(client, limiter, url, cache) for url in subpages)):
+        if page is not None: pages.append(parse_page(page[0]))
+    emails = []
+    for page_tree, text in pages: emails += [email for email in extract_emails(page_tree, text) if email not in emails]
+    # Impressum/Kontakt zuerst: dort steht die verantwortliche Person, auf der Startseite eher Zitate oder Teamnamen
+    contact = next((person for person in (extract_contact_person(text) for _, text in pages[1:] + pages[:1]) if person), None)
+    result.update(email=choose_email(emails, final_url), contact_person=contact, pages=len(pages))
+    return result
+
+async def enrich_leads_async(leads, on_result=None, should_stop=None, concurrency=ENRICH_CONCURRENCY, client=None, limiter=None, cache=_response_cache):
+    # Höchstens `concurrency` Leads gleichzeitig; on_result wird pro fertigem Lead aufgerufen, should_stop() bricht vor dem nächsten Lead ab
+    limiter = limiter or HostLimiter(); gate = asyncio.Semaphore(concurrency); results = []
+    async def worker(http, lead):
+        async with gate:
+            if should_stop and should_stop(): return
+            try: result = await asyncio.wait_for(enrich_lead(http, limiter, lead, cache), LEAD_TIME_BUDGET)
+            except asyncio.TimeoutError: result = {'id': lead['id'], 'email': None, 'contact_person': None, 'pages': 0, 'error': "Zeitüberschreitung"}
+            except Exception as e: result = {'id': lead['id'], 'email': None, 'contact_person': None, 'pages': 0, 'error': str(e)}
+            results.append(result)
+            if on_result: on_result(result)
+    async with contextlib.nullcontext(client) if client else httpx.AsyncClient(headers=HTTP_HEADERS, timeout=ENRICH_TIMEOUT, limits=ENRICH_LIMITS, follow_redirects=True) as http:
+        await asyncio.gather(*(worker(http, lead) for lead in leads))
+    return results
+
+def run_enrichment(leads, on_result=None, should_stop=None, **kwargs):
+    # Synchroner Einstieg für Worker-Threads (eigene Event-Loop pro Lauf)
+    return asyncio.run(enrich_leads_async(leads, on_result, should_stop, **kwargs))
+
+def enrichment_updates(lead, result):
+    # Nur leere Felder füllen, vorhandene Angaben bleiben unverändert
+    return {field: result[field] for field in ENRICH_FIELDS if result.get(field) and not str(lead.get(field) or '').strip()}
+
+class EnrichmentJob:
+    # Fortschritt eines Hintergrundlaufs über eine Kampagne; wird vom Worker-Thread geschrieben und von der UI gelesen
+    def __init__(self, campaign):
+        self.campaign = campaign
+        self.total = self.done = self.emails = self.contacts = self.failed = self.updated = 0
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self): return self.finished is None
+
+    @property
+    def cancelled(self): return self._cancel.is_set()
+
+    def cancel(self): self._cancel.set()
+
+    def record(self, result):
+        with self._lock:
+            self.done += 1; self.emails += bool(result['email']); self.contacts += bool(result['contact_person']); self.failed += bool(result['error'])
+
+    def finish(self, error=None):
+        self.error = error; self.finished = time.time()
@@ -0,0 +1,54 @@
+# -----------------------------------------------------------------------------
+# Prozessweiter Cache pro Nutzer und Entität (LRU + TTL) mit gezielter Invalidierung
+# -----------------------------------------------------------------------------
+import threading
+import time
+from collections import OrderedDict
+
+ALL_SCOPE = "*"
+
+class EntityCache:
+    # Schlüssel: (user_id, entity, scope, query). scope ist z.B. die lead_id bei Aufgaben/Notizen oder ALL_SCOPE für Listen
+    # über alle Leads. Eine Invalidierung für (user, entity, scope) entfernt auch die ALL_SCOPE-Listen dieser Entität.
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None: del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def peek(self, key):
+        # Wie get, aber ohne LRU-Reihenfolge oder Trefferstatistik zu verändern (z.B. für Prefetching)
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] >= time.monotonic()
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def invalidate(self, user_id, entity, scope=None):
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == user_id and key[1] == entity and (scope is None or key[2] in (scope, ALL_SCOPE))]
+            for key in stale: del self._entries[key]
+            return len(stale)
+
+    def clear_user(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]: del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
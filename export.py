@@ -0,0 +1,58 @@
+# -----------------------------------------------------------------------------
+# Streaming-Export: Tabellen seitenweise (Keyset-Seiten aus crm_data) als CSV oder Parquet in ein ZIP schreiben,
+# jede Seite wird sofort geschrieben und verworfen, der Speicherbedarf hängt nur von der Seitengröße ab
+# -----------------------------------------------------------------------------
+import io
+import time
+import zipfile
+import pandas as pd
+
+EXPORT_FORMATS = {"CSV (Excel)": "csv", "Parquet (zstd-komprimiert)": "parquet"}
+CSV_SEPARATOR = ";"
+CSV_ENCODING = "utf-8-sig"  # BOM, damit Excel Umlaute richtig erkennt
+PARQUET_COMPRESSION = "zstd"
+# Spalten und Typen je Tabelle: legen Reihenfolge, CSV-Kopfzeile und das feste Parquet-Schema fest (auch für leere Tabellen)
+EXPORT_SCHEMAS = {
+    'leads': {'id': 'int', 'name': 'str', 'branche': 'str', 'address': 'str', 'phone': 'str', 'email': 'str', 'website': 'str', 'contact_person': 'str',
+              'status': 'str', 'campaign': 'str', 'is_archived': 'bool', 'created_at': 'timestamp', 'updated_at': 'timestamp'},
+    'tasks': {'id': 'int', 'lead_id': 'int', 'lead_name': 'str', 'lead_campaign': 'str', 'due_date': 'date', 'description': 'str', 'is_completed': 'bool'},
+    'notes': {'id': 'int', 'lead_id': 'int', 'lead_name': 'str', 'lead_campaign': 'str', 'content': 'str', 'created_at': 'timestamp'},
+}
+
+def page_to_frame(rows, schema):
+    # Supabase liefert Zeitstempel und Datumswerte als ISO-Strings; für Parquet in echte Typen umwandeln
+    df = pd.DataFrame(rows, columns=list(schema))
+    for col, kind in schema.items():
+        if kind == 'timestamp': df[col] = pd.to_datetime(df[col], utc=True, format='ISO8601', errors='coerce')
+        elif kind == 'date': df[col] = pd.to_datetime(df[col], format='ISO8601', errors='coerce').dt.date
+    return df
+
+def arrow_schema(schema):
+    import pyarrow as pa  # erst beim ersten Parquet-Export laden
+    types = {'int': pa.int64(), 'str': pa.string(), 'bool': pa.bool_(), 'date': pa.date32(), 'timestamp': pa.timestamp('us', tz='UTC')}
+    return pa.schema([(col, types[kind]) for col, kind in schema.items()])
+
+def zip_member(archive, file_name, compress_type):
+    info = zipfile.ZipInfo(file_name, date_time=time.localtime()[:6]); info.compress_type = compress_type
+    return archive.open(info, "w", force_zip64=True)  # Größe ist vorab unbekannt
+
+def write_csv_member(archive, name, pages, schema):
+    with io.TextIOWrapper(zip_member(archive, f"{name}.csv", zipfile.ZIP_DEFLATED), encoding=CSV_ENCODING, newline="") as out:
+        header = True
+        for rows in pages: pd.DataFrame(rows, columns=list(schema)).to_csv(out, sep=CSV_SEPARATOR, index=False, header=header); header = False
+        if header: pd.DataFrame(columns=list(schema)).to_csv(out, sep=CSV_SEPARATOR, index=False)
+
+def write_parquet_member(archive, name, pages, schema):
+    # Eine Row Group pro Keyset-Seite; Parquet ist bereits komprimiert, daher im ZIP nur gespeichert
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    arrow = arrow_schema(schema)
+    with zip_member(archive, f"{name}.parquet", zipfile.ZIP_STORED) as member, pq.ParquetWriter(member, arrow, compression=PARQUET_COMPRESSION) as writer:
+        for rows in pages: writer.write_table(pa.Table.from_pandas(page_to_frame(rows, schema), schema=arrow, preserve_index=False))
+
+def write_export(target, tables, fmt):
+    # tables: {Tabellenname: Iterator über Seiten (Listen von Dicts)}; target: beschreibbare Binärdatei
+    write_member = write_parquet_member if fmt == 'parquet' else write_csv_member
+    with zipfile.ZipFile(target, "w") as archive:
+        for name, pages in tables.items(): write_member(archive, name, pages, EXPORT_SCHEMAS[name])
+    return target
@@ -0,0 +1,131 @@
+# -----------------------------------------------------------------------------
+# GelbeSeiten-Scraper ohne Browser: gepooltes HTTP + schneller HTML-Parser
+# -----------------------------------------------------------------------------
+import base64
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+
+GELBESEITEN_BASE_URL = "https://www.gelbeseiten.de"
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "de-DE,de;q=0.9",
+}
+HTTP_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+CARD_SELECTOR = 'article.mod-Treffer'
+LOAD_MORE_URL = f"{GELBESEITEN_BASE_URL}/ajaxsuche"
+LOAD_MORE_BUTTON_ID = "mod-LoadMore--button"
+LOAD_MORE_PAGE_SIZE = 50
+SEARCH_TIME_BUDGET = 90.0
+MAX_EMPTY_PAGES = 2
+BATCH_MAX_WORKERS = 4
+
+_http_client = None
+
+def get_http_client():
+    # Ein Client pro Prozess, damit TCP/TLS-Verbindungen zwischen Suchen wiederverwendet werden
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.Client(headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS, follow_redirects=True)
+    return _http_client
+
+def build_search_url(query, location):
+    url_query = query.replace(" ", "-").lower(); url_location = location.replace(" ", "-").lower()
+    return f"{GELBESEITEN_BASE_URL}/branchen/{url_query}/{url_location}"
+
+def build_campaign_name(query, location):
+    return f"GelbeSeiten: {query} ({location})"
+
+def decode_website_link(encoded):
+    if not encoded: return ''
+    try: return base64.b64decode(encoded).decode('utf-8')
+    except Exception: return ''
+
+def _node_text(card, selector):
+    node = card.css_first(selector)
+    if node is None: return ''
+    return re.sub(r"\s+", " ", node.text(separator=" ")).strip()
+
+def parse_card(card, query, campaign_name, user_id):
+    name = _node_text(card, 'h2')
+    if not name: return None
+    website_node = card.css_first('.mod-WebseiteKompakt__text')
+    website_url = decode_website_link(website_node.attributes.get('data-webseitelink')) if website_node is not None else ''
+    return {'name': name, 'branche': query, 'address': _node_text(card, '.mod-AdresseKompakt__adress-text'), 'phone': _node_text(card, '.mod-TelefonnummerKompakt__phoneNumber'),
+            'email': '', 'website': website_url, 'contact_person': '', 'status': None, 'campaign': campaign_name, 'is_archived': False, 'user_id': user_id}
+
+def card_listing_id(card):
+    # Stabile Identität über die GelbeSeiten-Eintrags-ID statt hash(innerHTML)
+    for attr in ('data-realid', 'data-teilnehmerid', 'id'):
+        value = card.attributes.get(attr)
+        if value: return value
+    return f"{_node_text(card, 'h2')}|{_node_text(card, '.mod-AdresseKompakt__adress-text')}"
+
+def parse_result_cards(html, query, campaign_name, user_id, seen_ids=None):
+    # Reine Funktion ohne Netzwerk: lässt sich offline gegen gespeicherte Trefferseiten prüfen.
+    # Mit seen_ids werden bereits verarbeitete Einträge übersprungen und neue IDs ergänzt.
+    leads = []
+    for card in LexborHTMLParser(html).css(CARD_SELECTOR):
+        listing_id = card_listing_id(card)
+        if seen_ids is not None:
+            if listing_id in seen_ids: continue
+            seen_ids.add(listing_id)
+        lead = parse_card(card, query, campaign_name, user_id)
+        if lead: leads.append(lead)
+    return leads
+
+def fetch_search_page(url, client=None):
+    response = (client or get_http_client()).get(url)
+    response.raise_for_status()
+    return response.text
+
+def fetch_more_results(query, location, position, count=LOAD_MORE_PAGE_SIZE, client=None):
+    # Entspricht dem "Mehr Treffer anzeigen"-Button: liefert das HTML der nächsten Treffer ab position (1-basiert)
+    data = {'umkreis': '-1', 'WAS': query, 'WO': location, 'position': str(position), 'anzahl': str(count), 'sortierung': 'relevanz'}
+    response = (client or get_http_client()).post(LOAD_MORE_URL, data=data, headers={'X-Requested-With': 'XMLHttpRequest'})
+    response.raise_for_status()
+    try: payload = response.json()
+    except ValueError: return response.text, None
+    return payload.get('html', ''), payload.get('gesamtanzahlTreffer')
+
+def lead_key(lead):
+    # Schlüssel zum Wiedererkennen bereits gespeicherter Leads beim Fortsetzen einer Suche
+    return f"{(lead.get('name') or '').strip().lower()}|{(lead.get('address') or '').strip().lower()}"
+
+def iter_gelbeseiten_http(query, location, max_results, user_id, client=None, time_budget=SEARCH_TIME_BUDGET, skip_keys=None):
+    # Generator: gibt Leads aus, sobald eine Trefferseite geparst ist; skip_keys überspringt bereits gespeicherte Leads
+    deadline = time.monotonic() + time_budget; campaign_name = build_campaign_name(query, location); seen_ids = set(); skip_keys = skip_keys or set()
+    yielded = 0; empty_pages = 0; total_hits = None
+    html = fetch_search_page(build_search_url(query, location), client)
+    while True:
+        seen_before = len(seen_ids)
+        for lead in parse_result_cards(html, query, campaign_name, user_id, seen_ids):
+            if lead_key(lead) in skip_keys: continue
+            yield lead; yielded += 1
+            if yielded >= max_results: return
+        # Keine neuen Einträge -> Ende der Trefferliste erreicht (oder Seite liefert Dubletten)
+        empty_pages = 0 if len(seen_ids) > seen_before else empty_pages + 1
+        if empty_pages >= MAX_EMPTY_PAGES or time.monotonic() >= deadline: return
+        if total_hits is not None and len(seen_ids) >= total_hits: return
+        html, total = fetch_more_results(query, location, len(seen_ids) + 1, LOAD_MORE_PAGE_SIZE, client)
+        if total is not None: total_hits = int(total)
+
+def scrape_gelbeseiten_http(query, location, max_results, user_id, client=None, time_budget=SEARCH_TIME_BUDGET):
+    return list(iter_gelbeseiten_http(query, location, max_results, user_id, client, time_budget))
+
+def build_batch_jobs(queries, locations):
+    return [(query, location) for query in queries for location in locations]
+
+def run_batch_search(jobs, max_results, user_id, max_workers=BATCH_MAX_WORKERS):
+    # Feste Anzahl Worker teilt sich den gepoolten HTTP-Client; liefert (job, leads, fehler) in Fertigstellungsreihenfolge
+    client = get_http_client()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gelbeseiten") as pool:
+        futures = {pool.submit(scrape_gelbeseiten_http, query, location, max_results, user_id, client): (query, location) for query, location in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try: yield job, future.result(), None
+            except Exception as e: yield job, [], e
@@ -0,0 +1,125 @@
+# -----------------------------------------------------------------------------
+# Profiling: Supabase-Aufrufe, Hilfsfunktionen, Cache-Treffer und Seiten-Renderzeit pro Rerun
+# -----------------------------------------------------------------------------
+import functools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+QUERY_ACTIONS = ('select', 'insert', 'upsert', 'update', 'delete')
+
+class Tracer:
+    # Ein Tracer pro Session. events gilt für den laufenden Rerun, history hält die letzten Renderzeiten pro Seite.
+    def __init__(self, history_size=500):
+        self.events = []
+        self.history = deque(maxlen=history_size)
+        self.page = None
+        self.run_started = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start_run(self, page):
+        with self._lock: self.events = []; self.page = page; self.run_started = time.perf_counter()
+
+    def record(self, kind, name, duration, **fields):
+        stack = getattr(self._local, 'stack', None)
+        event = {'kind': kind, 'name': name, 'ms': round(duration * 1000, 2), 'parent': stack[-1] if stack else None, 'thread': threading.current_thread().name, **fields}
+        with self._lock: self.events.append(event)
+
+    def merge(self, other):
+        # Ereignisse eines Puffer-Tracers übernehmen (z.B. einer fertigen Seitenabfrage aus einem Worker-Thread)
+        with other._lock: events = list(other.events)
+        with self._lock: self.events.extend(events)
+
+    def finish_run(self):
+        # Liefert die Zusammenfassung des Reruns (für Panel und JSONL-Export)
+        if self.run_started is None: return None
+        with self._lock: events = list(self.events)
+        queries = [e for e in events if e['kind'] == 'query']; cache = [e for e in events if e['kind'] == 'cache']
+        summary = {'ts': datetime.now(timezone.utc).isoformat(), 'page': self.page, 'render_ms': round((time.perf_counter() - self.run_started) * 1000, 2),
+                   'queries': len(queries), 'query_ms': round(sum(e['ms'] for e in queries), 2), 'rows': sum(e.get('rows') or 0 for e in queries),
+                   'payload_bytes': sum(e.get('payload_bytes') or 0 for e in queries), 'cache_hits': sum(e['hit'] for e in cache), 'cache_misses': sum(not e['hit'] for e in cache)}
+        self.history.append(summary); self.run_started = None
+        return {**summary, 'events': events}
+
+    def percentile(self, page, q=95):
+        values = sorted(run['render_ms'] for run in self.history if run['page'] == page)
+        if not values: return None
+        return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+    def span(self, name):
+        return _Span(self, name)
+
+class _Span:
+    def __init__(self, tracer, name): self.tracer, self.name = tracer, name
+    def __enter__(self):
+        self.stack = self.tracer._local.__dict__.setdefault('stack', [])
+        self.stack.append(self.name); self.started = time.perf_counter(); return self
+    def __exit__(self, exc_type, exc, tb):
+        self.stack.pop(); self.tracer.record('helper', self.name, time.perf_counter() - self.started, error=exc_type.__name__ if exc_type else None)
+
+def traced(get_tracer):
+    # Decorator-Fabrik: misst die Funktion, wenn get_tracer() einen aktiven Tracer liefert; sonst kein Overhead außer dem Aufruf
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if tracer is None: return func(*args, **kwargs)
+            with tracer.span(func.__name__): return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class TracedQuery:
+    # Reicht den PostgREST-Builder durch und misst execute(): Latenz, Zeilen, Payload-Größe (JSON)
+    def __init__(self, builder, name, get_tracer):
+        self._builder, self._name, self._get_tracer = builder, name, get_tracer
+
+    def __getattr__(self, attr):
+        value = getattr(self._builder, attr)
+        if attr == 'execute': return self._execute
+        if not callable(value): return value
+        name = f"{self._name}.{attr}" if attr in QUERY_ACTIONS else self._name
+        @functools.wraps(value)
+        def call(*args, **kwargs):
+            result = value(*args, **kwargs)
+            return TracedQuery(result, name, self._get_tracer) if hasattr(result, 'execute') else result
+        return call
+
+    def _execute(self, *args, **kwargs):
+        tracer = self._get_tracer()
+        if tracer is None: return self._builder.execute(*args, **kwargs)
+        started = time.perf_counter()
+        try: response = self._builder.execute(*args, **kwargs)
+        except Exception as e: tracer.record('query', self._name, time.perf_counter() - started, error=type(e).__name__); raise
+        duration = time.perf_counter() - started; data = getattr(response, 'data', None)
+        rows = len(data) if isinstance(data, list) else int(data is not None)
+        tracer.record('query', self._name, duration, rows=rows, payload_bytes=len(json.dumps(data, default=str).encode()), count=getattr(response, 'count', None))
+        return response
+
+class TracedClient:
+    # Ersetzt den Supabase-Client: table()/rpc() liefern messende Builder, alles andere (auth, storage) geht direkt durch.
+    # get_client wird bei jedem Zugriff aufgerufen (z.B. eine st.cache_resource-Funktion), damit das importierte Modul
+    # nach einem geleerten Resource-Cache nicht am alten Client hängen bleibt
+    def __init__(self, get_client, get_tracer):
+        self._get_client, self._get_tracer = get_client, get_tracer
+
+    @property
+    def _client(self):
+        return self._get_client()
+
+    def __bool__(self):
+        return self._get_client() is not None
+
+    def table(self, name):
+        return TracedQuery(self._client.table(name), name, self._get_tracer)
+
+    def rpc(self, fn, *args, **kwargs):
+        return TracedQuery(self._client.rpc(fn, *args, **kwargs), f"rpc/{fn}", self._get_tracer)
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
+
+def write_jsonl(path, run):
+    with open(path, 'a', encoding='utf-8') as f: f.write(json.dumps(run, default=str, ensure_ascii=False) + "\n")
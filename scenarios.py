@@ -0,0 +1,32 @@
+# -----------------------------------------------------------------------------
+# Szenario-Raster für die Kennzahl-Hypothese: Budget × Kosten pro Lead × Abschlussquote × Gewinn pro Neukunde,
+# alle Kombinationen auf einmal per NumPy-Broadcasting statt einer Schleife pro Szenario
+# -----------------------------------------------------------------------------
+import numpy as np
+
+def scenario_axes(budget_range, cost_range, rate_range, profit_range, points):
+    # Gleichmäßige Stützstellen je Achse; Quoten in % werden hier in Anteile umgerechnet
+    axis = lambda bounds, scale=1.0: np.linspace(bounds[0], bounds[1], points) * scale
+    return {'budget': axis(budget_range), 'cost_per_lead': np.maximum(axis(cost_range), 1e-9), 'close_rate': axis(rate_range, 0.01), 'profit_per_customer': axis(profit_range)}
+
+def scenario_profit(budget, cost_per_lead, close_rate, profit_per_customer):
+    # Gewinn = Budget · (Quote · Gewinn/Kunde / Kosten pro Lead − 1) mit Achsen als (n,1,1,1), (1,n,1,1), (1,1,n,1), (1,1,1,n):
+    # Ergebnis hat die Form (Budget, Kosten, Quote, Gewinn/Kunde). Nur ein 4D-Array, der Rest läuft auf dem 3D-Faktor bzw. in place
+    b = np.asarray(budget, dtype=float)[:, None, None, None]; c = np.asarray(cost_per_lead, dtype=float)[None, :, None, None]
+    r = np.asarray(close_rate, dtype=float)[None, None, :, None]; p = np.asarray(profit_per_customer, dtype=float)[None, None, None, :]
+    factor = (r / c) * p; factor -= 1
+    return np.multiply(b, factor)
+
+def break_even_close_rate(cost_per_lead, profit_per_customer):
+    # Gewinn = Budget · (Quote · Gewinn/Kunde / Kosten pro Lead − 1) → Schwelle Quote* = Kosten pro Lead / Gewinn pro Kunde,
+    # unabhängig vom Budget. Form (Gewinn/Kunde, Kosten); über 100 % bzw. ohne Gewinn pro Kunde nicht erreichbar (NaN).
+    c = np.asarray(cost_per_lead, dtype=float)[None, :]; p = np.asarray(profit_per_customer, dtype=float)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'): rate = np.where(p > 0, c / np.where(p > 0, p, 1), np.nan)
+    return np.where(rate <= 1, rate, np.nan)
+
+def profitable_share(profit):
+    # Anteil profitabler Kombinationen aus Budget und Gewinn/Kunde je (Kosten pro Lead, Quote)
+    return (profit > 0).mean(axis=(0, 3))
+
+def nearest_index(axis, value):
+    return int(np.abs(np.asarray(axis) - value).argmin())
@@ -0,0 +1,18 @@
+-- Änderungszeitpunkt pro Lead für den Delta-Sync in load_all_leads_data
+alter table public.leads add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.set_updated_at() returns trigger
+language plpgsql as $$
+begin
+  new.updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists leads_set_updated_at on public.leads;
+create trigger leads_set_updated_at before update on public.leads
+  for each row execute function public.set_updated_at();
+
+-- Keyset-Paginierung (user_id, id) und Delta-Abfragen (user_id, updated_at)
+create index if not exists leads_user_id_id_idx on public.leads (user_id, id);
+create index if not exists leads_user_id_updated_at_idx on public.leads (user_id, updated_at);
@@ -0,0 +1,25 @@
+-- Gruppierte Lead-Zählungen für Startseite und Dashboard (Aufruf per PostgREST: rpc/lead_status_counts)
+create or replace function public.lead_status_counts(
+  p_start date default null,
+  p_end date default null,
+  p_include_archived boolean default false,
+  p_by_day boolean default false
+)
+returns table (campaign text, status text, created_day date, lead_count bigint)
+language sql stable security invoker
+as $$
+  select l.campaign,
+         l.status,
+         case when p_by_day then (l.created_at at time zone 'utc')::date end as created_day,
+         count(*) as lead_count
+  from public.leads l
+  where l.user_id = auth.uid()
+    and (p_include_archived or not coalesce(l.is_archived, false))
+    and (p_start is null or l.created_at >= p_start::timestamp at time zone 'utc')
+    and (p_end is null or l.created_at < (p_end + 1)::timestamp at time zone 'utc')
+  group by 1, 2, 3
+$$;
+
+grant execute on function public.lead_status_counts(date, date, boolean, boolean) to authenticated;
+
+create index if not exists leads_user_id_created_at_idx on public.leads (user_id, created_at);
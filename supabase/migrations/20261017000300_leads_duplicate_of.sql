@@ -0,0 +1,4 @@
+-- Markierung für Dubletten (Modus "tag" beim Import bzw. Dubletten-Suche im LeadFinder)
+alter table public.leads add column if not exists duplicate_of bigint references public.leads (id) on delete set null;
+
+create index if not exists leads_duplicate_of_idx on public.leads (duplicate_of) where duplicate_of is not null;
@@ -0,0 +1,93 @@
+-- Kampagnen-Übersicht pro Nutzer, per Trigger aktuell gehalten (Auswahllisten, Archiv, Dashboard-Vergleich)
+create table if not exists public.campaign_summary (
+  user_id uuid not null,
+  campaign text not null,
+  lead_count integer not null default 0,
+  status_counts jsonb not null default '{}'::jsonb,
+  archived_count integer not null default 0,
+  last_activity timestamptz,
+  primary key (user_id, campaign)
+);
+
+alter table public.campaign_summary enable row level security;
+
+drop policy if exists "campaign_summary_select_own" on public.campaign_summary;
+create policy "campaign_summary_select_own" on public.campaign_summary
+  for select using (user_id = auth.uid());
+
+-- Archivieren/Wiederherstellen/Löschen filtern nach (user_id, campaign)
+create index if not exists leads_user_id_campaign_idx on public.leads (user_id, campaign);
+
+-- Berechnet die Zeilen der betroffenen Kampagnen neu; leere Kampagnen verschwinden.
+-- Parallele Statements auf dieselbe Kampagne (z.B. mehrere Worker der Batch-Suche) laufen per Advisory-Lock je (user_id, campaign)
+-- nacheinander (Sperren in fester Reihenfolge, kein Deadlock); Upsert statt delete + insert, damit kein Unique-Verstoß den Lead-Insert abbricht
+create or replace function public.refresh_campaign_summary(p_keys jsonb) returns void
+language plpgsql security definer set search_path = public as $$
+declare
+  v_key record;
+begin
+  for v_key in select distinct k.user_id, k.campaign from jsonb_to_recordset(p_keys) as k(user_id uuid, campaign text) order by 1, 2 loop
+    perform pg_advisory_xact_lock(hashtext(v_key.user_id::text || '/' || v_key.campaign));
+  end loop;
+
+  insert into public.campaign_summary (user_id, campaign, lead_count, status_counts, archived_count, last_activity)
+  select per_status.user_id, per_status.campaign, sum(per_status.lead_count)::integer,
+         jsonb_object_agg(coalesce(per_status.status, ''), per_status.lead_count),
+         sum(per_status.archived_count)::integer, max(per_status.last_activity)
+  from (
+    select l.user_id, l.campaign, l.status, count(*) as lead_count,
+           count(*) filter (where coalesce(l.is_archived, false)) as archived_count,
+           max(greatest(l.created_at, l.updated_at)) as last_activity
+    from public.leads l
+    join (select distinct * from jsonb_to_recordset(p_keys) as k(user_id uuid, campaign text)) k
+      on l.user_id = k.user_id and l.campaign = k.campaign
+    group by 1, 2, 3
+  ) per_status
+  group by 1, 2
+  on conflict (user_id, campaign) do update
+    set lead_count = excluded.lead_count, status_counts = excluded.status_counts,
+        archived_count = excluded.archived_count, last_activity = excluded.last_activity;
+
+  -- Nur Kampagnen entfernen, die jetzt keine Leads mehr haben
+  delete from public.campaign_summary s
+  using (select distinct * from jsonb_to_recordset(p_keys) as k(user_id uuid, campaign text)) k
+  where s.user_id = k.user_id and s.campaign = k.campaign
+    and not exists (select 1 from public.leads l where l.user_id = k.user_id and l.campaign = k.campaign);
+end;
+$$;
+
+-- Statement-Trigger mit Übergangstabellen: ein Neuberechnungslauf pro Insert/Update/Delete, auch bei Tausenden Zeilen
+create or replace function public.leads_refresh_campaign_summary() returns trigger
+language plpgsql security definer set search_path = public as $$
+declare
+  v_keys jsonb;
+begin
+  if tg_op = 'INSERT' then
+    select jsonb_agg(distinct jsonb_build_object('user_id', user_id, 'campaign', campaign)) into v_keys from new_rows where campaign is not null;
+  elsif tg_op = 'DELETE' then
+    select jsonb_agg(distinct jsonb_build_object('user_id', user_id, 'campaign', campaign)) into v_keys from old_rows where campaign is not null;
+  else
+    select jsonb_agg(distinct jsonb_build_object('user_id', user_id, 'campaign', campaign)) into v_keys
+    from (select user_id, campaign from new_rows union select user_id, campaign from old_rows) changed where campaign is not null;
+  end if;
+  if v_keys is not null then perform public.refresh_campaign_summary(v_keys); end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists leads_campaign_summary_insert on public.leads;
+create trigger leads_campaign_summary_insert after insert on public.leads
+  referencing new table as new_rows for each statement execute function public.leads_refresh_campaign_summary();
+drop trigger if exists leads_campaign_summary_update on public.leads;
+create trigger leads_campaign_summary_update after update on public.leads
+  referencing old table as old_rows new table as new_rows for each statement execute function public.leads_refresh_campaign_summary();
+drop trigger if exists leads_campaign_summary_delete on public.leads;
+create trigger leads_campaign_summary_delete after delete on public.leads
+  referencing old table as old_rows for each statement execute function public.leads_refresh_campaign_summary();
+
+revoke execute on function public.refresh_campaign_summary(jsonb) from public, anon, authenticated;
+
+-- Erstbefüllung aus dem Bestand
+select public.refresh_campaign_summary(coalesce(
+  (select jsonb_agg(distinct jsonb_build_object('user_id', user_id, 'campaign', campaign)) from public.leads where campaign is not null and user_id is not null),
+  '[]'::jsonb));
@@ -0,0 +1,53 @@
+-- Globale Suche über Leads und Notizen (Aufruf per PostgREST: rpc/search_leads).
+-- Präfixsuche über tsvector ('simple', ohne Stemming), Tippfehler über pg_trgm; beides per GIN-Index.
+create extension if not exists pg_trgm with schema extensions;
+
+alter table public.leads add column if not exists search_text text generated always as (
+  lower(coalesce(name, '') || ' ' || coalesce(branche, '') || ' ' || coalesce(address, '') || ' ' || coalesce(phone, '') || ' '
+        || regexp_replace(coalesce(phone, ''), '\D', '', 'g') || ' ' || coalesce(email, '') || ' ' || coalesce(contact_person, ''))
+) stored;
+
+create index if not exists leads_search_fts_idx on public.leads using gin (to_tsvector('simple'::regconfig, search_text));
+create index if not exists leads_search_trgm_idx on public.leads using gin (search_text extensions.gin_trgm_ops);
+create index if not exists notes_content_fts_idx on public.notes using gin (to_tsvector('simple'::regconfig, lower(content)));
+create index if not exists notes_content_trgm_idx on public.notes using gin (lower(content) extensions.gin_trgm_ops);
+
+create or replace function public.search_leads(p_query text, p_limit integer default 20)
+returns table (lead_id bigint, name text, campaign text, status text, is_archived boolean, match_source text, snippet text, rank real)
+language sql stable security invoker
+set search_path = public, extensions
+as $$
+  with q as (
+    select lower(trim(p_query)) as term,
+           nullif(array_to_string(array(
+             select quote_literal(word) || ':*' from regexp_split_to_table(lower(p_query), '[^[:alnum:]]+') as word where word <> ''
+           ), ' & '), '')::tsquery as prefix_query
+  ),
+  lead_hits as (
+    select l.id::bigint as lead_id, 'lead'::text as match_source, null::text as snippet,
+           coalesce(ts_rank(to_tsvector('simple'::regconfig, l.search_text), q.prefix_query), 0) + word_similarity(q.term, l.search_text) as rank
+    from public.leads l, q
+    where l.user_id = auth.uid()
+      and ((q.prefix_query is not null and to_tsvector('simple'::regconfig, l.search_text) @@ q.prefix_query) or q.term <% l.search_text)
+  ),
+  note_hits as (
+    -- Notiztreffer zählen halb so viel wie Treffer in den Stammdaten
+    select n.lead_id::bigint, 'note'::text, left(n.content, 160),
+           0.5 * (coalesce(ts_rank(to_tsvector('simple'::regconfig, lower(n.content)), q.prefix_query), 0) + word_similarity(q.term, lower(n.content)))
+    from public.notes n, q
+    where n.user_id = auth.uid()
+      and ((q.prefix_query is not null and to_tsvector('simple'::regconfig, lower(n.content)) @@ q.prefix_query) or q.term <% lower(n.content))
+  ),
+  best as (
+    select distinct on (h.lead_id) h.lead_id, h.match_source, h.snippet, sum(h.rank) over (partition by h.lead_id) as total_rank
+    from (select * from lead_hits union all select * from note_hits) h
+    order by h.lead_id, h.rank desc
+  )
+  select b.lead_id, l.name, l.campaign, l.status, coalesce(l.is_archived, false), b.match_source, b.snippet, b.total_rank::real
+  from best b
+  join public.leads l on l.id = b.lead_id
+  order by b.total_rank desc, l.name
+  limit greatest(coalesce(p_limit, 20), 1)
+$$;
+
+grant execute on function public.search_leads(text, integer) to authenticated;
@@ -0,0 +1,3 @@
+-- Export blättert Aufgaben und Notizen per Keyset (user_id = ..., id > letzte id order by id), wie leads_user_id_id_idx für Leads
+create index if not exists tasks_user_id_id_idx on public.tasks (user_id, id);
+create index if not exists notes_user_id_id_idx on public.notes (user_id, id);
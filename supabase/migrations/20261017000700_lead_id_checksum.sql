@@ -0,0 +1,12 @@
+-- Prüfsumme über die Lead-IDs des Nutzers für den Delta-Abgleich im Client (rpc/lead_id_checksum):
+-- erkennt Löschungen auch dann, wenn zwischen zwei Abgleichen gleich viele Leads dazugekommen sind
+create or replace function public.lead_id_checksum()
+returns table (lead_count bigint, id_hash text)
+language sql stable security invoker
+as $$
+  select count(*), md5(coalesce(string_agg(l.id::text, ',' order by l.id), ''))
+  from public.leads l
+  where l.user_id = auth.uid()
+$$;
+
+grant execute on function public.lead_id_checksum() to authenticated;
@@ -0,0 +1,17 @@
+-- Prüfsumme über IDs und Änderungszeitpunkte der Leads des Nutzers für den Delta-Abgleich (rpc/lead_version_checksum).
+-- Ersetzt lead_id_checksum: now() im Trigger ist der Transaktionsbeginn, ein Update kann also nach dem letzten Abgleich sichtbar
+-- werden und trotzdem einen älteren updated_at als das Wasserzeichen tragen. Die Delta-Abfrage findet es nicht, die ID-Menge bleibt
+-- gleich; erst der geänderte Zeitstempel in der Prüfsumme erzwingt den Vollabgleich.
+drop function if exists public.lead_id_checksum();
+
+create or replace function public.lead_version_checksum()
+returns table (lead_count bigint, version_hash text)
+language sql stable security invoker
+as $$
+  select count(*),
+         md5(coalesce(string_agg(l.id::text || ':' || coalesce((extract(epoch from l.updated_at) * 1000000)::bigint, -1)::text, ',' order by l.id), ''))
+  from public.leads l
+  where l.user_id = auth.uid()
+$$;
+
+grant execute on function public.lead_version_checksum() to authenticated;
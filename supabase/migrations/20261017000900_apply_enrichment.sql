@@ -0,0 +1,23 @@
+-- Ergebnisse der Website-Anreicherung gesammelt speichern (rpc/apply_enrichment): ein UPDATE pro Batch statt eines pro Lead und Feld,
+-- damit auch der Statement-Trigger der Kampagnen-Übersicht nur einmal läuft. Ein Feld wird nur geschrieben, solange es in der
+-- Datenbank noch leer ist; Änderungen, die während des Laufs im CRM gemacht wurden, bleiben erhalten.
+-- p_rows: [{"id": 1, "email": "...", "contact_person": "..."}, ...]; fehlende Felder bleiben unverändert. Rückgabe: Anzahl geänderter Leads.
+create or replace function public.apply_enrichment(p_rows jsonb)
+returns integer
+language sql volatile security invoker
+as $$
+  with updated as (
+    update public.leads l
+       set email = case when coalesce(trim(l.email), '') = '' and coalesce(trim(r.email), '') <> '' then r.email else l.email end,
+           contact_person = case when coalesce(trim(l.contact_person), '') = '' and coalesce(trim(r.contact_person), '') <> '' then r.contact_person else l.contact_person end
+      from jsonb_to_recordset(p_rows) as r(id bigint, email text, contact_person text)
+     where l.id = r.id
+       and l.user_id = auth.uid()
+       and ((coalesce(trim(l.email), '') = '' and coalesce(trim(r.email), '') <> '')
+         or (coalesce(trim(l.contact_person), '') = '' and coalesce(trim(r.contact_person), '') <> ''))
+    returning l.id
+  )
+  select count(*)::integer from updated
+$$;
+
+grant execute on function public.apply_enrichment(jsonb) to authenticated;
@@ -0,0 +1,58 @@
+# -----------------------------------------------------------------------------
+# Gemeinsame Test-Fixtures: Pfade zu gespeicherten Seiten, ein lokaler HTTP-Server pro Fixture-Verzeichnis und der
+# In-Process-Supabase-Ersatz als Client von crm_data
+# -----------------------------------------------------------------------------
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import streamlit as st
+
+import crm_data
+from benchmarks import run_benchmarks
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def fixture_path(*parts):
+    return os.path.join(FIXTURES, *parts)
+
+def read_fixture(*parts):
+    with open(fixture_path(*parts), encoding="utf-8") as f: return f.read()
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    # Wie ein typischer Webserver: /impressum liefert impressum.html; alle Pfade werden im Server-Log gezählt
+    def translate_path(self, path):
+        local = super().translate_path(path)
+        return local + ".html" if not os.path.exists(local) and os.path.exists(local + ".html") else local
+
+    def do_GET(self):
+        self.server.requests.append(self.path.split("?")[0]); super().do_GET()
+
+    def log_message(self, *args): pass
+
+@pytest.fixture
+def serve_site():
+    # serve_site("enrichment", "kanzlei") -> Basis-URL eines Servers, der das Verzeichnis als Website-Wurzel ausliefert
+    servers = []
+    def start(*parts):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(FixtureHandler, directory=fixture_path(*parts))); server.requests = []
+        threading.Thread(target=server.serve_forever, daemon=True).start(); servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/", server
+    yield start
+    for server in servers: server.shutdown(); server.server_close()
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    # crm_data erzeugt seinen Client über create_client; unabhängig davon, wer crm_data zuerst importiert hat, auf den Ersatz umbiegen
+    monkeypatch.setattr(crm_data, 'create_client', lambda url, key: run_benchmarks._backend['fake'])
+
+@pytest.fixture
+def backend(fake_client, request):
+    # Frisch befüllter Ersatz; Größe und Seed per @pytest.mark.backend(size=..., seed=...) am Test oder als pytestmark am Modul.
+    # Danach Client, Entity-Cache und Executor verwerfen, damit der nächste Test kalt startet
+    marker = request.node.get_closest_marker('backend'); options = {'size': 100, 'seed': 42, **(marker.kwargs if marker else {})}
+    fake, _ = run_benchmarks.fresh_backend(options['size'], options['seed'])
+    yield fake
+    st.cache_resource.clear()
@@ -0,0 +1,39 @@
+# -----------------------------------------------------------------------------
+# Sammelaktion im TagesGeschäft: über alle Leads der aktuellen Filter (serverseitig) oder über eine seitenübergreifende Auswahl
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+from crm_data import LEAD_PAGE_SIZE
+
+pytestmark = pytest.mark.backend(size=2000, seed=17)
+PAGE = "📅 TagesGeschäft"
+NEW_STATUS = "🟤 Kein Interesse"
+
+def active_leads(fake, campaign=None):
+    return [r for r in fake.tables['leads'] if r['user_id'] == fake.auth.user.user.id and not r['is_archived'] and (campaign is None or r['campaign'] == campaign)]
+
+def largest_campaign(fake):
+    campaigns = [r['campaign'] for r in active_leads(fake) if r['campaign']]
+    return max(set(campaigns), key=campaigns.count)
+
+def apply_bulk(at, target):
+    at.radio(key="bulk_target").set_value(target); at.selectbox(key="bulk_status").set_value(NEW_STATUS); at.number_input(key="bulk_retry_days").set_value(0); at.run()
+    at.button(key="bulk_apply").click().run()
+    assert not at.exception, [e.value for e in at.exception]
+
+def test_filtered_action_reaches_leads_beyond_the_visible_page(backend):
+    campaign = largest_campaign(backend); leads = active_leads(backend, campaign); others = [r for r in active_leads(backend) if r['campaign'] != campaign]
+    assert len(leads) > LEAD_PAGE_SIZE
+    at = new_app(backend, page=PAGE); at.session_state['campaign_selector'] = campaign; at.run()
+    before = {r['id']: r['status'] for r in others}
+    apply_bulk(at, 'filtered')
+    assert all(r['status'] == NEW_STATUS for r in leads) and {r['id']: r['status'] for r in others} == before
+
+def test_selection_is_kept_across_pages(backend):
+    leads = sorted(active_leads(backend), key=lambda r: -r['id']); chosen = {leads[0]['id'], leads[LEAD_PAGE_SIZE + 5]['id']}  # Seite 1 und 2
+    at = new_app(backend, page=PAGE); at.session_state['selected_lead_ids'] = set(chosen); at.run()
+    at.button(key="lead_page_next").click().run()
+    assert at.session_state['selected_lead_ids'] == chosen
+    apply_bulk(at, 'selected')
+    assert {r['id'] for r in active_leads(backend) if r['status'] == NEW_STATUS} >= chosen and at.session_state['selected_lead_ids'] == set()
@@ -0,0 +1,105 @@
+# -----------------------------------------------------------------------------
+# Website-Anreicherung gegen gespeicherte Seiten auf einem lokalen HTTP-Server (kein Internetzugriff)
+# -----------------------------------------------------------------------------
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from conftest import read_fixture
+from enrichment import FAILURE_CACHE_TTL, RESPONSE_CACHE_TTL, HostLimiter, enrich_leads_async, extract_contact_person, extract_emails, fetch_page, parse_page
+from entity_cache import EntityCache
+
+class RecordingCache(EntityCache):
+    def __init__(self):
+        super().__init__(); self.ttls = {}
+
+    def set(self, key, value, ttl):
+        self.ttls[key] = ttl; super().set(key, value, ttl)
+
+@pytest.fixture(autouse=True)
+def no_proxy(monkeypatch):
+    # Lokaler Server: Proxy-Einstellungen der Umgebung dürfen die Anfragen nicht umleiten
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"): monkeypatch.delenv(var, raising=False)
+
+def parsed(*parts):
+    return parse_page(read_fixture("enrichment", *parts))
+
+def test_extract_emails_homepage():
+    # mailto mit Betreff, Klartext-Dublette und "[at] ... [punkt]"; Adressen in <script>, CSS und Bildnamen zählen nicht
+    assert extract_emails(*parsed("kanzlei", "index.html")) == ["info@kanzlei-weber.test", "karriere@kanzlei-weber.test"]
+
+def test_extract_emails_obfuscated_and_cloudflare():
+    assert extract_emails(*parsed("kanzlei", "impressum.html")) == ["kanzlei@kanzlei-weber.test"]
+    assert extract_emails(*parsed("praxis", "impressum.html")) == ["praxis@zahnarzt-musterstadt.test"]
+
+def test_extract_contact_person():
+    assert extract_contact_person(parsed("kanzlei", "impressum.html")[1]) == "Dr. Thomas Weber"
+    assert extract_contact_person(parsed("praxis", "impressum.html")[1]) == "Dr. med. dent. Julia Schneider"
+    assert extract_contact_person(parsed("kanzlei", "index.html")[1]) is None
+
+@pytest.mark.parametrize("text, expected", [
+    ("Inhaberin: Maria Schulz\nBahnhofstraße 5", "Maria Schulz"),
+    ("Geschäftsführer Max Mustermann Registergericht Amtsgericht Berlin", "Max Mustermann"),
+    ("Vertreten durch den Geschäftsführer Herrn Jan van Dijk", "Jan van Dijk"),
+    ("Geschäftsführung: siehe Handelsregister", None),
+])
+def test_extract_contact_person_stops_at_following_words(text, expected):
+    assert extract_contact_person(text) == expected
+
+def test_enrich_leads_async_against_local_sites(serve_site):
+    kanzlei, kanzlei_server = serve_site("enrichment", "kanzlei"); praxis, praxis_server = serve_site("enrichment", "praxis")
+    leads = [{'id': 1, 'website': kanzlei}, {'id': 2, 'website': praxis}, {'id': 3, 'website': kanzlei + "gibt-es-nicht/"}, {'id': 4, 'website': ''}]
+    seen = []
+    results = asyncio.run(enrich_leads_async(leads, on_result=seen.append, limiter=HostLimiter(interval=0), cache=EntityCache()))
+    by_id = {result['id']: result for result in results}
+    assert sorted(r['id'] for r in seen) == [1, 2, 3, 4]
+    assert by_id[1] == {'id': 1, 'email': "info@kanzlei-weber.test", 'contact_person': "Dr. Thomas Weber", 'pages': 3, 'error': None}
+    assert by_id[2] == {'id': 2, 'email': "praxis@zahnarzt-musterstadt.test", 'contact_person': "Dr. med. dent. Julia Schneider", 'pages': 2, 'error': None}
+    assert by_id[3]['error'] == "Webseite nicht erreichbar" and by_id[4]['error'] == "Keine Webseite"
+    # Impressum/Kontakt aus den Links der Startseite; ohne Links die Standardpfade
+    assert {"/", "/impressum.html", "/kontakt.html"} <= set(kanzlei_server.requests)
+    assert set(praxis_server.requests) == {"/", "/impressum", "/kontakt"}
+
+def test_enrich_leads_async_should_stop(serve_site):
+    kanzlei, server = serve_site("enrichment", "kanzlei")
+    results = asyncio.run(enrich_leads_async([{'id': i, 'website': kanzlei} for i in range(5)], should_stop=lambda: True, cache=EntityCache()))
+    assert results == [] and server.requests == []
+
+def test_fetch_page_caches_failures_shorter(serve_site):
+    base, server = serve_site("enrichment", "kanzlei"); cache = RecordingCache(); missing = base + "fehlt.html"
+    async def fetch_twice():
+        async with httpx.AsyncClient() as client:
+            limiter = HostLimiter(interval=0)
+            return [await fetch_page(client, limiter, url, cache) for url in (missing, missing, base, base)]
+    pages = asyncio.run(fetch_twice())
+    assert pages[0] is None and pages[1] is None and pages[2] == pages[3] and "Ihre Steuerberatung" in pages[2][0]
+    assert server.requests.count("/fehlt.html") == 1 and server.requests.count("/") == 1
+    assert cache.ttls[missing] == FAILURE_CACHE_TTL < cache.ttls[base] == RESPONSE_CACHE_TTL
+
+def test_fetch_page_unreachable_host_is_cached_as_failure():
+    cache = RecordingCache(); url = "http://127.0.0.1:9/"  # discard-Port: Verbindung wird abgelehnt
+    async def fetch():
+        async with httpx.AsyncClient(timeout=2) as client: return await fetch_page(client, HostLimiter(interval=0), url, cache)
+    assert asyncio.run(fetch()) is None and cache.get(url) == (True, None) and cache.ttls[url] == FAILURE_CACHE_TTL
+
+def test_host_limiter_spaces_requests_per_host():
+    limiter = HostLimiter(concurrency=2, interval=0.1); starts = {'a': [], 'b': []}
+    async def request(host):
+        async with limiter.slot(host): starts[host].append(time.monotonic()); await asyncio.sleep(0.01)
+    async def run():
+        await asyncio.gather(*(request(host) for host in ('a', 'a', 'a', 'b')))
+    began = time.monotonic(); asyncio.run(run())
+    gaps = [later - earlier for earlier, later in zip(starts['a'], starts['a'][1:])]
+    assert len(starts['a']) == 3 and all(gap >= 0.095 for gap in gaps)
+    assert starts['b'][0] - began < 0.05  # anderer Host wartet nicht auf "a"
+
+def test_host_limiter_caps_concurrency():
+    limiter = HostLimiter(concurrency=2, interval=0); active = peak = 0
+    async def request():
+        nonlocal active, peak
+        async with limiter.slot('a'): active += 1; peak = max(peak, active); await asyncio.sleep(0.02); active -= 1
+    async def run(): await asyncio.gather(*(request() for _ in range(6)))
+    asyncio.run(run())
+    assert peak == 2
@@ -0,0 +1,42 @@
+# -----------------------------------------------------------------------------
+# Speichern der Anreicherung: ein rpc/apply_enrichment pro Chunk, nur noch leere Felder werden gefüllt
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+from crm_data import WRITE_CHUNK_SIZE
+
+pytestmark = pytest.mark.backend(size=WRITE_CHUNK_SIZE + 200, seed=13)
+
+SCRIPT = '''
+import streamlit as st
+from crm_data import get_user_id, save_enrichment_results
+st.session_state.updated = save_enrichment_results(get_user_id(), st.session_state.snapshot, st.session_state.results)
+'''
+
+@pytest.fixture(params=['rpc', 'ohne rpc'])
+def saved(request, backend):
+    if request.param == 'ohne rpc': backend.functions.pop('apply_enrichment')
+    return backend
+
+def run_save(fake):
+    own = [r for r in fake.tables['leads'] if r['user_id'] == fake.auth.user.user.id][:WRITE_CHUNK_SIZE + 100]
+    for lead in own: lead.update(email=None, contact_person="")
+    snapshot = {lead['id']: dict(lead) for lead in own}
+    # Während des Laufs im CRM eingetragen: darf nicht überschrieben werden
+    edited = own[0]; edited['email'] = "vertrieb@kunde.test"
+    results = [{'id': lead['id'], 'email': f"info{lead['id']}@treffer.test", 'contact_person': "Dr. Erika Muster" if lead['id'] % 2 else None} for lead in own]
+    at = new_app(fake, script=SCRIPT); at.session_state['snapshot'] = snapshot; at.session_state['results'] = results; at.run()
+    assert not at.exception
+    return own, edited, at.session_state['updated']
+
+def test_fills_only_empty_fields(saved):
+    own, edited, updated = run_save(saved)
+    assert updated == len(own) - (0 if edited['id'] % 2 else 1)  # der bearbeitete Lead zählt nur, wenn er noch einen Ansprechpartner bekommt
+    assert edited['email'] == "vertrieb@kunde.test"
+    assert all(lead['email'] == f"info{lead['id']}@treffer.test" for lead in own[1:])
+    assert all(lead['contact_person'] == ("Dr. Erika Muster" if lead['id'] % 2 else "") for lead in own)
+
+def test_one_rpc_per_chunk_instead_of_updates_per_field(backend):
+    backend.calls.clear(); own, _, _ = run_save(backend)
+    assert backend.calls.count(('rpc/apply_enrichment', 'rpc')) == -(-len(own) // WRITE_CHUNK_SIZE) and ('leads', 'update') not in backend.calls
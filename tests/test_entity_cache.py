@@ -0,0 +1,29 @@
+# -----------------------------------------------------------------------------
+# Entity-Cache: Aufrufer bekommen Kopien der gecachten Frames (auch in (df, Anzahl)-Tupeln); Logout verwirft die Einträge des Nutzers
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+
+pytestmark = pytest.mark.backend(size=300, seed=21)
+
+SCRIPT = '''
+import streamlit as st
+from crm_data import load_lead_page, load_task_page
+for load, column in ((load_lead_page, 'name'), (load_task_page, 'description')):
+    first, _ = load(0); first[column] = "verändert"
+    second, _ = load(0)
+    st.session_state[load.__name__] = bool((second[column] == "verändert").any())
+'''
+
+def test_cached_frames_inside_tuples_are_copied(backend):
+    at = new_app(backend, script=SCRIPT); at.run()
+    assert not at.exception and not at.session_state['load_lead_page'] and not at.session_state['load_task_page']
+
+def test_logout_clears_the_users_cache_entries(backend):
+    import crm_data
+    at = new_app(backend, page="☑️ Aufgaben"); at.run()
+    cache = crm_data.get_entity_cache(); user_id = backend.auth.user.user.id
+    assert any(key[0] == user_id for key in cache._entries)
+    next(button for button in at.sidebar.button if button.label == "Logout").click().run()
+    assert at.session_state['user'] is None and not any(key[0] == user_id for key in cache._entries)
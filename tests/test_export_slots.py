@@ -0,0 +1,31 @@
+# -----------------------------------------------------------------------------
+# Export-Plätze: sind alle belegt, bricht build_export nach EXPORT_SLOT_TIMEOUT mit klarer Meldung ab, statt unbegrenzt zu warten
+# -----------------------------------------------------------------------------
+import pytest
+
+import crm_data
+from benchmarks.run_benchmarks import new_app
+
+SCRIPT = '''
+import streamlit as st
+from crm_data import build_export, get_user_id
+try: st.session_state.result = len(build_export(get_user_id(), "account", "csv"))
+except RuntimeError as e: st.session_state.result = str(e)
+'''
+
+pytestmark = pytest.mark.backend(size=50, seed=2)
+
+@pytest.fixture(autouse=True)
+def short_slot_timeout(monkeypatch):
+    monkeypatch.setattr(crm_data, 'EXPORT_SLOT_TIMEOUT', 0.2)
+
+def test_busy_slots_time_out_with_message_and_free_slots_export(backend):
+    at = new_app(backend, script=SCRIPT); at.run()  # legt den Semaphor im Resource-Cache an
+    assert isinstance(at.session_state['result'], int) and at.session_state['result'] > 0
+    slots = crm_data.get_export_slots(); taken = [slots.acquire(blocking=False) for _ in range(crm_data.EXPORT_MAX_PARALLEL)]
+    assert all(taken)
+    at.run(); assert at.session_state['result'] == crm_data.EXPORT_BUSY_MESSAGE
+    page = new_app(backend, page="📤 Export"); page.run()
+    assert any(crm_data.EXPORT_BUSY_MESSAGE in warning.value for warning in page.warning)
+    for _ in taken: slots.release()
+    at.run(); assert isinstance(at.session_state['result'], int)
@@ -0,0 +1,77 @@
+# -----------------------------------------------------------------------------
+# GelbeSeiten-Parser offline gegen gespeicherte Trefferseite und "Mehr Treffer"-Antwort (ajaxsuche)
+# -----------------------------------------------------------------------------
+import json
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from selectolax.lexbor import LexborHTMLParser
+
+from conftest import read_fixture
+from gelbeseiten import CARD_SELECTOR, LOAD_MORE_URL, build_search_url, card_listing_id, decode_website_link, iter_gelbeseiten_http, parse_result_cards
+
+QUERY, LOCATION, USER_ID = "Steuerberater", "Berlin", "user-1"
+CAMPAIGN = "GelbeSeiten: Steuerberater (Berlin)"
+RESULTS_PAGE = read_fixture("gelbeseiten", "suche_steuerberater_berlin.html")
+LOAD_MORE = json.loads(read_fixture("gelbeseiten", "ajaxsuche_mehr_treffer.json"))
+
+def lead(name, address, phone='', website=''):
+    return {'name': name, 'branche': QUERY, 'address': address, 'phone': phone, 'email': '', 'website': website, 'contact_person': '',
+            'status': None, 'campaign': CAMPAIGN, 'is_archived': False, 'user_id': USER_ID}
+
+PAGE_LEADS = [
+    lead("Steuerberatung Müller GmbH", "Friedrichstr. 12, 10117 Berlin (Mitte)", "030 12 34 56", "https://www.steuerberatung-mueller.test/"),
+    lead("Kanzlei Schulz & Partner", "Kastanienallee 7, 10435 Berlin", "030 4455", "http://kanzlei-schulz.test"),
+    lead("Steuerbüro Neumann", "Schönhauser Allee 80, 10439 Berlin"),
+]
+LOAD_MORE_LEAD = lead("Lohnsteuerhilfe Wedding e.V.", "Müllerstr. 140, 13353 Berlin", "030 98 76", "https://www.stb-neumann.test/kontakt")
+
+def test_parse_result_cards_exact_lead_dicts():
+    # Werbeplatz ohne <h2> fällt weg; Leerraum in Name und Adresse wird zusammengefasst
+    assert parse_result_cards(RESULTS_PAGE, QUERY, CAMPAIGN, USER_ID) == PAGE_LEADS
+
+@pytest.mark.parametrize("encoded, expected", [
+    ("aHR0cHM6Ly93d3cuc3RldWVyYmVyYXR1bmctbXVlbGxlci50ZXN0Lw==", "https://www.steuerberatung-mueller.test/"),
+    ("aHR0cDovL2thbnpsZWktc2NodWx6LnRlc3Q=", "http://kanzlei-schulz.test"),
+    ("%%kein-base64%%", ""),
+    ("", ""),
+    (None, ""),
+])
+def test_decode_website_link(encoded, expected):
+    assert decode_website_link(encoded) == expected
+
+def test_card_listing_id_prefers_realid_then_teilnehmerid_then_id():
+    cards = LexborHTMLParser(RESULTS_PAGE).css(CARD_SELECTOR) + LexborHTMLParser(LOAD_MORE['html']).css(CARD_SELECTOR)
+    assert [card_listing_id(card) for card in cards] == ["10001", "t-777", "ad-1", "treffer_3", "10001", "Lohnsteuerhilfe Wedding e.V.|Müllerstr. 140, 13353 Berlin"]
+
+def test_seen_ids_skip_cards_already_on_the_first_page():
+    seen_ids = set()
+    assert parse_result_cards(RESULTS_PAGE, QUERY, CAMPAIGN, USER_ID, seen_ids) == PAGE_LEADS
+    assert parse_result_cards(LOAD_MORE['html'], QUERY, CAMPAIGN, USER_ID, seen_ids) == [LOAD_MORE_LEAD]
+    assert parse_result_cards(RESULTS_PAGE, QUERY, CAMPAIGN, USER_ID, seen_ids) == []
+
+def serve_fixtures(requests):
+    # Ersetzt gelbeseiten.de: Suchseite per GET, weitere Treffer per POST auf /ajaxsuche
+    def handler(request):
+        requests.append(request)
+        if request.method == "GET" and str(request.url) == build_search_url(QUERY, LOCATION): return httpx.Response(200, html=RESULTS_PAGE)
+        if request.method == "POST" and str(request.url) == LOAD_MORE_URL: return httpx.Response(200, json=LOAD_MORE)
+        return httpx.Response(404)
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+def test_iter_gelbeseiten_http_loads_more_until_total_hits():
+    requests = []
+    with serve_fixtures(requests) as client: leads = list(iter_gelbeseiten_http(QUERY, LOCATION, 50, USER_ID, client=client))
+    assert leads == PAGE_LEADS + [LOAD_MORE_LEAD]
+    # "Mehr Treffer" ab der Position nach allen bereits gesehenen Einträgen; danach ist gesamtanzahlTreffer erreicht
+    assert [r.method for r in requests] == ["GET", "POST"]
+    form = parse_qs(requests[1].content.decode())
+    assert form['WAS'] == [QUERY] and form['WO'] == [LOCATION] and form['position'] == ["5"]
+
+def test_iter_gelbeseiten_http_respects_max_results_and_skip_keys():
+    requests = []
+    with serve_fixtures(requests) as client:
+        assert list(iter_gelbeseiten_http(QUERY, LOCATION, 2, USER_ID, client=client)) == PAGE_LEADS[:2]
+        skip = {"steuerberatung müller gmbh|friedrichstr. 12, 10117 berlin (mitte)"}
+        assert list(iter_gelbeseiten_http(QUERY, LOCATION, 50, USER_ID, client=client, skip_keys=skip)) == PAGE_LEADS[1:] + [LOAD_MORE_LEAD]
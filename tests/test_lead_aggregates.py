@@ -0,0 +1,67 @@
+# -----------------------------------------------------------------------------
+# load_lead_aggregates (rpc/lead_status_counts bzw. lokaler Fallback) gegen den In-Process-Supabase-Ersatz der Benchmarks:
+# muss für Zeitraum und Archiv-Schalter dasselbe liefern wie aggregate_leads_locally über die Leads des Nutzers
+# -----------------------------------------------------------------------------
+import datetime
+
+import pandas as pd
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+from crm_data import aggregate_leads_locally
+
+TODAY = datetime.date.today()
+CASES = [
+    (None, None, False, False),
+    (None, None, True, False),
+    (TODAY - datetime.timedelta(days=30), TODAY - datetime.timedelta(days=10), False, False),
+    (TODAY - datetime.timedelta(days=30), None, True, True),
+    (None, TODAY - datetime.timedelta(days=60), False, True),
+    (TODAY, TODAY, True, True),
+]
+SCRIPT = '''
+import datetime
+import streamlit as st
+from crm_data import load_lead_aggregates
+st.session_state.results = [load_lead_aggregates(*case) for case in {cases!r}]
+'''
+
+def normalized(df):
+    # Reihenfolge, Typ des Tages (date/str) und NA-Varianten spielen für den Vergleich keine Rolle
+    rows = df[['campaign', 'status', 'created_day', 'lead_count']].astype(object).where(df.notna(), None).values.tolist()
+    return sorted(((c, s, None if d is None else str(d), int(n)) for c, s, d, n in rows), key=repr)
+
+pytestmark = pytest.mark.backend(size=400, seed=7)
+
+@pytest.fixture(autouse=True)
+def foreign_lead(backend):
+    # Leads eines anderen Nutzers dürfen in keiner Zählung auftauchen
+    backend.add('leads', dict(backend.tables['leads'][0], id=10_000, user_id='00000000-0000-4000-8000-000000000002', campaign="Fremde Kampagne"))
+
+def expected(fake, case):
+    own = pd.DataFrame([r for r in fake.tables['leads'] if r['user_id'] == fake.auth.user.user.id])
+    return aggregate_leads_locally(own, *case)
+
+def run_aggregates(fake):
+    at = new_app(fake, script=SCRIPT.format(cases=CASES)); at.run()
+    assert not at.exception, [e.value for e in at.exception]
+    return at.session_state['results']
+
+def test_rpc_matches_local_aggregation(backend):
+    for case, result in zip(CASES, run_aggregates(backend)):
+        assert normalized(result) == normalized(expected(backend, case)), case
+    # Serverseitig gezählt: keine Lead-Zeilen über die Leitung
+    assert backend.calls.count(('rpc/lead_status_counts', 'rpc')) == len(CASES) and ('leads', 'select') not in backend.calls
+
+def test_fallback_without_rpc_matches_local_aggregation(backend):
+    backend.functions.pop('lead_status_counts')  # Migration noch nicht eingespielt
+    for case, result in zip(CASES, run_aggregates(backend)):
+        assert normalized(result) == normalized(expected(backend, case)), case
+
+def test_archive_flag_and_date_range_change_counts(backend):
+    results = run_aggregates(backend)
+    total = lambda df: int(df['lead_count'].sum())
+    own = [r for r in backend.tables['leads'] if r['user_id'] == backend.auth.user.user.id]
+    assert total(results[0]) == sum(not r['is_archived'] for r in own) < total(results[1]) == len(own)
+    assert 0 < total(results[2]) < total(results[0])
+    assert results[0]['created_day'].isna().all() and results[3]['created_day'].notna().all()
@@ -0,0 +1,56 @@
+# -----------------------------------------------------------------------------
+# Delta-Abgleich des Lead-Bestands (load_all_leads_data) gegen den In-Process-Supabase-Ersatz: Löschungen müssen auch dann
+# ankommen, wenn die Gesamtzahl gleich bleibt, Updates auch dann, wenn ihr updated_at älter als das Wasserzeichen ist
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+from crm_data import lead_version_checksum
+
+SCRIPT = '''
+import streamlit as st
+from crm_data import load_all_leads_data
+leads = load_all_leads_data(columns=['id', 'name', 'status'])
+st.session_state.ids = sorted(leads['id'].astype(int)); st.session_state.status = dict(zip(leads['id'].astype(int), leads['status']))
+'''
+
+pytestmark = pytest.mark.backend(size=200, seed=11)
+
+@pytest.fixture(params=['rpc', 'ohne rpc'])
+def synced(request, backend):
+    if request.param == 'ohne rpc': backend.functions.pop('lead_version_checksum')
+    return backend
+
+def own_ids(fake):
+    return sorted(r['id'] for r in fake.tables['leads'] if r['user_id'] == fake.auth.user.user.id)
+
+@pytest.mark.backend(size=50, seed=3)
+def test_checksum_matches_server_function(backend):
+    rows = [r for r in reversed(backend.tables['leads']) if r['user_id'] == backend.auth.user.user.id]
+    assert backend.rpc('lead_version_checksum').execute().data[0] == dict(zip(['lead_count', 'version_hash'], lead_version_checksum([r['id'] for r in rows], [r['updated_at'] for r in rows])))
+
+def test_delete_plus_late_insert_with_equal_count_is_detected(synced):
+    at = new_app(synced, script=SCRIPT); at.run()
+    assert at.session_state['ids'] == own_ids(synced)
+    # Ein Lead wird gelöscht, ein anderer Import-Lead wird erst nach dem letzten Abgleich sichtbar, trägt aber einen älteren
+    # updated_at (Transaktion lief schon vorher): Anzahl gleich, Delta-Abfrage findet nichts
+    deleted = synced.tables['leads'][5]; synced.remove('leads', [deleted])
+    late = dict(synced.tables['leads'][0], id=5000, name="Verspäteter Import", updated_at="2000-01-01T00:00:00+00:00"); synced.add('leads', late)
+    at.run()
+    assert not at.exception and at.session_state['ids'] == own_ids(synced)
+    assert deleted['id'] not in at.session_state['ids'] and 5000 in at.session_state['ids']
+
+def test_late_update_with_old_updated_at_is_detected(synced):
+    at = new_app(synced, script=SCRIPT); at.run()
+    # Update committet nach dem Abgleich, trägt aber den (älteren) Transaktionsbeginn als updated_at: Delta-Abfrage findet es nicht
+    lead = next(r for r in synced.tables['leads'] if r['user_id'] == synced.auth.user.user.id and r['status'] != "🟡 Termin vereinbart")
+    lead.update(status="🟡 Termin vereinbart", updated_at="2001-01-01T00:00:00+00:00"); synced.version += 1
+    at.run()
+    assert not at.exception and at.session_state['status'][lead['id']] == "🟡 Termin vereinbart"
+
+def test_unchanged_data_keeps_delta_sync(synced):
+    at = new_app(synced, script=SCRIPT); at.run(); synced.calls.clear()
+    at.run()
+    # Kein Vollabgleich: höchstens eine Keyset-Seite für die Delta-Abfrage plus Prüfsumme (bzw. ID-Seiten ohne rpc)
+    assert at.session_state['ids'] == own_ids(synced)
+    assert synced.calls.count(('leads', 'select')) <= (1 if 'lead_version_checksum' in synced.functions else 2)
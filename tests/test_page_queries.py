@@ -0,0 +1,41 @@
+# -----------------------------------------------------------------------------
+# Parallele Seitenabfragen: Worker laufen ohne Script-Kontext, Fehler kommen als Werte zurück und werden im Script-Thread angezeigt;
+# eine abgelaufene Abfrage schreibt nichts in einen späteren Rerun
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+
+pytestmark = pytest.mark.backend(size=100, seed=23)
+
+SCRIPT = '''
+import time
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from crm_data import get_user_id, load_lead_page, page_query, report_error, run_page_queries
+from instrumentation import Tracer
+
+def failing():
+    report_error("Fehler im Worker"); return get_script_run_ctx() is None, get_user_id()
+
+def slow():
+    time.sleep(0.5); report_error("Zu spät"); return "fertig"
+
+st.session_state.setdefault('tracer', Tracer()); st.session_state.debug_profiling = True; st.session_state.tracer.start_run("test")
+if st.session_state.get('mode', 'queries') == 'queries':
+    st.session_state.results = run_page_queries(failing=page_query(failing), slow=page_query(slow, default="default", timeout=0.1), leads=page_query(load_lead_page, 0, default=None))
+else: time.sleep(0.8)  # Folge-Rerun, während die abgelaufene Abfrage noch weiterläuft
+st.session_state.events = [e['name'] for e in st.session_state.tracer.events if e['kind'] == 'query']
+'''
+
+def test_worker_errors_are_rendered_on_the_script_thread(backend):
+    at = new_app(backend, script=SCRIPT); at.run()
+    results = at.session_state['results']
+    assert not at.exception and results['failing'] == (True, backend.auth.user.user.id) and results['slow'] == "default"
+    assert [e.value for e in at.error] == ["Fehler im Worker"]
+    assert results['leads'] is not None and at.session_state['events']  # Abfragen aus dem Worker landen im Trace des Reruns
+
+def test_timed_out_query_does_not_write_into_a_later_rerun(backend):
+    at = new_app(backend, script=SCRIPT); at.run()
+    at.session_state['mode'] = 'idle'; at.run()
+    assert not at.exception and not at.error and not at.session_state['events']
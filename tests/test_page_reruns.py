@@ -0,0 +1,33 @@
+# -----------------------------------------------------------------------------
+# Seitenweise Listen: bleibt eine Seite trotz (zwischengespeicherter) Gesamtzahl leer, darf die Seite nicht endlos neu laden
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+
+STALE_TASKS = '''
+import streamlit as st, crm_data, views.aufgaben as page
+page.load_task_page = lambda *args, **kwargs: (crm_data.tasks_to_df([]), 100)
+st.session_state.runs = st.session_state.get('runs', 0) + 1
+page.render()
+'''
+
+pytestmark = pytest.mark.backend(size=100, seed=5)
+
+def test_task_page_jumps_once_then_shows_empty_state(backend):
+    at = new_app(backend, script=STALE_TASKS); at.session_state['task_page'] = 0; at.run()
+    assert not at.exception and at.session_state['runs'] == 2 and at.session_state['task_page'] == 3
+    assert any("keine offenen Aufgaben mehr" in info.value for info in at.info)
+
+STALE_LEADS = '''
+import streamlit as st, pandas as pd, crm_data, views.tagesgeschaeft as page
+page.load_lead_page = lambda *args, **kwargs: (pd.DataFrame(columns=crm_data.LEAD_COLUMNS), 1000)
+st.session_state.runs = st.session_state.get('runs', 0) + 1
+page.render()
+'''
+
+def test_lead_page_jumps_once_then_shows_empty_state(backend):
+    from crm_data import LEAD_PAGE_SIZE
+    at = new_app(backend, script=STALE_LEADS); at.session_state['lead_page'] = 0; at.run()
+    assert not at.exception and at.session_state['runs'] == 2 and at.session_state['lead_page'] == -(-1000 // LEAD_PAGE_SIZE) - 1
+    assert any("keine Leads mehr" in info.value for info in at.info)
@@ -0,0 +1,22 @@
+# -----------------------------------------------------------------------------
+# Szenario-Raster: Gewinn gegen die Einzelrechnung der Kennzahl-Seite und gegen die Break-even-Schwelle prüfen
+# -----------------------------------------------------------------------------
+import numpy as np
+
+from scenarios import break_even_close_rate, profitable_share, scenario_axes, scenario_profit
+
+AXES = scenario_axes((0, 10000), (20, 300), (0, 60), (0, 6000), 7)
+
+def test_profit_matches_single_scenario_formula():
+    profit = scenario_profit(**AXES)
+    assert profit.shape == (7, 7, 7, 7)
+    for bi, ci, ri, pi in [(0, 0, 0, 0), (3, 2, 5, 6), (6, 6, 6, 6), (2, 4, 0, 3)]:
+        budget, cost, rate, per_customer = AXES['budget'][bi], AXES['cost_per_lead'][ci], AXES['close_rate'][ri], AXES['profit_per_customer'][pi]
+        assert np.isclose(profit[bi, ci, ri, pi], budget / cost * rate * per_customer - budget)
+
+def test_sign_flips_at_break_even_rate():
+    profit = scenario_profit(**AXES); threshold = break_even_close_rate(AXES['cost_per_lead'], AXES['profit_per_customer'])
+    above = np.broadcast_to(AXES['close_rate'][None, :, None] > threshold.T[:, None, :], profit[1:].shape)
+    clear = np.abs(profit[1:]) > 1e-6  # genau auf der Schwelle entscheidet nur die Rundung
+    assert clear.sum() > 0.8 * clear.size and np.array_equal((profit[1:] > 0)[clear], above[clear])
+    assert np.isclose(profitable_share(profit).mean(), (profit > 0).mean())
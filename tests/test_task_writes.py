@@ -0,0 +1,42 @@
+# -----------------------------------------------------------------------------
+# Sammel-Anlage von Aufgaben: bricht ein späterer Chunk ab, zählen die bereits geschriebenen und der Aufgaben-Cache wird trotzdem verworfen
+# -----------------------------------------------------------------------------
+import pytest
+
+from benchmarks.run_benchmarks import new_app
+from crm_data import WRITE_CHUNK_SIZE
+
+SCRIPT = '''
+import streamlit as st
+from datetime import date
+from crm_data import add_tasks_bulk, load_task_page
+before = load_task_page(0)[1]
+st.session_state.created = add_tasks_bulk(st.session_state.lead_ids, date.today(), "Follow-Up", notify=False)
+st.session_state.totals = (before, load_task_page(0)[1])
+'''
+
+pytestmark = pytest.mark.backend(size=WRITE_CHUNK_SIZE + 100, seed=9)
+
+def fail_second_task_insert(fake):
+    table, inserts = fake.table, []
+    def failing_table(name):
+        query = table(name)
+        if name != 'tasks': return query
+        execute = query.execute
+        def failing_execute():
+            if query.action == 'insert':
+                inserts.append(query.payload)
+                if len(inserts) > 1: raise Exception("Verbindung unterbrochen")
+            return execute()
+        query.execute = failing_execute; return query
+    fake.table = failing_table
+
+def test_partial_bulk_insert_counts_committed_rows_and_invalidates(backend):
+    user_id = backend.auth.user.user.id
+    lead_ids = [r['id'] for r in backend.tables['leads'] if r['user_id'] == user_id and not r['is_archived']][:WRITE_CHUNK_SIZE + 50]
+    fail_second_task_insert(backend)
+    at = new_app(backend, script=SCRIPT); at.session_state['lead_ids'] = lead_ids; at.run()
+    assert not at.exception and at.session_state['created'] == WRITE_CHUNK_SIZE
+    before, after = at.session_state['totals']
+    assert after == before + WRITE_CHUNK_SIZE
+    assert any(f"{WRITE_CHUNK_SIZE} von {len(lead_ids)}" in err.value for err in at.error)
@@ -0,0 +1,23 @@
+# -----------------------------------------------------------------------------
+# Seitenmodule: werden erst beim ersten Öffnen einer Seite importiert, eine Sitzung lädt also nur die Seiten, die sie tatsächlich nutzt
+# -----------------------------------------------------------------------------
+import importlib
+import streamlit as st
+
+PAGE_MODULES = {
+    "🏠 Startseite": "startseite",
+    "📊 Dashboard": "dashboard",
+    "☑️ Aufgaben": "aufgaben",
+    "🗄️ Archiv": "archiv",
+    "📤 Export": "export",
+    "👤 Lead-Details": "lead_details",
+    "🗓️ Termin anlegen": "termin",
+    "🧮 Kennzahl-Hypothese": "kennzahl",
+    "🔎 LeadFinder": "leadfinder",
+    "📅 TagesGeschäft": "tagesgeschaeft",
+}
+
+def go_to_page(page_name): st.session_state.page = page_name
+
+def render_page(page):
+    importlib.import_module(f"{__name__}.{PAGE_MODULES[page]}").render()
@@ -0,0 +1,27 @@
+# -----------------------------------------------------------------------------
+# Seite "🗄️ Archiv": Archivierte Kampagnen wiederherstellen oder löschen
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+from crm_data import delete_campaign, load_campaign_summary, restore_campaign
+
+def render():
+    st.info("Hier finden Sie alle Kampagnen, die Sie aus der Hauptansicht entfernt haben. Sie können sie hier einsehen, wiederherstellen oder endgültig löschen.")
+    campaign_summary = load_campaign_summary(); archived_campaigns = campaign_summary[campaign_summary['archived_count'] > 0]
+    if archived_campaigns.empty: st.success("Das Archiv ist leer.")
+    else:
+        for campaign, lead_count, last_activity in archived_campaigns[['campaign', 'archived_count', 'last_activity']].itertuples(index=False):
+            with st.container(border=True):
+                c1, c2, c3 = st.columns([4,1,1])
+                c1.subheader(f"{campaign}"); c1.caption(f"{lead_count} Leads" + (f" · Letzte Aktivität: {last_activity.strftime('%d.%m.%Y')}" if pd.notna(last_activity) else ""))
+                with c2:
+                    if st.button(f"🔄 Wiederherstellen", key=f"restore_{campaign}", use_container_width=True): restore_campaign(campaign); st.rerun()
+                with c3:
+                    if st.button(f"🔥 Endgültig löschen", key=f"delete_perm_{campaign}", type="primary", use_container_width=True):
+                        st.session_state.campaign_to_delete_perm = campaign; st.rerun()
+                if st.session_state.get("campaign_to_delete_perm") == campaign:
+                    st.warning(f"**Sind Sie absolut sicher?** Das Löschen der Kampagne **'{campaign}'** und aller zugehörigen Leads und Aufgaben kann nicht rückgängig gemacht werden.")
+                    c1, c2 = st.columns(2)
+                    if c1.button("Ja, endgültig löschen", key=f"confirm_delete_{campaign}"):
+                        with st.spinner("Lösche endgültig..."): delete_campaign(campaign); del st.session_state.campaign_to_delete_perm; st.rerun()
+                    if c2.button("Abbrechen", key=f"cancel_delete_{campaign}"): del st.session_state.campaign_to_delete_perm; st.rerun()
@@ -0,0 +1,60 @@
+# -----------------------------------------------------------------------------
+# Seite "☑️ Aufgaben": Offene Aufgaben seitenweise mit Filtern, neue Aufgabe anlegen
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+from datetime import date
+from crm_data import EMPTY_STATUS_OPTION, STATUS_OPTIONS, TASK_PAGE_SIZE, add_task, complete_task, delete_task, get_all_leads_for_dropdown, get_unique_campaigns, load_task_page, page_query, run_page_queries, tasks_to_df, update_lead_status, update_task
+from views.pager import current_page, handle_empty_page, page_count, render_pager, reset_page
+
+def render():
+    TASK_BUCKETS = {"Alle": None, "🔥 Fällig & Überfällig": "urgent", "🗓️ Zukünftig": "future"}
+    current_page('task_page')
+    def reset_task_page(): reset_page('task_page')
+    task_filters = {'campaign': st.session_state.get('task_filter_campaign', "Alle Kampagnen"), 'status': st.session_state.get('task_filter_status', "Alle Status"), 'bucket': st.session_state.get('task_filter_bucket', "Alle")}
+    page_data = run_page_queries(leads_for_dropdown=page_query(get_all_leads_for_dropdown, default=[]), campaigns=page_query(get_unique_campaigns, archived=False, default=[]),
+        task_page=page_query(load_task_page, st.session_state.task_page, campaign=None if task_filters['campaign'] == "Alle Kampagnen" else task_filters['campaign'],
+                             lead_status=None if task_filters['status'] == "Alle Status" else task_filters['status'], bucket=TASK_BUCKETS.get(task_filters['bucket']), default=(tasks_to_df([]), 0)))
+    with st.expander("Neue Aufgabe manuell erstellen", expanded=False):
+        leads_for_dropdown = page_data['leads_for_dropdown']
+        if not leads_for_dropdown: st.warning("Es sind keine aktiven Leads vorhanden.")
+        else:
+            lead_options = {f"{lead['name']} (ID: {lead['id']})": lead['id'] for lead in leads_for_dropdown}
+            with st.form("new_task_form", clear_on_submit=True):
+                selected_lead_display = st.selectbox("Lead auswählen:", options=lead_options.keys())
+                due_date_input = st.date_input("Fälligkeitsdatum:", min_value=date.today())
+                description_input = st.text_area("Notiz / Beschreibung:")
+                if st.form_submit_button("Aufgabe erstellen"):
+                    if not description_input: st.error("Bitte geben Sie eine Beschreibung ein.")
+                    else: add_task(lead_options[selected_lead_display], due_date_input, description_input); st.rerun()
+    st.markdown("---"); st.subheader("Offene Aufgaben für aktive Leads")
+    f1, f2, f3 = st.columns(3)
+    f1.selectbox("Kampagne", ["Alle Kampagnen"] + page_data['campaigns'], key="task_filter_campaign", on_change=reset_task_page)
+    f2.selectbox("Lead-Status", ["Alle Status"] + STATUS_OPTIONS, key="task_filter_status", on_change=reset_task_page)
+    f3.radio("Fälligkeit", list(TASK_BUCKETS), key="task_filter_bucket", horizontal=True, on_change=reset_task_page)
+    page_tasks, total_tasks = page_data['task_page']
+    if total_tasks == 0: st.success("🎉 Super! Keine offenen Aufgaben vorhanden.")
+    elif page_tasks.empty: handle_empty_page('task_page', total_tasks, TASK_PAGE_SIZE, "Auf dieser Seite sind keine offenen Aufgaben mehr vorhanden.", 'tasks')
+    else:
+        today = pd.Timestamp(date.today())
+        for task in page_tasks.to_dict(orient='records'):
+            lead_status = task['lead_status'] or EMPTY_STATUS_OPTION; is_urgent = task['due_date'] <= today
+            with st.expander(f"{'🔥' if is_urgent else '🗓️'} **Lead:** {task['lead_name']} - **Fällig:** {task['due_label']} - *{task['lead_campaign'] or 'Ohne Kampagne'}*", expanded=is_urgent):
+                col1, col2 = st.columns(2)
+                with col1:
+                    current_status_index = STATUS_OPTIONS.index(lead_status) if lead_status in STATUS_OPTIONS else 0
+                    new_status = st.selectbox("Lead-Status ändern:", options=STATUS_OPTIONS, index=current_status_index, key=f"status_{task['id']}")
+                    if new_status != lead_status:
+                        status_to_save = None if new_status == EMPTY_STATUS_OPTION else new_status
+                        update_lead_status(task['lead_id'], status_to_save)
+                        if new_status != "🟣 FollowUp": complete_task(task['id'], task['lead_id'])
+                        st.rerun()
+                with col2: new_desc = st.text_area("Beschreibung:", value=task['description'], key=f"desc_{task['id']}")
+                new_date = st.date_input("Fälligkeit:", value=task['due_date'].date(), key=f"date_{task['id']}")
+                st.write("")
+                b_col1, b_col2, b_col3 = st.columns(3)
+                if b_col1.button("✎ Details speichern", key=f"save_{task['id']}"): update_task(task['id'], new_date, new_desc, task['lead_id']); st.rerun()
+                if b_col2.button("✓ Erledigt", key=f"done_{task['id']}", type="primary"): complete_task(task['id'], task['lead_id']); st.rerun()
+                if b_col3.button("🗑️ Löschen", key=f"delete_task_main_{task['id']}"): delete_task(task['id'], task['lead_id']); st.rerun()
+        render_pager('task_page', total_tasks, TASK_PAGE_SIZE, label=f"Seite (von {page_count(total_tasks, TASK_PAGE_SIZE)}, {total_tasks} Aufgaben)")
+
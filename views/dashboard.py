@@ -0,0 +1,36 @@
+# -----------------------------------------------------------------------------
+# Seite "📊 Dashboard": Sales Funnel und Kampagnenvergleich
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+import plotly.graph_objects as go
+from crm_data import PRIMARY_COLOR, appointment_counts, load_campaign_summary, load_lead_aggregates
+
+def render():
+    st.info("Analysieren Sie Ihre Akquise-Performance. Nutzen Sie die Filter, um die Daten nach Ihren Wünschen einzugrenzen.")
+    today = date.today(); last_month = today - timedelta(days=30)
+    col1, col2 = st.columns(2); start_date = col1.date_input("Startdatum", last_month); end_date = col2.date_input("Enddatum", today)
+    include_archived = st.toggle("Archivierte Kampagnen einbeziehen")
+    agg_df = load_lead_aggregates(start_date, end_date, include_archived)
+    if agg_df.empty: st.warning("Keine Leads im ausgewählten Zeitraum gefunden.")
+    else:
+        all_campaigns_in_view = sorted(list(agg_df['campaign'].dropna().unique())); filter_options = ["Alle Kampagnen anzeigen"] + all_campaigns_in_view
+        selected_campaign = st.selectbox("Nach Kampagne filtern:", options=filter_options)
+        agg_filtered = agg_df if selected_campaign == "Alle Kampagnen anzeigen" else agg_df[agg_df['campaign'] == selected_campaign]
+        st.markdown("---"); total_leads = int(agg_filtered['lead_count'].sum()); st.metric("Gesamtzahl Leads in Auswahl", f"{total_leads}")
+        st.subheader("Sales Funnel")
+        funnel_order = ["🟢 Offen", "🔵 Erreicht", "🟣 FollowUp", "🟡 Termin vereinbart"]
+        status_counts = agg_filtered.groupby(agg_filtered['status'].fillna("🟢 Offen"))['lead_count'].sum()
+        funnel_values = [int(status_counts.get(status, 0)) for status in funnel_order]
+        fig = go.Figure(go.Funnel(y=funnel_order, x=funnel_values, textposition="inside", textinfo="value+percent initial", marker={"color": PRIMARY_COLOR}))
+        st.plotly_chart(fig, use_container_width=True)
+        if selected_campaign == "Alle Kampagnen anzeigen":
+            st.markdown("---"); st.subheader("Kampagnen-Performance im Vergleich"); st.caption("Gesamtbestand je Kampagne, unabhängig vom Zeitraum.")
+            campaign_summary = load_campaign_summary()
+            if not include_archived: campaign_summary = campaign_summary[campaign_summary['lead_count'] > campaign_summary['archived_count']]
+            termine = appointment_counts(campaign_summary)
+            campaign_performance = pd.DataFrame({'campaign': campaign_summary['campaign'], 'Anzahl_Leads': campaign_summary['lead_count'], 'Termine_vereinbart': termine, 'Letzte Aktivität': campaign_summary['last_activity'].dt.strftime('%d.%m.%Y')})
+            campaign_performance['Konversionsrate (%)'] = (campaign_performance['Termine_vereinbart'] / campaign_performance['Anzahl_Leads'].where(campaign_performance['Anzahl_Leads'] > 0) * 100).round(1)
+            st.dataframe(campaign_performance.sort_values(by="Konversionsrate (%)", ascending=False), hide_index=True, use_container_width=True)
+
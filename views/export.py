@@ -0,0 +1,30 @@
+# -----------------------------------------------------------------------------
+# Seite "📤 Export": Leads, Aufgaben und Notizen einer Kampagne, des Archivs oder des ganzen Kontos als CSV oder Parquet herunterladen
+# -----------------------------------------------------------------------------
+import streamlit as st
+import re
+from datetime import date
+from crm_data import EXPORT_BUSY_MESSAGE, build_export, export_slots_busy, get_user_id, load_campaign_summary
+from export import EXPORT_FORMATS
+
+EXPORT_SCOPES = {'campaign': "Eine Kampagne", 'archive': "Archiv (alle archivierten Leads)", 'account': "Gesamtes Konto"}
+
+def export_file_name(scope, fmt, campaign=None):
+    label = re.sub(r"[^\w-]+", "_", campaign).strip("_") if scope == 'campaign' else scope
+    return f"leadgen_export_{label}_{fmt}_{date.today():%Y-%m-%d}.zip"
+
+def render():
+    st.info("Der Export enthält je eine Datei für Leads, Aufgaben und Notizen (als ZIP). Die Datei wird erst beim Klick auf den Button erzeugt; große Exporte können einige Sekunden dauern.")
+    summary = load_campaign_summary()
+    if summary.empty: st.success("Noch keine Leads vorhanden – es gibt nichts zu exportieren."); return
+    scope = st.radio("Umfang", list(EXPORT_SCOPES), format_func=EXPORT_SCOPES.get, horizontal=True, key="export_scope"); campaign = None
+    if scope == 'campaign':
+        campaign = st.selectbox("Kampagne", summary['campaign'].tolist(), key="export_campaign"); lead_count = int(summary.loc[summary['campaign'] == campaign, 'lead_count'].sum())
+    else: lead_count = int(summary['archived_count' if scope == 'archive' else 'lead_count'].sum())
+    fmt = EXPORT_FORMATS[st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format", help="CSV mit Semikolon für Excel; Parquet für pandas, DuckDB, Power BI & Co.")]
+    st.caption(f"{lead_count:,} Leads inkl. zugehöriger Aufgaben und Notizen".replace(",", "."))
+    if not lead_count: st.warning("Für diese Auswahl gibt es keine Leads."); return
+    user_id = get_user_id(); busy = export_slots_busy()
+    if busy: st.warning(EXPORT_BUSY_MESSAGE); st.button("↻ Erneut prüfen", key="export_retry")
+    st.download_button("⬇️ Export erstellen und herunterladen", data=lambda: build_export(user_id, scope, fmt, campaign), file_name=export_file_name(scope, fmt, campaign),
+                       mime="application/zip", on_click="ignore", type="primary", use_container_width=True, disabled=busy)
@@ -0,0 +1,83 @@
+# -----------------------------------------------------------------------------
+# Seite "🧮 Kennzahl-Hypothese": Rechner für Leads, Neukunden und ROAS aus Budget und Abschlussquote,
+# optional als Szenario-Raster mit Heatmaps und Break-even-Kurven
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+import time
+import plotly.graph_objects as go
+from crm_data import PRIMARY_COLOR, appointment_counts, load_campaign_summary
+from scenarios import break_even_close_rate, nearest_index, profitable_share, scenario_axes, scenario_profit
+
+MANUAL_RATE_OPTION = "-- Manuell --"
+ALL_CAMPAIGNS_RATE_OPTION = "Alle Kampagnen (gesamt)"
+MAX_RATE_MARKERS = 6
+
+def campaign_close_rates():
+    # Anteil "Termin vereinbart" je Kampagne (in %) als Ausgangswert für die Abschlussquote
+    summary = load_campaign_summary()
+    summary = summary[summary['lead_count'] > 0]
+    if summary.empty: return pd.Series(dtype=float)
+    termine = appointment_counts(summary)
+    rates = pd.Series((termine / summary['lead_count'] * 100).values, index=summary['campaign'].values)
+    return pd.concat([pd.Series({ALL_CAMPAIGNS_RATE_OPTION: termine.sum() / summary['lead_count'].sum() * 100}), rates.sort_values(ascending=False)])
+
+def add_rate_markers(fig, rates):
+    # Gesamtquote plus die stärksten Kampagnen, damit die Beschriftungen lesbar bleiben
+    for campaign, rate in rates.head(MAX_RATE_MARKERS).items(): fig.add_hline(y=rate, line_dash="dot", line_color="white" if campaign != ALL_CAMPAIGNS_RATE_OPTION else PRIMARY_COLOR, annotation_text=f"{campaign}: {rate:.1f} %", annotation_position="top left")
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def scenario_grid(budget_range, cost_range, rate_range, profit_range, points):
+    # Raster nur neu rechnen, wenn sich Spannen oder Stützstellen ändern (nicht bei jeder Eingabe oben); cache_resource statt
+    # cache_data, damit das bis zu 20 MB große Array nicht bei jedem Treffer kopiert wird – daher schreibgeschützt
+    axes = scenario_axes(budget_range, cost_range, rate_range, profit_range, points); profit = scenario_profit(**axes)
+    share = profitable_share(profit); profit.flags.writeable = False; share.flags.writeable = False
+    return axes, profit, share
+
+def render():
+    st.markdown(f"""<style>.kennzahl-box{{background-color:{PRIMARY_COLOR};color:white;padding:2rem;border-radius:1rem;}}.kennzahl-box h2{{font-size:1.5rem;margin-top:1rem;}}</style>""", unsafe_allow_html=True)
+    rates = campaign_close_rates()
+    if 'kennzahl_abschlussquote' not in st.session_state: st.session_state.kennzahl_abschlussquote = 60
+    def apply_campaign_rate():
+        choice = st.session_state.kennzahl_quote_quelle
+        if choice != MANUAL_RATE_OPTION: st.session_state.kennzahl_abschlussquote = int(round(rates[choice]))
+    if not rates.empty:
+        st.selectbox("Abschlussquote aus Kampagnendaten übernehmen (Anteil \"Termin vereinbart\")", [MANUAL_RATE_OPTION] + list(rates.index), key="kennzahl_quote_quelle", on_change=apply_campaign_rate,
+                     format_func=lambda option: option if option == MANUAL_RATE_OPTION else f"{option} – {rates[option]:.1f} %")
+    c1, c2 = st.columns(2)
+    with c1: gewinn_pro_neukunde = st.number_input("Gewinn pro Neukunde in EUR", value=3000, min_value=0); werbebudget = st.number_input("Mtl. Werbebudget in EUR", value=3000, min_value=0)
+    with c2: kosten_pro_lead = st.number_input("Voraussichtliche Kosten pro Lead in EUR", value=100, min_value=1); abschlussquote = st.slider("Abschlussquote in %", 0, 100, step=1, key="kennzahl_abschlussquote")
+    anzahl_leads = werbebudget / kosten_pro_lead if kosten_pro_lead else 0; anzahl_neukunden = anzahl_leads * (abschlussquote / 100); potenzieller_verdienst = anzahl_neukunden * gewinn_pro_neukunde; roas = potenzieller_verdienst / werbebudget if werbebudget else 0; gewinn = potenzieller_verdienst - werbebudget
+    st.markdown(f"""<div class="kennzahl-box"><h2>Potenzielle Leads: <strong>{anzahl_leads:.0f}</strong></h2><h2>Potenzielle Neukunden: <strong>{anzahl_neukunden:.1f}</strong></h2><h2>Potenzieller Verdienst: <strong>{potenzieller_verdienst:,.0f} EUR</strong></h2><h2>ROAS: <strong>{roas:.1f}x</strong></h2><h2>Gewinn: <strong>{gewinn:,.0f} EUR</strong></h2></div>""", unsafe_allow_html=True)
+
+    st.markdown("---")
+    if not st.toggle("📈 Sensitivitätsanalyse (Szenario-Raster)", help="Berechnet alle Kombinationen der vier Eingaben innerhalb der gewählten Spannen auf einmal."): return
+    c1, c2 = st.columns(2)
+    budget_range = c1.slider("Werbebudget (EUR)", 0, 50000, (1000, 10000), step=500); cost_range = c2.slider("Kosten pro Lead (EUR)", 1, 1000, (20, 300), step=1)
+    rate_range = c1.slider("Abschlussquote (%)", 0, 100, (1, 60), step=1); profit_range = c2.slider("Gewinn pro Neukunde (EUR)", 0, 50000, (500, 6000), step=100)
+    points = st.slider("Stützstellen je Achse", 10, 40, 25, help="Anzahl Szenarien = Stützstellen hoch 4 (z.B. 25 → 390.625, 40 → 2,56 Mio.)")
+    started = time.perf_counter()
+    axes, profit, share = scenario_grid(budget_range, cost_range, rate_range, profit_range, points); elapsed_ms = (time.perf_counter() - started) * 1000
+    costs, rate_pct = axes['cost_per_lead'], axes['close_rate'] * 100
+    # Alle (Kosten, Quote)-Zellen umfassen gleich viele Szenarien: Gesamtanteil = Mittel der Anteile, ohne weiteres 4D-Array
+    m1, m2, m3 = st.columns(3); m1.metric("Szenarien", f"{profit.size:,}".replace(",", ".")); m2.metric("Davon profitabel", f"{share.mean() * 100:.1f} %"); m3.metric("Rechenzeit", f"{elapsed_ms:.0f} ms")
+    visible_rates = rates[(rates >= rate_range[0]) & (rates <= rate_range[1])] if not rates.empty else rates
+    tab_profit, tab_share, tab_break_even = st.tabs(["Gewinn-Heatmap", "Anteil profitabler Szenarien", "Break-even-Kurven"])
+    with tab_profit:
+        bi = nearest_index(axes['budget'], werbebudget); pi = nearest_index(axes['profit_per_customer'], gewinn_pro_neukunde)
+        st.caption(f"Gewinn in EUR bei Budget ≈ {axes['budget'][bi]:,.0f} EUR und Gewinn pro Neukunde ≈ {axes['profit_per_customer'][pi]:,.0f} EUR (nächste Stützstellen zu den Eingaben oben). Gestrichelt: Break-even.")
+        fig = go.Figure(go.Heatmap(z=profit[bi, :, :, pi].T, x=costs, y=rate_pct, colorscale="RdYlGn", zmid=0, colorbar={'title': "EUR"}, hovertemplate="Kosten/Lead %{x:.0f} EUR<br>Quote %{y:.1f} %<br>Gewinn %{z:,.0f} EUR<extra></extra>"))
+        fig.add_trace(go.Scatter(x=costs, y=break_even_close_rate(costs, [axes['profit_per_customer'][pi]])[0] * 100, mode="lines", line={'color': "black", 'dash': "dash"}, name="Break-even", showlegend=False))
+        add_rate_markers(fig, visible_rates); fig.update_layout(xaxis_title="Kosten pro Lead (EUR)", yaxis_title="Abschlussquote (%)", yaxis_range=[rate_pct[0], rate_pct[-1]], margin={'t': 30})
+        st.plotly_chart(fig, use_container_width=True)
+    with tab_share:
+        st.caption("Anteil der Kombinationen aus Budget und Gewinn pro Neukunde, die bei gegebener Quote und Kosten pro Lead Gewinn abwerfen.")
+        fig = go.Figure(go.Heatmap(z=share.T * 100, x=costs, y=rate_pct, colorscale="Oranges", zmin=0, zmax=100, colorbar={'title': "%"}, hovertemplate="Kosten/Lead %{x:.0f} EUR<br>Quote %{y:.1f} %<br>profitabel %{z:.0f} %<extra></extra>"))
+        add_rate_markers(fig, visible_rates); fig.update_layout(xaxis_title="Kosten pro Lead (EUR)", yaxis_title="Abschlussquote (%)", margin={'t': 30})
+        st.plotly_chart(fig, use_container_width=True)
+    with tab_break_even:
+        st.caption("Mindest-Abschlussquote, ab der sich das Budget lohnt. Sie hängt nur von Kosten pro Lead und Gewinn pro Neukunde ab – das Budget skaliert Gewinn und Verlust, verschiebt die Schwelle aber nicht.")
+        profits = axes['profit_per_customer'][::max(1, points // 5)]; curves = break_even_close_rate(costs, profits) * 100
+        fig = go.Figure([go.Scatter(x=costs, y=curve, mode="lines", name=f"{profit:,.0f} EUR/Kunde") for profit, curve in zip(profits, curves)])
+        add_rate_markers(fig, rates); fig.update_layout(xaxis_title="Kosten pro Lead (EUR)", yaxis_title="Break-even-Abschlussquote (%)", yaxis_range=[0, 100], legend_title="Gewinn pro Neukunde", margin={'t': 30})
+        st.plotly_chart(fig, use_container_width=True)
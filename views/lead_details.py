@@ -0,0 +1,82 @@
+# -----------------------------------------------------------------------------
+# Seite "👤 Lead-Details": Suche und Lead-Akte mit Aufgaben und Notizen
+# -----------------------------------------------------------------------------
+import streamlit as st
+from datetime import datetime, date
+from crm_data import DOSSIER_PREFETCH_NEIGHBOURS, EMPTY_STATUS_OPTION, add_note, add_task, delete_note, delete_task, get_all_leads_for_dropdown, load_lead_dossier, prefetch_lead_dossiers, search_leads
+
+def render():
+    st.info("Suchen Sie einen Lead oder wählen Sie ihn über die Kampagne aus, um seine vollständige Akte mit allen Details und Aktivitäten einzusehen.")
+    st.text_input("🔍 Suche (Name, Branche, Adresse, Telefon, E-Mail, Ansprechpartner, Notizen)", key="lead_search", placeholder="z.B. „steuerb berl“ oder „Müler“")
+    search_term = st.session_state.lead_search.strip(); lead_id = None; neighbour_ids = []
+    if search_term:
+        results = search_leads(search_term)
+        if results.empty: st.warning("Keine Treffer gefunden.")
+        else:
+            labels = {int(row.lead_id): f"{row.name} · {row.campaign or 'Ohne Kampagne'} · {row.status or EMPTY_STATUS_OPTION}" + (" · 🗄️ Archiv" if row.is_archived else "") + (f" — 📝 „{row.snippet}“" if row.match_source == 'note' else "")
+                      for row in results.itertuples(index=False)}
+            lead_id = st.radio(f"{len(labels)} Treffer", list(labels), format_func=labels.get, key="lead_search_choice")
+            position = list(labels).index(lead_id); neighbour_ids = list(labels)[position + 1:position + 1 + DOSSIER_PREFETCH_NEIGHBOURS]
+    else:
+        active_leads = get_all_leads_for_dropdown(archived=False)
+        if not active_leads:
+            st.warning("Keine aktiven Leads vorhanden.")
+        else:
+            leads_by_campaign = {}; lead_ids_by_campaign = {}
+            for lead in active_leads:
+                campaign = lead['campaign'] or "Ohne Kampagne"
+                if campaign not in leads_by_campaign: leads_by_campaign[campaign] = []; lead_ids_by_campaign[campaign] = []
+                leads_by_campaign[campaign].append(f"{lead['name']} (ID: {lead['id']})"); lead_ids_by_campaign[campaign].append(lead['id'])
+            selected_campaign = st.selectbox("1. Kampagne auswählen:", options=list(leads_by_campaign.keys()))
+            if selected_campaign:
+                lead_display_options = ["-- 2. Lead auswählen --"] + leads_by_campaign[selected_campaign]
+                selected_lead_display = st.selectbox("2. Lead auswählen:", options=lead_display_options)
+                if selected_lead_display != "-- 2. Lead auswählen --":
+                    lead_id = int(selected_lead_display.split("(ID: ")[1].replace(")", ""))
+                    campaign_lead_ids = lead_ids_by_campaign[selected_campaign]; position = campaign_lead_ids.index(lead_id)
+                    neighbour_ids = campaign_lead_ids[max(0, position - DOSSIER_PREFETCH_NEIGHBOURS):position] + campaign_lead_ids[position + 1:position + 1 + DOSSIER_PREFETCH_NEIGHBOURS]
+    if lead_id is not None:
+        lead_details = load_lead_dossier(lead_id)
+        # Nachbarn in der Anrufliste bzw. Trefferliste vorladen, damit das Durchklicken ohne Wartezeit geht
+        prefetch_lead_dossiers(neighbour_ids)
+        if lead_details:
+            st.markdown("---"); status = lead_details.get('status') or "-- Leer --"
+            st.subheader(f"Lead-Akte: {lead_details['name']}")
+            st.write(f"**Status:** {status} | **Kampagne:** {lead_details['campaign']}")
+            st.write(f"📞 {lead_details.get('phone') or 'N/A'} | 📧 {lead_details.get('email') or 'N/A'} | 🌐 [{lead_details.get('website') or 'Keine Webseite'}]({lead_details.get('website')})")
+            st.markdown("---")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("#### Stammdaten")
+                st.text(f"Branche: {lead_details.get('branche') or 'N/A'}"); st.text(f"Adresse: {lead_details.get('address') or 'N/A'}"); st.text(f"Ansprechpartner: {lead_details.get('contact_person') or 'N/A'}")
+            with col2:
+                st.write("#### Aktivitäten")
+                tab1, tab2 = st.tabs(["☑️ Offene Aufgaben", "📝 Notizen"])
+                with tab1:
+                    lead_tasks = lead_details.get('tasks') or []
+                    if not lead_tasks: st.info("Keine offenen Aufgaben für diesen Lead.")
+                    else:
+                        for task in lead_tasks:
+                            due_date_str = datetime.strptime(task['due_date'], '%Y-%m-%d').strftime('%d.%m.%Y')
+                            c1, c2 = st.columns([4, 1])
+                            c1.markdown(f"**Fällig am {due_date_str}:** {task['description']}")
+                            if c2.button("🗑️", key=f"delete_task_details_{task['id']}", help="Aufgabe endgültig löschen"):
+                                delete_task(task['id'], lead_id); st.rerun()
+                    with st.form(f"task_form_{lead_id}", clear_on_submit=True):
+                        st.write("**Neue Aufgabe erstellen**"); desc = st.text_input("Beschreibung"); due = st.date_input("Fälligkeitsdatum", min_value=date.today())
+                        if st.form_submit_button("Aufgabe speichern"):
+                            add_task(lead_id, due, desc); st.rerun()
+                with tab2:
+                    lead_notes = lead_details.get('notes') or []
+                    if not lead_notes: st.info("Keine Notizen für diesen Lead.")
+                    else:
+                        for note in lead_notes:
+                            note_date = datetime.fromisoformat(note['created_at']).strftime('%d.%m.%Y, %H:%M')
+                            c1,c2 = st.columns([4,1]); c1.markdown(f"**{note_date}**"); c1.text(note['content'])
+                            if c2.button("🗑️", key=f"delete_note_{note['id']}", help="Notiz löschen"):
+                                delete_note(note['id'], lead_id); st.rerun()
+                    with st.form(f"note_form_{lead_id}", clear_on_submit=True):
+                        st.write("**Neue Notiz erstellen**"); content = st.text_area("Inhalt")
+                        if st.form_submit_button("Notiz speichern"):
+                            add_note(lead_id, content); st.rerun()
+
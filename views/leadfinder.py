@@ -0,0 +1,127 @@
+# -----------------------------------------------------------------------------
+# Seite "🔎 LeadFinder": GelbeSeiten-Suche, CSV-Import, Dubletten und Website-Anreicherung
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+from dedup import DEDUP_MODES
+from gelbeseiten import BATCH_MAX_WORKERS, build_batch_jobs, build_campaign_name, run_batch_search
+from crm_data import ENRICH_POLL_SECONDS, format_dedup_stats, get_dedup_index, get_enrichment_job, get_unique_campaigns, get_user_id, import_leads_csv, load_campaign_lead_keys, load_duplicate_clusters, resolve_duplicate_clusters, resolve_import_path, save_leads_to_supabase, scrape_gelbeseiten, start_enrichment_job, stream_leads_to_supabase
+
+def render():
+    st.subheader("1. Leads über GelbeSeiten.de finden");
+    st.radio("Umgang mit Dubletten (gleiche Telefonnummer, Domain oder Name + PLZ)", list(DEDUP_MODES), format_func=DEDUP_MODES.get, key="dedup_mode", horizontal=True)
+    search_mode = st.radio("Suchmodus", ["Einzelsuche", "Batch-Suche (mehrere Branchen × Orte)"], horizontal=True, label_visibility="collapsed")
+    if search_mode == "Einzelsuche":
+        with st.form("search_form"):
+            branche = st.text_input("Branche", "Steuerberater"); ort = st.text_input("Ort oder PLZ", "Berlin"); max_results = st.slider("Maximale Anzahl Leads", 10, 200, 20, step=10)
+            resume_search = st.checkbox("Unterbrochene Suche fortsetzen", help="Bereits in dieser Kampagne gespeicherte Leads werden übersprungen und zählen zur maximalen Anzahl.")
+            submit_button = st.form_submit_button("🚀 Leads suchen")
+        if submit_button:
+            existing_keys = load_campaign_lead_keys(build_campaign_name(branche, ort)) if resume_search else set(); remaining = max_results - len(existing_keys)
+            if existing_keys: st.info(f"{len(existing_keys)} Leads dieser Suche sind bereits gespeichert.")
+            if remaining <= 0: st.success("Diese Suche ist bereits vollständig gespeichert.")
+            else:
+                counter = st.empty(); progress = {'found': 0, 'saved': 0}; dedup_stats = {}
+                def show_progress(found_now, saved_now):
+                    progress.update(found=found_now, saved=saved_now)
+                    with counter.container(): c1, c2 = st.columns(2); c1.metric("Gefunden", found_now); c2.metric("Gespeichert", saved_now)
+                try:
+                    with st.spinner(f"Suche nach '{branche}' in '{ort}'..."): stream_leads_to_supabase(scrape_gelbeseiten(branche, ort, remaining, existing_keys), on_progress=show_progress, stats=dedup_stats)
+                except Exception as e: st.error(f"Suche abgebrochen: {e}. {progress['saved']} Leads sind gespeichert – mit \"Unterbrochene Suche fortsetzen\" geht es weiter.")
+                if progress['saved']: st.success(f"{progress['saved']} Leads erfolgreich gespeichert.{format_dedup_stats(dedup_stats)}"); st.balloons()
+                elif not progress['found']: st.warning("⚠️ Keine Leads für diese Suche gefunden.")
+                elif dedup_stats: st.info(f"Keine neuen Leads gespeichert.{format_dedup_stats(dedup_stats)}")
+    else:
+        with st.form("batch_search_form"):
+            c1, c2 = st.columns(2)
+            branchen_input = c1.text_area("Branchen (eine pro Zeile)", "Steuerberater\nRechtsanwalt"); orte_input = c2.text_area("Orte oder PLZ (einer pro Zeile)", "Berlin\nHamburg")
+            max_results = st.slider("Maximale Anzahl Leads pro Suche", 10, 200, 20, step=10); max_workers = st.slider("Parallele Suchen", 1, 8, BATCH_MAX_WORKERS)
+            batch_submit = st.form_submit_button("🚀 Batch-Suche starten")
+        if batch_submit:
+            user_id = get_user_id(); branchen = [b.strip() for b in branchen_input.splitlines() if b.strip()]; orte = [o.strip() for o in orte_input.splitlines() if o.strip()]
+            jobs = build_batch_jobs(branchen, orte)
+            if not user_id: st.error("Nicht eingeloggt.")
+            elif not jobs: st.error("Bitte mindestens eine Branche und einen Ort angeben.")
+            else:
+                job_status = pd.DataFrame({'Branche': [q for q, _ in jobs], 'Ort': [l for _, l in jobs], 'Status': "⏳ Wartend", 'Leads': 0}, index=pd.MultiIndex.from_tuples(jobs))
+                progress_bar = st.progress(0.0, text=f"0 von {len(jobs)} Suchen abgeschlossen"); status_table = st.empty(); status_table.dataframe(job_status, hide_index=True, use_container_width=True)
+                total_saved = 0; dedup_stats = {}; dedup = get_dedup_index()
+                for done, (job, leads, error) in enumerate(run_batch_search(jobs, max_results, user_id, max_workers), start=1):
+                    if error is not None: job_status.loc[job, 'Status'] = f"❌ Fehler: {error}"
+                    elif not leads: job_status.loc[job, 'Status'] = "⚠️ Keine Treffer"
+                    else: saved = save_leads_to_supabase(leads, notify=False, stats=dedup_stats, dedup=dedup); total_saved += saved; job_status.loc[job, ['Status', 'Leads']] = ["✅ Gespeichert", saved]
+                    progress_bar.progress(done / len(jobs), text=f"{done} von {len(jobs)} Suchen abgeschlossen"); status_table.dataframe(job_status, hide_index=True, use_container_width=True)
+                st.success(f"Batch abgeschlossen: {total_saved} Leads in {int((job_status['Leads'] > 0).sum())} Kampagnen gespeichert.{format_dedup_stats(dedup_stats)}")
+                if total_saved: st.balloons()
+    st.markdown("---"); st.subheader("2. Leads aus CSV-Datei importieren")
+    uploaded_file = st.file_uploader("CSV-Datei hochladen", type=["csv"])
+    if uploaded_file is not None:
+        try:
+            df_preview = pd.read_csv(uploaded_file, nrows=5, dtype=str); st.dataframe(df_preview)
+            EMPTY_MAPPING_OPTION = "-- Nicht zuordnen --"
+            db_fields = {"name": "Name", "branche": "Branche", "address": "Adresse", "phone": "Telefon", "email": "E-Mail", "website": "Webseite", "contact_person": "Ansprechpartner"}
+            APIFY_DEFAULT_MAPPING = {"name": "title", "branche": "categoryName", "address": "address", "phone": "phone", "email": "emails/0", "website": "domain", "contact_person": None}
+            nested_paths = [path for path in APIFY_DEFAULT_MAPPING.values() if path and path not in df_preview.columns and resolve_import_path(df_preview.columns, path)]
+            uploaded_cols = [EMPTY_MAPPING_OPTION] + list(df_preview.columns) + nested_paths
+            st.markdown("---"); campaign_name_input = st.text_input("Wie soll diese Import-Gruppe heißen? (z.B. 'Apify Steuerberater Berlin')", placeholder="Pflichtfeld")
+            st.warning("Ordnen Sie die Spalten Ihrer Datei zu. Die Felder wurden basierend auf typischen Apify-Namen vorausgewählt.")
+            mapping = {}; col1, col2 = st.columns(2); field_items = list(db_fields.items())
+            for i, (field_key, field_label) in enumerate(field_items):
+                target_col = col1 if i < (len(field_items) + 1) / 2 else col2
+                with target_col:
+                    default_col_name = APIFY_DEFAULT_MAPPING.get(field_key); default_index = 0
+                    if default_col_name and default_col_name in uploaded_cols: default_index = uploaded_cols.index(default_col_name)
+                    mapping[field_key] = st.selectbox(f'"{field_label}" ist Spalte:', options=uploaded_cols, key=f"map_{field_key}", index=default_index)
+            if st.button("✅ Zuordnung bestätigen & Leads importieren", type="primary"):
+                if not campaign_name_input: st.error("Bitte geben Sie einen Namen für die Kampagne an!")
+                elif mapping['name'] == EMPTY_MAPPING_OPTION: st.error("Bitte ordnen Sie mindestens das Feld 'Name' zu!")
+                else:
+                    import_progress = st.progress(0.0, text="Starte Import..."); progress = {'rows': 0, 'saved': 0}; dedup_stats = {}
+                    def show_import_progress(rows_read, saved, bytes_read, elapsed):
+                        progress.update(rows=rows_read, saved=saved)
+                        import_progress.progress(min(1.0, bytes_read / max(uploaded_file.size, 1)), text=f"{rows_read} Zeilen gelesen, {saved} Leads gespeichert · {rows_read / max(elapsed, 1e-6):,.0f} Zeilen/s")
+                    try:
+                        rows_read, saved = import_leads_csv(uploaded_file, {field: None if col == EMPTY_MAPPING_OPTION else col for field, col in mapping.items()}, campaign_name_input, on_progress=show_import_progress, stats=dedup_stats)
+                        import_progress.progress(1.0, text=f"Fertig: {rows_read} Zeilen gelesen, {saved} Leads gespeichert."); st.success(f"{saved} Leads erfolgreich importiert.{format_dedup_stats(dedup_stats)}"); st.balloons()
+                    except Exception as e: st.error(f"Import abgebrochen: {e}. Bis dahin wurden {progress['saved']} Leads gespeichert.")
+        except Exception as e: st.error(f"Fehler beim Lesen der CSV: {e}")
+    st.markdown("---"); st.subheader("3. Dubletten im Bestand finden")
+    if st.button("🔍 Bestand auf Dubletten prüfen"): st.session_state.duplicate_clusters = load_duplicate_clusters(); st.session_state.confirm_delete_duplicates = False
+    clusters = st.session_state.get('duplicate_clusters')
+    if clusters is not None:
+        if clusters.empty: st.success("Keine Dubletten gefunden.")
+        else:
+            st.warning(f"{clusters['cluster_id'].nunique()} Dubletten-Gruppen mit {len(clusters) - clusters['cluster_id'].nunique()} überzähligen Leads gefunden. Der älteste Lead jeder Gruppe bleibt erhalten.")
+            st.dataframe(clusters[['cluster_id', 'id', 'name', 'address', 'phone', 'website', 'campaign', 'created_at']].rename(columns={'cluster_id': 'Gruppe'}), hide_index=True, use_container_width=True)
+            c1, c2 = st.columns(2)
+            if c1.button("🏷️ Dubletten markieren", use_container_width=True): marked = resolve_duplicate_clusters(clusters, 'tag'); st.session_state.duplicate_clusters = None; st.success(f"{marked} Leads als Dublette markiert.")
+            if c2.button("🗑️ Dubletten löschen", type="primary", use_container_width=True): st.session_state.confirm_delete_duplicates = True; st.rerun()
+            if st.session_state.get('confirm_delete_duplicates'):
+                st.warning(f"**Sicher, dass Sie {len(clusters) - clusters['cluster_id'].nunique()} Dubletten samt zugehöriger Aufgaben und Notizen endgültig löschen möchten?** Das kann nicht rückgängig gemacht werden.")
+                c1, c2, c3 = st.columns([1,1,2])
+                if c1.button("Ja, endgültig löschen", type="primary", key="confirm_delete_duplicates_yes"):
+                    with st.spinner("Lösche Dubletten..."): deleted = resolve_duplicate_clusters(clusters, 'delete')
+                    st.session_state.confirm_delete_duplicates = False; st.session_state.duplicate_clusters = None; st.success(f"{deleted} Dubletten gelöscht.")
+                if c2.button("Abbrechen", key="cancel_delete_duplicates"): st.session_state.confirm_delete_duplicates = False; st.rerun()
+    st.markdown("---"); st.subheader("4. Kontaktdaten über Webseiten ergänzen")
+    enrich_campaigns = get_unique_campaigns()
+    if not enrich_campaigns: st.info("Keine aktiven Kampagnen vorhanden.")
+    else:
+        enrich_campaign = st.selectbox("Kampagne", enrich_campaigns, key="enrich_campaign")
+        job = get_enrichment_job(enrich_campaign); c1, c2 = st.columns(2)
+        if c1.button("🌐 E-Mails & Geschäftsführer suchen", disabled=bool(job and job.running), use_container_width=True): start_enrichment_job(enrich_campaign); st.rerun()
+        if job and job.running and c2.button("⏹️ Abbrechen", use_container_width=True): job.cancel()
+        st.session_state.enrichment_polling = bool(job and job.running)
+        @st.fragment(run_every=ENRICH_POLL_SECONDS if job and job.running else None)
+        def show_enrichment_status():
+            job = get_enrichment_job(enrich_campaign)
+            if job is None: st.caption("Besucht die Webseiten der Leads samt Impressum/Kontakt im Hintergrund und füllt leere Felder für E-Mail und Ansprechpartner. Die Seite kann währenddessen verlassen werden."); return
+            if job.total: st.progress(min(1.0, job.done / job.total), text=f"{job.done} von {job.total} Webseiten geprüft")
+            c1, c2, c3, c4 = st.columns(4); c1.metric("E-Mails gefunden", job.emails); c2.metric("Ansprechpartner gefunden", job.contacts); c3.metric("Leads aktualisiert", job.updated); c4.metric("Nicht erreichbar", job.failed)
+            if job.running: st.caption("⏳ Läuft im Hintergrund ...")
+            elif job.error: st.error(f"Anreicherung abgebrochen: {job.error}")
+            elif job.cancelled: st.warning(f"Abgebrochen nach {job.done} von {job.total} Webseiten.")
+            elif not job.total: st.info("Alle Leads dieser Kampagne mit Webseite haben bereits E-Mail und Ansprechpartner.")
+            else: st.success(f"Fertig in {job.finished - job.started:.0f} s: {job.updated} Leads ergänzt.")
+            if not job.running and st.session_state.get('enrichment_polling'): st.session_state.enrichment_polling = False; st.rerun()
+        show_enrichment_status()
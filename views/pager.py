@@ -0,0 +1,32 @@
+# -----------------------------------------------------------------------------
+# Blättern für serverseitig seitenweise geladene Listen (Aufgaben, TagesGeschäft): Seitenzustand, leere Seiten, Navigation.
+# Der Seitenindex (0-basiert) liegt unter st.session_state[name], Widgets verwenden name als Schlüssel-Präfix
+# -----------------------------------------------------------------------------
+import streamlit as st
+from crm_data import invalidate_cache
+
+def current_page(name):
+    return st.session_state.setdefault(name, 0)
+
+def reset_page(name): st.session_state[name] = 0
+
+def page_count(total, page_size): return max(1, -(-total // page_size))
+
+def handle_empty_page(name, total, page_size, message, entity):
+    # Seite liegt hinter dem Ende (z. B. nach Erledigen oder Löschen): einmal auf die letzte Seite springen; ist auch die leer
+    # (Gesamtzahl aus dem Cache veraltet), nicht erneut laden, sondern Hinweis und Neu-laden-Knopf zeigen
+    last_page = page_count(total, page_size) - 1
+    if st.session_state[name] != last_page: st.session_state[name] = last_page; st.rerun()
+    def reload(): invalidate_cache(entity); reset_page(name)
+    st.info(message); st.button("↻ Neu laden", key=f"{name}_reload", on_click=reload)
+
+def render_pager(name, total, page_size, label=None):
+    # Buttons sind per Tab/Enter erreichbar, das Seitenfeld reagiert auf Pfeiltasten
+    count = page_count(total, page_size); page = st.session_state[name]
+    def set_page(new_page): st.session_state[name] = min(max(0, new_page), count - 1)
+    def jump_to_page(): set_page(st.session_state[f"{name}_input"] - 1)
+    nav1, nav2, nav3 = st.columns([1, 2, 1])
+    nav1.button("◀ Zurück", on_click=set_page, args=(page - 1,), disabled=page == 0, use_container_width=True, key=f"{name}_prev")
+    st.session_state[f"{name}_input"] = page + 1
+    nav2.number_input(label or f"Seite (von {count})", min_value=1, max_value=count, key=f"{name}_input", on_change=jump_to_page)
+    nav3.button("Weiter ▶", on_click=set_page, args=(page + 1,), disabled=page >= count - 1, use_container_width=True, key=f"{name}_next")
@@ -0,0 +1,29 @@
+# -----------------------------------------------------------------------------
+# Seite "🏠 Startseite": Kennzahlen der aktiven Kampagnen, dringendste Aufgaben und Schnellzugriff
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+from datetime import date
+from crm_data import load_lead_aggregates, load_open_tasks, page_query, run_page_queries, tasks_to_df
+from views import go_to_page
+
+def render():
+    st.subheader("Ihre Top-Kennzahlen (aktive Kampagnen)")
+    page_data = run_page_queries(aggregates=page_query(load_lead_aggregates, default=pd.DataFrame()), urgent_tasks=page_query(load_open_tasks, due_until=date.today(), limit=5, default=tasks_to_df([])))
+    agg_df = page_data['aggregates']
+    if agg_df.empty: st.info("Keine aktiven Leads vorhanden. Zeit, neue zu generieren!")
+    else:
+        total_leads = int(agg_df['lead_count'].sum()); leads_open = int(agg_df.loc[agg_df['status'].isna() | agg_df['status'].str.contains("Offen", na=False), 'lead_count'].sum())
+        leads_followup = int(agg_df.loc[agg_df['status'] == "🟣 FollowUp", 'lead_count'].sum()); leads_converted = int(agg_df.loc[agg_df['status'] == "🟡 Termin vereinbart", 'lead_count'].sum())
+        col1, col2, col3, col4 = st.columns(4); col1.metric("Aktive Leads", total_leads); col2.metric("🟢 Offen", leads_open); col3.metric("🟣 FollowUp", leads_followup); col4.metric("🟡 Termin vereinbart", leads_converted)
+    st.markdown("---"); st.subheader("🔥 Ihre dringendsten Aufgaben")
+    urgent_tasks = page_data['urgent_tasks']
+    if urgent_tasks.empty: st.success("Super! Keine dringenden Aufgaben für heute.")
+    else:
+        for task in urgent_tasks.itertuples(index=False):
+            st.warning(f"**Lead:** {task.lead_name or 'Unbekannter Lead'} - **Fällig:** {task.due_label}\n\n*Notiz: {task.description}*")
+        st.button("Alle Aufgaben anzeigen", on_click=go_to_page, args=("☑️ Aufgaben",), type="primary")
+    st.markdown("---"); st.subheader("Schnellzugriff")
+    col1, col2 = st.columns(2)
+    col1.button("➕ Neue Aufgabe erstellen", on_click=go_to_page, args=("☑️ Aufgaben",), use_container_width=True)
+    col2.button("📥 Leads importieren", on_click=go_to_page, args=("🔎 LeadFinder",), use_container_width=True)
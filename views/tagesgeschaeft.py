@@ -0,0 +1,150 @@
+# -----------------------------------------------------------------------------
+# Seite "📅 TagesGeschäft": Lead-Tabelle einer Kampagne bearbeiten, Massenaktionen, Kampagne archivieren/löschen
+# -----------------------------------------------------------------------------
+import streamlit as st
+import pandas as pd
+import time
+from datetime import datetime, date, timedelta
+from crm_data import EMPTY_STATUS_OPTION, LEAD_COLUMNS, LEAD_PAGE_SIZE, STATUS_OPTIONS, add_note, add_tasks_bulk, apply_lead_changeset, archive_campaign, bulk_update_filtered_leads, bulk_update_lead_status, compute_lead_changeset, delete_campaign, delete_note, get_unique_campaigns, load_lead_page, load_notes, page_query, run_page_queries
+from views.pager import current_page, handle_empty_page, page_count, render_pager, reset_page
+
+def render():
+    if 'confirm_delete_campaign' not in st.session_state: st.session_state.confirm_delete_campaign = False
+    if 'confirm_archive_campaign' not in st.session_state: st.session_state.confirm_archive_campaign = False
+    current_page('lead_page')
+    def reset_lead_page(): reset_page('lead_page')
+    ALL_CAMPAIGNS_OPTION = "Alle Kampagnen anzeigen"; ALL_STATUS_OPTION = "Alle Status"
+    selected_campaign = st.session_state.get('campaign_selector', ALL_CAMPAIGNS_OPTION)
+    lead_filters = {'campaign': None if selected_campaign == ALL_CAMPAIGNS_OPTION else selected_campaign, 'status': None if st.session_state.get('lead_filter_status', ALL_STATUS_OPTION) == ALL_STATUS_OPTION else st.session_state.lead_filter_status,
+                    'branche': st.session_state.get('lead_filter_branche', ''), 'search': st.session_state.get('lead_filter_search', '')}
+    page_data = run_page_queries(campaigns=page_query(get_unique_campaigns, archived=False, default=[]), lead_page=page_query(load_lead_page, st.session_state.lead_page, **lead_filters, default=(pd.DataFrame(columns=LEAD_COLUMNS), 0)))
+    all_campaigns = page_data['campaigns']; leads_df_original, total_leads = page_data['lead_page']
+    if all_campaigns:
+        if selected_campaign not in all_campaigns: st.session_state.campaign_selector = selected_campaign = ALL_CAMPAIGNS_OPTION
+        f1, f2, f3, f4 = st.columns([2, 1, 1, 2])
+        f1.selectbox("Aktive Kampagne anzeigen:", options=[ALL_CAMPAIGNS_OPTION] + all_campaigns, key="campaign_selector", on_change=reset_lead_page)
+        f2.selectbox("Status", [ALL_STATUS_OPTION] + STATUS_OPTIONS, key="lead_filter_status", on_change=reset_lead_page)
+        f3.text_input("Branche", key="lead_filter_branche", on_change=reset_lead_page)
+        f4.text_input("🔍 Suche (Name, Adresse, Telefon, E-Mail, Ansprechpartner)", key="lead_filter_search", on_change=reset_lead_page)
+    else: st.info("Noch keine aktiven Kampagnen vorhanden."); leads_df_original = pd.DataFrame()
+    if all_campaigns and total_leads and leads_df_original.empty: handle_empty_page('lead_page', total_leads, LEAD_PAGE_SIZE, "Auf dieser Seite sind keine Leads mehr vorhanden.", 'leads')
+    elif all_campaigns and not total_leads: st.info("Keine Leads für diese Filter gefunden.")
+    if not leads_df_original.empty:
+        # Vorher-Stand nur für die sichtbare Seite; bei Seiten- oder Filterwechsel wird er ersetzt
+        page_key = "|".join(map(str, [st.session_state.lead_page] + list(lead_filters.values())))
+        if st.session_state.get('df_before_edit_key') != page_key or 'df_before_edit' not in st.session_state or not st.session_state.df_before_edit.equals(leads_df_original):
+            st.session_state.df_before_edit = leads_df_original; st.session_state.df_before_edit_key = page_key
+
+        # Auswahl für Sammelaktionen gilt seitenübergreifend: Häkchen kommen aus der gemerkten ID-Menge
+        selection = st.session_state.setdefault('selected_lead_ids', set())
+        df_for_display = leads_df_original.assign(Notizen_Aktion=False, Auswahl=leads_df_original['id'].isin(selection), status=leads_df_original['status'].fillna(EMPTY_STATUS_OPTION))
+        first_row = st.session_state.lead_page * LEAD_PAGE_SIZE + 1
+        st.info(f"{total_leads} Leads in der Ansicht (zeige {first_row}–{first_row + len(leads_df_original) - 1}).")
+        status_options = STATUS_OPTIONS
+
+        edited_df = st.data_editor(df_for_display.drop(columns=['is_archived', 'user_id']),
+            column_config={
+                "Notizen_Aktion": st.column_config.CheckboxColumn("📝 Notizen", help="Häkchen setzen, um Notizen zu verwalten."),
+                "Auswahl": st.column_config.CheckboxColumn("☑️ Auswahl", help="Für Sammelaktionen auswählen."),
+                "id": st.column_config.NumberColumn("ID", disabled=True), "name": st.column_config.TextColumn("Name", required=True), 
+                "website": st.column_config.LinkColumn("Webseite", validate="^https?://"), 
+                "status": st.column_config.SelectboxColumn("Status", help="Der aktuelle Status des Leads", width="medium", options=status_options, required=True), 
+                "campaign": st.column_config.TextColumn("Kampagne"),
+            }, hide_index=True, key=f"data_editor_{page_key}",
+            column_order=["Auswahl", "Notizen_Aktion", "name", "status", "campaign", "branche", "address", "phone", "email", "website", "contact_person"])
+
+        # Ungespeicherte Änderungen gelten nur für die sichtbare Seite und gehen beim Blättern verloren
+        if page_count(total_leads, LEAD_PAGE_SIZE) > 1: render_pager('lead_page', total_leads, LEAD_PAGE_SIZE)
+
+        selected_rows = edited_df[edited_df.Notizen_Aktion]
+        if not selected_rows.empty:
+            lead_data = selected_rows.iloc[0].to_dict()
+            st.session_state.current_lead_for_notes = lead_data
+            st.session_state.show_notes_dialog = True
+            st.rerun()
+
+        if st.session_state.get("show_notes_dialog"):
+            @st.dialog(f"Notizen für: {st.session_state.current_lead_for_notes['name']}")
+            def notes_dialog():
+                lead_id = st.session_state.current_lead_for_notes['id']
+                st.write("### Bisherige Notizen")
+                notes = load_notes(lead_id)
+                if not notes: st.info("Noch keine Notizen vorhanden.")
+                else:
+                    for note in notes:
+                        col1, col2 = st.columns([4, 1])
+                        with col1: st.markdown(f"**{datetime.fromisoformat(note['created_at']).strftime('%d.%m.%Y, %H:%M')}**"); st.text(note['content'])
+                        with col2:
+                            if st.button("🗑️", key=f"delete_note_{note['id']}", help="Notiz löschen"):
+                                delete_note(note['id'], lead_id); st.rerun()
+                        st.markdown("---")
+                new_note = st.text_area("Neue Notiz hinzufügen:")
+                if st.button("Notiz speichern", type="primary"):
+                    if new_note: add_note(lead_id, new_note); st.rerun()
+            notes_dialog()
+
+        st.markdown("---")
+        save_col, _, action_col = st.columns([2, 2, 1])
+        with save_col:
+            if st.button("💾 Änderungen an Leads speichern", use_container_width=True):
+                df_to_save_final = edited_df.drop(columns=['Notizen_Aktion', 'Auswahl'])
+                with st.spinner("Speichere Änderungen..."):
+                    df_before = st.session_state.df_before_edit; df_before_filled = df_before.fillna({'status': ''}); edited_df_filled = df_to_save_final.fillna({'status': ''})
+                    merged_df = pd.merge(df_before_filled, edited_df_filled, on='id', suffixes=('_before', '_after'), how='outer')
+                    followup_leads = merged_df[(merged_df['status_before'] != "🟣 FollowUp") & (merged_df['status_after'] == "🟣 FollowUp")]
+                    df_to_save = df_to_save_final.copy(); df_to_save['status'] = df_to_save['status'].mask(df_to_save['status'] == EMPTY_STATUS_OPTION)
+                    save_started = time.perf_counter(); changeset = compute_lead_changeset(df_before, df_to_save)
+                    try: counts = apply_lead_changeset(changeset)
+                    except Exception as e: st.error(f"Fehler beim Speichern der Änderungen: {e}"); counts = None
+                    if counts is not None:
+                        # Follow-Up-Aufgaben erst nach erfolgreichem Speichern, sonst hingen sie an Leads, deren Status nie gespeichert wurde
+                        tasks_created = add_tasks_bulk(followup_leads['id'].dropna().astype(int).tolist(), date.today() + timedelta(days=7), "Follow-Up", notify=False)
+                        if tasks_created > 0: st.toast(f"{tasks_created} neue Follow-Up Aufgabe(n) automatisch erstellt!", icon="✅")
+                        touched = sum(counts.values()); duration = time.perf_counter() - save_started
+                        if touched: st.toast(f"{touched} Leads gespeichert ({counts['inserted']} neu, {counts['modified']} geändert, {counts['deleted']} gelöscht) in {duration:.2f}s.", icon="💾")
+                        else: st.toast("Keine Änderungen zum Speichern gefunden.", icon="ℹ️")
+                        del st.session_state.df_before_edit; st.rerun()
+
+        selection.difference_update(edited_df['id'].dropna().astype(int)); selection.update(edited_df.loc[edited_df['Auswahl'], 'id'].dropna().astype(int))
+        selected_lead_ids = sorted(selection); bulk_targets = {'selected': f"Ausgewählte Leads ({len(selected_lead_ids)}, seitenübergreifend)", 'filtered': f"Alle {total_leads} Leads der aktuellen Filter"}
+        with st.expander(f"⚡ Sammelaktion ({len(selected_lead_ids)} ausgewählt)", expanded=bool(selected_lead_ids)):
+            bulk_target = st.radio("Anwenden auf", list(bulk_targets), format_func=bulk_targets.get, horizontal=True, key="bulk_target")
+            b1, b2, b3 = st.columns([2, 1, 1])
+            bulk_status = b1.selectbox("Neuer Status", status_options, index=status_options.index("🔴 Nicht erreicht"), key="bulk_status")
+            bulk_retry_days = b2.number_input("Wiedervorlage in Tagen (0 = keine)", min_value=0, max_value=365, value=3, key="bulk_retry_days")
+            b3.write(""); b3.write("")
+            if b3.button("Anwenden", type="primary", disabled=bulk_target == 'selected' and not selected_lead_ids, use_container_width=True, key="bulk_apply"):
+                new_status = None if bulk_status == EMPTY_STATUS_OPTION else bulk_status
+                with st.spinner(f"Aktualisiere {len(selected_lead_ids) if bulk_target == 'selected' else total_leads} Leads..."):
+                    if bulk_target == 'filtered': bulk_update_filtered_leads(lead_filters, new_status, retry_in_days=bulk_retry_days or None)
+                    else: bulk_update_lead_status(selected_lead_ids, new_status, retry_in_days=bulk_retry_days or None)
+                # Auswahl und die Häkchen im Editor zurücksetzen
+                selection.clear(); st.session_state.pop(f"data_editor_{page_key}", None); del st.session_state.df_before_edit; st.rerun()
+            if selected_lead_ids and st.button("Auswahl aufheben", key="bulk_clear_selection"):
+                selection.clear(); st.session_state.pop(f"data_editor_{page_key}", None); st.rerun()
+
+        if selected_campaign != "Alle Kampagnen anzeigen":
+            with action_col:
+                action_cols = st.columns(2)
+                with action_cols[0]:
+                    if st.button("🗄️ Archivieren", help="Diese Kampagne ins Archiv verschieben", use_container_width=True):
+                        st.session_state.confirm_archive_campaign = True; st.rerun()
+                with action_cols[1]:
+                    if st.button("🗑️ Löschen", help="Diese Kampagne endgültig löschen", use_container_width=True):
+                        st.session_state.confirm_delete_campaign = True; st.rerun()
+            if st.session_state.get('confirm_archive_campaign'):
+                st.warning(f"**Sicher, dass Sie die Kampagne '{selected_campaign}' archivieren möchten?**")
+                c1, c2, c3 = st.columns([1,1,2])
+                if c1.button("Ja, archivieren", type="primary"):
+                    archive_campaign(selected_campaign); st.session_state.confirm_archive_campaign = False; st.rerun()
+                if c2.button("Abbrechen"):
+                    st.session_state.confirm_archive_campaign = False; st.rerun()
+            if st.session_state.get('confirm_delete_campaign'):
+                st.warning(f"**Sicher, dass Sie die gesamte Kampagne '{selected_campaign}' und alle zugehörigen Aufgaben löschen möchten?**")
+                c1, c2, c3 = st.columns([1,1,2])
+                if c1.button("Ja, wirklich löschen", type="primary"):
+                    with st.spinner(f"Lösche Kampagne '{selected_campaign}'..."):
+                        delete_campaign(selected_campaign)
+                        st.session_state.confirm_delete_campaign = False; st.rerun()
+                if c2.button("Abbrechen"):
+                    st.session_state.confirm_delete_campaign = False; st.rerun()
@@ -0,0 +1,35 @@
+# -----------------------------------------------------------------------------
+# Seite "🗓️ Termin anlegen": Termin per Calendly buchen und Lead-Status setzen
+# -----------------------------------------------------------------------------
+import streamlit as st
+from urllib.parse import quote
+from crm_data import get_all_leads_for_dropdown, get_lead_details, update_lead_status
+
+def render():
+    st.info("Wählen Sie einen Lead aus, um die Daten vorzufüllen, oder geben Sie die Daten manuell ein, um einen Termin zu buchen.")
+    leads_for_dropdown = get_all_leads_for_dropdown()
+    lead_options = {f"{lead['name']} (ID: {lead['id']})": lead['id'] for lead in leads_for_dropdown}
+    selected_lead_display = st.selectbox("Optional: Daten aus Lead vorfüllen:", options=["-- Manueller Eintrag --"] + list(lead_options.keys()), key="calendly_lead_selector")
+    if selected_lead_display != "-- Manueller Eintrag --" and st.session_state.get("last_selected_lead") != selected_lead_display:
+        selected_lead_id = lead_options[selected_lead_display]
+        lead_details = get_lead_details(selected_lead_id)
+        st.session_state.booking_lead_id = selected_lead_id; st.session_state.booking_name = lead_details.get("name", ""); st.session_state.booking_email = lead_details.get("email", ""); st.session_state.last_selected_lead = selected_lead_display
+    elif selected_lead_display == "-- Manueller Eintrag --":
+        if "last_selected_lead" not in st.session_state or st.session_state.last_selected_lead != "-- Manueller Eintrag --":
+            st.session_state.booking_lead_id = None; st.session_state.booking_name = ""; st.session_state.booking_email = ""; st.session_state.last_selected_lead = "-- Manueller Eintrag --"
+    st.subheader("Daten für die Terminbuchung")
+    with st.form("booking_form"):
+        name_input = st.text_input("Name des Ansprechpartners:", value=st.session_state.get("booking_name", "")); email_input = st.text_input("E-Mail des Ansprechpartners:", value=st.session_state.get("booking_email", ""))
+        submitted = st.form_submit_button("🗓️ Kalender laden")
+        if submitted: st.session_state.final_booking_name = name_input; st.session_state.final_booking_email = email_input; st.session_state.show_calendly = True
+    if st.session_state.get("show_calendly"):
+        st.markdown("---"); st.subheader("Termin in Calendly auswählen")
+        calendly_url = f"https://calendly.com/adreachmedia/30min?name={quote(st.session_state.final_booking_name)}&email={quote(st.session_state.final_booking_email)}"
+        st.components.v1.iframe(calendly_url, height=750, scrolling=True)
+        st.markdown("---")
+        if st.session_state.booking_lead_id:
+            st.info("Nachdem Sie den Termin gebucht haben, klicken Sie hier, um den Lead-Status im CRM zu aktualisieren.")
+            if st.button(f"✓ Status für '{st.session_state.booking_name}' aktualisieren"):
+                update_lead_status(st.session_state.booking_lead_id, "🟡 Termin vereinbart")
+                st.session_state.show_calendly = False; st.session_state.booking_lead_id = None; st.rerun()
+